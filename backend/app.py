@@ -3,17 +3,84 @@ FastAPI backend for Eventbrite Capacity Manager and WooCommerce FooEvents
 """
 
 import os
-from fastapi import FastAPI, HTTPException, Body, Query
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Body, Query, Depends, Request, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional, List
 from eventbrite import EventbriteClient, EventbriteAPIError
 from woocommerce import WooCommerceClient, WooCommerceAPIError
-from event_mappings import EventMappingManager, EventMapping, UnmappedEvent
+from event_mappings import EventMappingManager, EventMapping, UnmappedEvent, get_mapping_cache_stats
+from http_pool import open_http_pools, close_http_pools, get_http_pool_stats
+from async_utils import run_blocking, loop_monitor, get_async_stats, shutdown_blocking_executor
+from cache_store import SERIES_DOCUMENT, get_cache_store
+from background_refresh import (
+    start_background_refresh, stop_background_refresh, get_background_refresh_stats,
+    refresh_series, refresh_products, load_series, load_products, startup_warmup, SYNC_ON_STARTUP,
+    claim_startup_sync, start_ticket_summary_maintenance
+)
 import logging
 import traceback # Import traceback for more detailed logging if needed, though exc_info=True should suffice
 
-app = FastAPI(title="Eventbrite Capacity Manager & WooCommerce FooEvents", version="1.0.0")
+# How often the shared WordPress DB connection is pinged so it stays warm between requests (0 disables)
+WORDPRESS_DB_KEEPALIVE_SECONDS = int(os.getenv('WORDPRESS_DB_KEEPALIVE_SECONDS', '300'))
+
+def _create_app_client(app: FastAPI, attr: str, client_class) -> None:
+    """Build one application-wide API client, remembering the error if it can't be created"""
+    try:
+        setattr(app.state, attr, client_class())
+        setattr(app.state, f"{attr}_error", None)
+    except Exception as e:
+        logging.error(f"Failed to initialize {client_class.__name__}: {e}")
+        setattr(app.state, attr, None)
+        setattr(app.state, f"{attr}_error", e)
+
+async def _keep_wordpress_db_warm(client: WooCommerceClient):
+    """Periodically ping the WordPress DB so idle connections aren't dropped by the server"""
+    while True:
+        await asyncio.sleep(WORDPRESS_DB_KEEPALIVE_SECONDS)
+        await run_blocking(client.keep_wordpress_db_alive)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown: API clients and their connection pools live for the whole process"""
+    open_http_pools('eventbrite', 'woocommerce')
+    loop_monitor.start()
+    _create_app_client(app, 'eventbrite_client', EventbriteClient)
+    _create_app_client(app, 'woocommerce_client', WooCommerceClient)
+    
+    keepalive_task = None
+    if app.state.woocommerce_client and WORDPRESS_DB_KEEPALIVE_SECONDS > 0:
+        keepalive_task = asyncio.create_task(_keep_wordpress_db_warm(app.state.woocommerce_client))
+    
+    # Optional startup sync (run.py --sync) runs after the port is bound, serving cache meanwhile;
+    # with auto-reload only the first worker runs it, not every reload
+    if SYNC_ON_STARTUP and claim_startup_sync():
+        startup_warmup.start(app.state.eventbrite_client, app.state.woocommerce_client)
+    
+    # Optional stale-while-revalidate refresh of both caches (BACKGROUND_REFRESH_MINUTES)
+    start_background_refresh(app.state.eventbrite_client, app.state.woocommerce_client)
+    
+    # Optional WordPress ticket sales summary (WORDPRESS_TICKET_SUMMARY): backfilled and rebuilt
+    # in the background; counts are queried live until the first backfill finishes
+    if app.state.woocommerce_client:
+        start_ticket_summary_maintenance(app.state.woocommerce_client.wp_db)
+    
+    yield
+    
+    startup_warmup.stop()
+    stop_background_refresh()
+    if keepalive_task:
+        keepalive_task.cancel()
+    if app.state.woocommerce_client and app.state.woocommerce_client.wp_db:
+        app.state.woocommerce_client.wp_db.close()
+    loop_monitor.stop()
+    await close_http_pools()
+    shutdown_blocking_executor()
+
+app = FastAPI(title="Eventbrite Capacity Manager & WooCommerce FooEvents", version="1.0.0", lifespan=lifespan)
 
 # Add CORS middleware to allow frontend requests
 app.add_middleware(
@@ -22,8 +89,41 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+def _get_app_client(request: Request, attr: str, client_class):
+    """Return an application-wide client, building it on first use if the lifespan hook didn't run"""
+    state = request.app.state
+    if not hasattr(state, attr):
+        _create_app_client(request.app, attr, client_class)
+    client = getattr(state, attr)
+    if client is None:
+        raise HTTPException(status_code=400, detail=str(getattr(state, f"{attr}_error")))
+    return client
+
+def get_eventbrite_client(request: Request) -> EventbriteClient:
+    """Dependency providing the shared EventbriteClient"""
+    return _get_app_client(request, 'eventbrite_client', EventbriteClient)
+
+def get_woocommerce_client(request: Request) -> WooCommerceClient:
+    """Dependency providing the shared WooCommerceClient (and its warm WordPress DB connection)"""
+    return _get_app_client(request, 'woocommerce_client', WooCommerceClient)
+
+def _etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Check an If-None-Match header against the current ETag"""
+    if not if_none_match or not etag:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    if '*' in candidates:
+        return True
+    # If-None-Match uses weak comparison: tags match whether or not either has the W/ prefix
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    return any((tag[2:] if tag.startswith('W/') else tag) == opaque for tag in candidates)
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': 'no-cache'})
+
 # Default values from environment or hardcoded
 DEFAULT_EVENT_ID = os.getenv('DEFAULT_EVENT_ID', '1219650199579')
 DEFAULT_TICKET_CLASS_ID = os.getenv('DEFAULT_TICKET_CLASS_ID', '2183507083')
@@ -75,14 +175,13 @@ async def root():
     return {"message": "Eventbrite Capacity Manager API is running"}
 
 @app.get("/capacity")
-async def get_capacity(event_id: Optional[str] = None, ticket_class_id: Optional[str] = None):
+async def get_capacity(event_id: Optional[str] = None, ticket_class_id: Optional[str] = None, client: EventbriteClient = Depends(get_eventbrite_client)):
     """Get current capacity for a ticket class"""
     try:
         # Use defaults if not provided
         event_id = event_id or DEFAULT_EVENT_ID
         ticket_class_id = ticket_class_id or DEFAULT_TICKET_CLASS_ID
         
-        client = EventbriteClient()
         result = await client.get_current_capacity(event_id, ticket_class_id)
         
         return CapacityResponse(
@@ -96,14 +195,13 @@ async def get_capacity(event_id: Optional[str] = None, ticket_class_id: Optional
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/capacity/increment")
-async def increment_capacity(request: CapacityRequest):
+async def increment_capacity(request: CapacityRequest, client: EventbriteClient = Depends(get_eventbrite_client)):
     """Increment capacity by 1"""
     try:
         # Use defaults if not provided
         event_id = request.event_id or DEFAULT_EVENT_ID
         ticket_class_id = request.ticket_class_id or DEFAULT_TICKET_CLASS_ID
         
-        client = EventbriteClient()
         result = await client.increment_capacity(event_id, ticket_class_id)
         
         return CapacityResponse(
@@ -117,14 +215,13 @@ async def increment_capacity(request: CapacityRequest):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/capacity/decrement")
-async def decrement_capacity(request: CapacityRequest):
+async def decrement_capacity(request: CapacityRequest, client: EventbriteClient = Depends(get_eventbrite_client)):
     """Decrement capacity by 1"""
     try:
         # Use defaults if not provided
         event_id = request.event_id or DEFAULT_EVENT_ID
         ticket_class_id = request.ticket_class_id or DEFAULT_TICKET_CLASS_ID
         
-        client = EventbriteClient()
         result = await client.decrement_capacity(event_id, ticket_class_id)
         
         return CapacityResponse(
@@ -138,14 +235,13 @@ async def decrement_capacity(request: CapacityRequest):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/capacity/set")
-async def set_eventbrite_capacity(request: SetEventbriteCapacityRequest):
+async def set_eventbrite_capacity(request: SetEventbriteCapacityRequest, client: EventbriteClient = Depends(get_eventbrite_client)):
     """Set Eventbrite ticket class capacity to a specific value for an event/ticket class"""
     try:
         logging.info(f"[SET CAPACITY] event_id={request.event_id}, ticket_class_id={request.ticket_class_id}, new_capacity={request.new_capacity}")
         if request.new_capacity < 0:
             logging.error("Capacity must be non-negative")
             raise HTTPException(status_code=400, detail="Capacity must be non-negative")
-        client = EventbriteClient()
         ticket_class = await client.get_ticket_class_details(request.event_id, request.ticket_class_id)
         if not ticket_class:
             logging.error("Ticket class not found")
@@ -194,11 +290,23 @@ async def set_eventbrite_capacity(request: SetEventbriteCapacityRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/series")
-async def get_organization_series():
-    """Get all event series for the organization that are currently on sale (uses cache by default)"""
+async def get_organization_series(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    client: EventbriteClient = Depends(get_eventbrite_client)
+):
+    """Get all event series for the organization that are currently on sale (uses cache by default, 304 if unchanged)"""
     try:
-        client = EventbriteClient()
-        result = await client.get_organization_series(use_cache=True)
+        etag = await run_blocking(client.get_cache_etag)
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        
+        result = await load_series(client)
+        
+        etag = etag or await run_blocking(client.get_cache_etag)
+        if etag:
+            response.headers['ETag'] = etag
+            response.headers['Cache-Control'] = 'no-cache'
         
         cache_source = result.get('cache_source', 'unknown')
         cache_age = result.get('cache_age_minutes', 0)
@@ -220,11 +328,16 @@ async def get_organization_series():
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/series/refresh")
-async def refresh_organization_series():
-    """Force refresh of event series data from Eventbrite API"""
+async def refresh_organization_series(
+    full: bool = Query(False, description="Force a full re-download instead of an incremental refresh"),
+    client: EventbriteClient = Depends(get_eventbrite_client)
+):
+    """
+    Force refresh of event series data from Eventbrite API (incremental unless a full sync is due or requested).
+    Concurrent refreshes share one in-flight crawl.
+    """
     try:
-        client = EventbriteClient()
-        result = await client.refresh_organization_series()
+        result = await refresh_series(client, full=full)
         
         return CapacityResponse(
             success=True,
@@ -237,11 +350,10 @@ async def refresh_organization_series():
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/series/cache-info")
-async def get_cache_info():
+async def get_cache_info(client: EventbriteClient = Depends(get_eventbrite_client)):
     """Get information about the current series cache"""
     try:
-        client = EventbriteClient()
-        cache_info = client.get_cache_info()
+        cache_info = await run_blocking(client.get_cache_info)
         
         return CapacityResponse(
             success=True,
@@ -252,10 +364,9 @@ async def get_cache_info():
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/events/{event_id}/ticket-classes")
-async def get_ticket_classes(event_id: str):
+async def get_ticket_classes(event_id: str, client: EventbriteClient = Depends(get_eventbrite_client)):
     """Get all ticket classes for a specific event"""
     try:
-        client = EventbriteClient()
         result = await client.get_all_ticket_classes(event_id)
         
         return CapacityResponse(
@@ -279,14 +390,58 @@ async def get_config():
         "has_wordpress_db_credentials": bool(os.getenv('WORDPRESS_DB_USER') and os.getenv('WORDPRESS_DB_PASSWORD') and os.getenv('WORDPRESS_DB_NAME'))
     }
 
+@app.get("/ready")
+async def get_readiness():
+    """Readiness check: 200 once the startup warm-up sync (if any) has finished, 503 while it's running"""
+    status = startup_warmup.get_status()
+    ready = status['finished']
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content=CapacityResponse(
+            success=ready,
+            message="Ready" if ready else "Warming up caches (serving cached data meanwhile)",
+            data={'ready': ready, 'warmup': status}
+        ).dict()
+    )
+
+@app.get("/metrics")
+async def get_metrics(request: Request):
+    """Get runtime metrics (HTTP and database connection pool usage, event loop lag, cache store, mapping memo)"""
+    wc_client = getattr(request.app.state, 'woocommerce_client', None)
+    db_pool = wc_client.wp_db.get_pool_stats() if wc_client and wc_client.wp_db else None
+    return CapacityResponse(
+        success=True,
+        message="Metrics retrieved",
+        data={
+            'http_pools': get_http_pool_stats(),
+            'db_pool': db_pool,
+            'cache_store': await run_blocking(get_cache_store().get_stats),
+            'background_refresh': get_background_refresh_stats(),
+            'mappings': get_mapping_cache_stats(),
+            **get_async_stats()
+        }
+    )
+
 # WooCommerce / FooEvents endpoints
 
 @app.get("/woocommerce/products")
-async def get_woocommerce_products():
-    """Get all WooCommerce FooEvents products with their booking data (uses cache by default)"""
+async def get_woocommerce_products(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    client: WooCommerceClient = Depends(get_woocommerce_client)
+):
+    """Get all WooCommerce FooEvents products with their booking data (uses cache by default, 304 if unchanged)"""
     try:
-        client = WooCommerceClient()
-        result = await client.get_all_fooevents_products(use_cache=True)
+        etag = await run_blocking(client.get_cache_etag)
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        
+        result = await load_products(client)
+        
+        etag = etag or await run_blocking(client.get_cache_etag)
+        if etag:
+            response.headers['ETag'] = etag
+            response.headers['Cache-Control'] = 'no-cache'
         
         cache_source = result.get('cache_source', 'unknown')
         cache_age = result.get('cache_age_minutes', 0)
@@ -308,12 +463,10 @@ async def get_woocommerce_products():
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/woocommerce/products/refresh")
-async def refresh_woocommerce_products():
-    """Force refresh of WooCommerce products data from API"""
+async def refresh_woocommerce_products(client: WooCommerceClient = Depends(get_woocommerce_client)):
+    """Force refresh of WooCommerce products data from API (concurrent refreshes share one in-flight crawl)"""
     try:
-        client = WooCommerceClient()
-        # Corrected method call: get_all_fooevents_products with use_cache=False
-        result = await client.get_all_fooevents_products(use_cache=False, use_discovery=True)
+        result = await refresh_products(client)
         
         return CapacityResponse(
             success=True,
@@ -328,11 +481,10 @@ async def refresh_woocommerce_products():
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/woocommerce/products/cache-info")
-async def get_woocommerce_cache_info():
+async def get_woocommerce_cache_info(client: WooCommerceClient = Depends(get_woocommerce_client)):
     """Get information about the current WooCommerce products cache"""
     try:
-        client = WooCommerceClient()
-        cache_info = client.get_cache_info()
+        cache_info = await run_blocking(client.get_cache_info)
         
         return CapacityResponse(
             success=True,
@@ -343,10 +495,9 @@ async def get_woocommerce_cache_info():
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/woocommerce/products/{product_id}")
-async def get_woocommerce_product(product_id: int):
+async def get_woocommerce_product(product_id: int, client: WooCommerceClient = Depends(get_woocommerce_client)):
     """Get a specific WooCommerce product with its FooEvents booking data"""
     try:
-        client = WooCommerceClient()
         result = await client.get_product_inventory(product_id)
         
         return CapacityResponse(
@@ -360,10 +511,9 @@ async def get_woocommerce_product(product_id: int):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/woocommerce/products/{product_id}/slots/{slot_id}")
-async def get_woocommerce_product_slot(product_id: int, slot_id: str):
+async def get_woocommerce_product_slot(product_id: int, slot_id: str, client: WooCommerceClient = Depends(get_woocommerce_client)):
     """Get a specific slot from a WooCommerce product"""
     try:
-        client = WooCommerceClient()
         result = await client.get_product_inventory(product_id, slot_id=slot_id)
         
         return CapacityResponse(
@@ -377,10 +527,9 @@ async def get_woocommerce_product_slot(product_id: int, slot_id: str):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/woocommerce/products/{product_id}/slots/{slot_id}/dates/{date_id}")
-async def get_woocommerce_product_date(product_id: int, slot_id: str, date_id: str):
+async def get_woocommerce_product_date(product_id: int, slot_id: str, date_id: str, client: WooCommerceClient = Depends(get_woocommerce_client)):
     """Get a specific date from a specific slot of a WooCommerce product"""
     try:
-        client = WooCommerceClient()
         result = await client.get_product_inventory(product_id, slot_id=slot_id, date_id=date_id)
         
         return CapacityResponse(
@@ -394,11 +543,10 @@ async def get_woocommerce_product_date(product_id: int, slot_id: str, date_id: s
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/woocommerce/wordpress-db-status")
-async def get_wordpress_db_status():
+async def get_wordpress_db_status(client: WooCommerceClient = Depends(get_woocommerce_client)):
     """Get WordPress database connection status"""
     try:
-        client = WooCommerceClient()
-        db_status = client.get_wordpress_db_status()
+        db_status = await run_blocking(client.get_wordpress_db_status)
         
         return CapacityResponse(
             success=True,
@@ -409,10 +557,9 @@ async def get_wordpress_db_status():
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/woocommerce/inventory/increment")
-async def increment_woocommerce_inventory(request: WooCommerceInventoryRequest):
+async def increment_woocommerce_inventory(request: WooCommerceInventoryRequest, client: WooCommerceClient = Depends(get_woocommerce_client)):
     """Increment WooCommerce inventory by 1"""
     try:
-        client = WooCommerceClient()
         result = await client.increment_woocommerce_inventory(
             request.product_id, 
             request.slot_id, 
@@ -430,10 +577,9 @@ async def increment_woocommerce_inventory(request: WooCommerceInventoryRequest):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/woocommerce/inventory/decrement")
-async def decrement_woocommerce_inventory(request: WooCommerceInventoryRequest):
+async def decrement_woocommerce_inventory(request: WooCommerceInventoryRequest, client: WooCommerceClient = Depends(get_woocommerce_client)):
     """Decrement WooCommerce inventory by 1"""
     try:
-        client = WooCommerceClient()
         result = await client.decrement_woocommerce_inventory(
             request.product_id, 
             request.slot_id, 
@@ -451,10 +597,9 @@ async def decrement_woocommerce_inventory(request: WooCommerceInventoryRequest):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/woocommerce/debug/product/{product_id}")
-async def debug_product(product_id: int):
+async def debug_product(product_id: int, wc_client: WooCommerceClient = Depends(get_woocommerce_client)):
     """Debug endpoint to check a specific product's data and FooEvents parsing"""
     try:
-        wc_client = WooCommerceClient()
         
         # Get raw product data
         product_data = await wc_client.get_product_data(product_id)
@@ -467,7 +612,7 @@ async def debug_product(product_id: int):
         debug_info = {}
         
         if fooevents_data:
-            formatted_slots = wc_client.format_booking_slots(product_data, fooevents_data)
+            formatted_slots = await run_blocking(wc_client.format_booking_slots, product_data, fooevents_data)
             
             # Add debug info for the first slot
             if fooevents_data:
@@ -511,10 +656,9 @@ async def debug_product(product_id: int):
         }
 
 @app.get("/woocommerce/debug/wordpress-tickets/{product_id}")
-async def debug_wordpress_tickets(product_id: int):
+async def debug_wordpress_tickets(product_id: int, wc_client: WooCommerceClient = Depends(get_woocommerce_client)):
     """Debug endpoint to check WordPress database tickets for a specific product"""
     try:
-        wc_client = WooCommerceClient()
         
         # Check if we have WordPress DB connection
         if not wc_client.wp_db_available or not wc_client.wp_db:
@@ -524,7 +668,7 @@ async def debug_wordpress_tickets(product_id: int):
             }
         
         # Get all tickets for this product from WordPress database
-        tickets = wc_client.wp_db.get_all_tickets_for_product(product_id)
+        tickets = await run_blocking(wc_client.wp_db.get_all_tickets_for_product, product_id)
         
         # Group tickets by slot and date for analysis
         ticket_analysis = {}
@@ -554,11 +698,33 @@ async def debug_wordpress_tickets(product_id: int):
             "product_id": product_id
         }
 
+@app.get("/woocommerce/debug/wordpress-explain")
+async def debug_wordpress_explain(
+    product_id: Optional[int] = Query(None, description="WooCommerce product ID (optional, defaults to the most recently booked product)"),
+    slot: Optional[str] = Query(None, description="Booking slot name (optional)"),
+    date: Optional[str] = Query(None, description="Booking date, e.g. 'June 07, 2025' (optional)"),
+    wc_client: WooCommerceClient = Depends(get_woocommerce_client)
+):
+    """Debug endpoint that EXPLAINs the WordPress database queries and proposes missing indexes"""
+    try:
+        if not wc_client.wp_db_available or not wc_client.wp_db:
+            return {
+                "error": "WordPress database not available",
+                "product_id": product_id
+            }
+
+        return await run_blocking(wc_client.wp_db.explain_queries, product_id, slot, date)
+
+    except Exception as e:
+        return {
+            "error": str(e),
+            "product_id": product_id
+        }
+
 @app.post("/woocommerce/inventory/set")
-async def set_woocommerce_inventory(request: SetWooCommerceInventoryRequest):
+async def set_woocommerce_inventory(request: SetWooCommerceInventoryRequest, client: WooCommerceClient = Depends(get_woocommerce_client)):
     """Set WooCommerce inventory to a specific value for a product/slot/date"""
     try:
-        client = WooCommerceClient()
         # Get current inventory info for validation
         current_info = await client.get_product_inventory(request.product_id, request.slot_id, request.date_id)
         tickets_sold = 0
@@ -587,20 +753,20 @@ async def set_woocommerce_inventory(request: SetWooCommerceInventoryRequest):
 async def refresh_woocommerce(
     product_id: int = Query(..., description="WooCommerce product ID"),
     slot_id: Optional[str] = Query(None, description="Slot ID (optional)"),
-    date_id: Optional[str] = Query(None, description="Date ID (optional)")
+    date_id: Optional[str] = Query(None, description="Date ID (optional)"),
+    client: WooCommerceClient = Depends(get_woocommerce_client)
 ):
     """
     Force refresh of WooCommerce product/slot/date from API (not cache).
     Returns the same structure as the existing product/slot/date endpoints.
     """
     try:
-        client = WooCommerceClient()
         # Always use fresh API data
         product_data = await client.get_product_data(product_id)
         booking_data = client.extract_fooevents_data(product_data)
         if not booking_data:
             raise WooCommerceAPIError(f"No FooEvents data found for product {product_id}")
-        formatted_slots = client.format_booking_slots(product_data, booking_data)
+        formatted_slots = await run_blocking(client.format_booking_slots, product_data, booking_data)
         # Filter slots/dates if needed
         if slot_id:
             filtered_slots = [s for s in formatted_slots if s['slot_id'] == slot_id]
@@ -634,25 +800,24 @@ async def refresh_woocommerce(
 # Event Mapping endpoints
 
 @app.get("/mappings")
-async def get_all_mappings():
+async def get_all_mappings(eventbrite_client: EventbriteClient = Depends(get_eventbrite_client), woocommerce_client: WooCommerceClient = Depends(get_woocommerce_client)):
     """Get all event mappings (manual fallback, programmatic, and user overrides) and unmapped events"""
     try:
         mapping_manager = EventMappingManager()
         
         # Get data from both platforms for programmatic matching
-        eventbrite_client = EventbriteClient()
-        woocommerce_client = WooCommerceClient()
         
-        # Get series and products data
-        series_result = await eventbrite_client.get_organization_series(use_cache=True)
-        products_result = await woocommerce_client.get_all_fooevents_products(use_cache=True)
+        # Load series and products concurrently (on a cold cache both are full crawls)
+        series_result, products_result = await asyncio.gather(
+            load_series(eventbrite_client),
+            load_products(woocommerce_client)
+        )
         
         series_data = series_result.get('series', [])
         products_data = products_result.get('products', [])
         
-        # Get all mappings and unmapped events
-        all_mappings = mapping_manager.get_all_mappings(products_data, series_data)
-        unmapped_events = mapping_manager.get_unmapped_events(products_data, series_data)
+        # Get all mappings and unmapped events in one matching pass
+        all_mappings, unmapped_events = await run_blocking(mapping_manager.get_mappings_and_unmapped, products_data, series_data)
         
         # Convert to dict format for JSON response
         mappings_data = [
@@ -663,7 +828,8 @@ async def get_all_mappings():
                 'eventbrite_series_ids': mapping.eventbrite_series_ids,
                 'mapping_source': mapping.mapping_source,
                 'is_active': mapping.is_active,
-                'last_updated': mapping.last_updated
+                'last_updated': mapping.last_updated,
+                'confidence': mapping.confidence
             }
             for mapping in all_mappings
         ]
@@ -675,7 +841,8 @@ async def get_all_mappings():
                 'name': event.name,
                 'product_id': event.product_id,
                 'series_id': event.series_id,
-                'reason': event.reason
+                'reason': event.reason,
+                'suggestions': event.suggestions
             }
             for event in unmapped_events
         ]
@@ -736,7 +903,8 @@ async def create_mapping(request: CreateMappingRequest):
     try:
         mapping_manager = EventMappingManager()
         
-        mapping = mapping_manager.create_user_mapping(
+        mapping = await run_blocking(
+            mapping_manager.create_user_mapping,
             woocommerce_product_id=request.woocommerce_product_id,
             eventbrite_series_ids=request.eventbrite_series_ids,
             name=request.name
@@ -769,7 +937,7 @@ async def update_mapping(mapping_id: str, request: UpdateMappingRequest):
         # Convert request to dict, excluding None values
         update_data = {k: v for k, v in request.dict().items() if v is not None}
         
-        mapping = mapping_manager.update_mapping(mapping_id, **update_data)
+        mapping = await run_blocking(mapping_manager.update_mapping, mapping_id, **update_data)
         
         if not mapping:
             raise HTTPException(status_code=404, detail=f"Mapping with ID {mapping_id} not found")
@@ -800,7 +968,7 @@ async def delete_mapping(mapping_id: str):
     try:
         mapping_manager = EventMappingManager()
         
-        success = mapping_manager.delete_mapping(mapping_id)
+        success = await run_blocking(mapping_manager.delete_mapping, mapping_id)
         
         if not success:
             raise HTTPException(status_code=404, detail=f"User override mapping with ID {mapping_id} not found")
@@ -816,7 +984,7 @@ async def delete_mapping(mapping_id: str):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/mappings/{mapping_id}/send-to-compare")
-async def send_mapping_to_compare(mapping_id: str):
+async def send_mapping_to_compare(mapping_id: str, eventbrite_client: EventbriteClient = Depends(get_eventbrite_client), woocommerce_client: WooCommerceClient = Depends(get_woocommerce_client)):
     """Prepare a mapping group for the comparison view"""
     try:
         mapping_manager = EventMappingManager()
@@ -826,8 +994,6 @@ async def send_mapping_to_compare(mapping_id: str):
             raise HTTPException(status_code=404, detail=f"Mapping with ID {mapping_id} not found")
         
         # Get detailed data for comparison
-        eventbrite_client = EventbriteClient()
-        woocommerce_client = WooCommerceClient()
         
         # Get full WooCommerce product data
         wc_full_product = await woocommerce_client.get_product_inventory(int(mapping.woocommerce_product_id))
@@ -836,10 +1002,11 @@ async def send_mapping_to_compare(mapping_id: str):
         eb_series_data = []
         for series_id in mapping.eventbrite_series_ids:
             try:
-                # Get from the cached series data
-                series_result = await eventbrite_client.get_organization_series(use_cache=True)
-                series_list = series_result.get('series', [])
-                series_data = next((s for s in series_list if str(s['series_id']) == series_id), None)
+                # Point lookup in the cached series data, populating the cache first if it's empty
+                series_data = await run_blocking(eventbrite_client.get_cached_series, series_id)
+                if series_data is None and not await run_blocking(eventbrite_client.cache_store.has_document, SERIES_DOCUMENT):
+                    await load_series(eventbrite_client)
+                    series_data = await run_blocking(eventbrite_client.get_cached_series, series_id)
                 if series_data:
                     eb_series_data.append(series_data)
             except Exception as e:
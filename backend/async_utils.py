@@ -0,0 +1,207 @@
+"""
+Helpers for keeping the asyncio event loop responsive.
+Blocking work (pymysql queries, cache file I/O) is dispatched to a sized thread
+pool, duplicate concurrent work is coalesced with SingleFlight, and a lag
+monitor measures how long the loop was blocked anyway.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from dotenv import load_dotenv
+
+# Load environment variables from the project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+BLOCKING_IO_THREADS = max(1, int(os.getenv('BLOCKING_IO_THREADS', '10')))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+# Blocking call statistics
+_blocking_stats = {
+    'calls': 0,
+    'errors': 0,
+    'in_flight': 0,
+    'total_seconds': 0.0,
+    'max_seconds': 0.0
+}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared blocking I/O thread pool, creating it if necessary"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=BLOCKING_IO_THREADS, thread_name_prefix='blocking-io')
+    return _executor
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking function in the shared thread pool and await its result.
+
+    Args:
+        func: Synchronous callable (e.g., a WordPressDBClient query)
+        *args, **kwargs: Passed through to func
+
+    Returns:
+        Whatever func returns (exceptions are re-raised in the caller)
+    """
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    _blocking_stats['calls'] += 1
+    _blocking_stats['in_flight'] += 1
+    try:
+        return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+    except Exception:
+        _blocking_stats['errors'] += 1
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        _blocking_stats['in_flight'] -= 1
+        _blocking_stats['total_seconds'] += elapsed
+        _blocking_stats['max_seconds'] = max(_blocking_stats['max_seconds'], elapsed)
+
+
+def shutdown_blocking_executor() -> None:
+    """Stop the blocking I/O thread pool (called on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one in-flight task.
+
+    The first caller starts the coroutine; callers arriving while it runs await
+    the same task and share its result (or exception). The task is shielded, so a
+    caller going away (e.g. a client disconnect) doesn't cancel it for the others.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run func(*args, **kwargs) for key, or join the call already in flight.
+
+        Args:
+            key: Identifies equivalent work (e.g. 'products', 'series:full')
+            func: Coroutine function to run
+        """
+        task = self._tasks.get(key)
+        if task is None or task.done():
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._tasks[key] = task
+            self.started += 1
+            task.add_done_callback(functools.partial(self._finished, key))
+        else:
+            self.coalesced += 1
+            logging.info(f"Joining in-flight '{key}' refresh")
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Mark the exception as retrieved even if every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self, key: str) -> bool:
+        task = self._tasks.get(key)
+        return task is not None and not task.done()
+
+    def cancel_all(self) -> None:
+        """Cancel every in-flight task (called on application shutdown)"""
+        for task in list(self._tasks.values()):
+            task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'in_flight': sorted(key for key, task in self._tasks.items() if not task.done()),
+            'started': self.started,
+            'coalesced': self.coalesced
+        }
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop blocking by scheduling a wake-up every interval and
+    recording how late it actually runs. Any lateness above threshold counts as
+    a stall, i.e. time during which no other request could make progress.
+    """
+
+    def __init__(self, interval: float = 0.5, threshold: float = 0.1):
+        self.interval = interval
+        self.threshold = threshold
+        self._task: Optional[asyncio.Task] = None
+
+        self.samples = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.blocked_seconds = 0.0
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.samples += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                self.stalls += 1
+                self.blocked_seconds += lag
+                logging.warning(f"Event loop was blocked for {lag * 1000:.0f}ms")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'running': self._task is not None and not self._task.done(),
+            'interval_ms': round(self.interval * 1000),
+            'stall_threshold_ms': round(self.threshold * 1000),
+            'samples': self.samples,
+            'last_lag_ms': round(self.last_lag * 1000, 1),
+            'max_lag_ms': round(self.max_lag * 1000, 1),
+            'stalls': self.stalls,
+            'blocked_seconds': round(self.blocked_seconds, 3)
+        }
+
+
+loop_monitor = LoopLagMonitor(
+    interval=float(os.getenv('LOOP_LAG_INTERVAL_MS', '500')) / 1000,
+    threshold=float(os.getenv('LOOP_LAG_THRESHOLD_MS', '100')) / 1000
+)
+
+
+def get_async_stats() -> Dict[str, Any]:
+    """Get event loop lag and blocking thread pool statistics"""
+    return {
+        'event_loop': loop_monitor.get_stats(),
+        'blocking_io': {
+            'threads': BLOCKING_IO_THREADS,
+            'calls': _blocking_stats['calls'],
+            'errors': _blocking_stats['errors'],
+            'in_flight': _blocking_stats['in_flight'],
+            'total_seconds': round(_blocking_stats['total_seconds'], 3),
+            'max_seconds': round(_blocking_stats['max_seconds'], 3)
+        }
+    }
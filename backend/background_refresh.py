@@ -0,0 +1,294 @@
+"""
+Stale-while-revalidate refresh for the Eventbrite series and WooCommerce products caches.
+Endpoints keep serving the existing cache immediately while an optional background
+scheduler refreshes both on an interval, so cached data is never more than
+BACKGROUND_REFRESH_MINUTES old. All refreshes go through one SingleFlight, so a
+scheduled refresh and a manual one never crawl the same API at the same time.
+The startup warm-up (SYNC_ON_STARTUP, set by run.py --sync) runs the same way,
+after the server is already accepting requests. The WordPress ticket sales summary
+(WORDPRESS_TICKET_SUMMARY) is backfilled and rebuilt by a background refresher too,
+never on a request.
+"""
+
+import os
+import time
+import random
+import tempfile
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from async_utils import SingleFlight, run_blocking
+
+# Load environment variables from the project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+# Minutes between background refreshes (0 disables the scheduler)
+BACKGROUND_REFRESH_MINUTES = float(os.getenv('BACKGROUND_REFRESH_MINUTES', '0'))
+# Random +/- fraction applied to each interval so the two APIs aren't hit in lockstep
+BACKGROUND_REFRESH_JITTER = float(os.getenv('BACKGROUND_REFRESH_JITTER', '0.1'))
+# Sync both caches in the background right after startup
+SYNC_ON_STARTUP = os.getenv('SYNC_ON_STARTUP', 'false').lower() in ('1', 'true', 'yes')
+# Set by run.py when auto-reload is on: every reload worker inherits SYNC_ON_STARTUP, so
+# the workers of one run share this key and only the first to claim it warms up
+SYNC_ON_STARTUP_ONCE = os.getenv('SYNC_ON_STARTUP_ONCE')
+# Seconds between background passes over the WordPress ticket sales summary
+TICKET_SUMMARY_MAINTENANCE_SECONDS = 60
+
+refresh_flight = SingleFlight()
+
+# Single-flight keys, one per cache, so no two refreshes of a cache ever overlap
+SERIES_REFRESH_KEY = 'eventbrite_series'
+PRODUCTS_REFRESH_KEY = 'woocommerce_products'
+
+# Whether the series refresh in flight is a full one
+_series_refresh = {'full': False}
+
+
+async def refresh_series(client, full: bool = False) -> Dict[str, Any]:
+    """
+    Refresh the Eventbrite series cache. An incremental refresh joins whichever refresh is
+    in flight (a full one covers it); a full refresh joins a full one in flight, or waits
+    for an in-flight incremental refresh to finish and then runs.
+    """
+    while full and refresh_flight.in_flight(SERIES_REFRESH_KEY) and not _series_refresh['full']:
+        try:
+            await refresh_flight.run(SERIES_REFRESH_KEY, client.refresh_organization_series)
+        except Exception:
+            pass  # The full refresh below runs regardless
+    if not refresh_flight.in_flight(SERIES_REFRESH_KEY):
+        _series_refresh['full'] = full
+    return await refresh_flight.run(SERIES_REFRESH_KEY, client.refresh_organization_series, full=full)
+
+
+async def refresh_products(client) -> Dict[str, Any]:
+    """Refresh the WooCommerce products cache, joining a refresh already in flight"""
+    return await refresh_flight.run(PRODUCTS_REFRESH_KEY, client.get_all_fooevents_products, use_cache=False, use_discovery=True)
+
+
+async def load_series(client) -> Dict[str, Any]:
+    """Get the cached series, or populate an empty cache with a full refresh shared through refresh_flight"""
+    cached = await run_blocking(client._load_cached_series)
+    if cached:
+        return cached
+    return await refresh_series(client, full=True)
+
+
+async def load_products(client) -> Dict[str, Any]:
+    """Get the cached products, or populate a missing (or expired) cache with a refresh shared through refresh_flight"""
+    cached = await run_blocking(client._load_cached_products)
+    if cached:
+        return cached
+    return await refresh_products(client)
+
+
+class PeriodicRefresher:
+    """Runs one cache refresh on a jittered interval in a background task"""
+
+    def __init__(self, name: str, refresh: Callable[[], Awaitable[Any]], interval_seconds: float, jitter: float = 0.1,
+                 run_immediately: bool = False):
+        self.name = name
+        self.refresh = refresh
+        self.interval_seconds = interval_seconds
+        self.jitter = max(0.0, min(jitter, 1.0))
+        self.run_immediately = run_immediately
+        self._task: Optional[asyncio.Task] = None
+
+        self.runs = 0
+        self.failures = 0
+        self.last_success: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.last_duration_seconds: Optional[float] = None
+        self.next_run_at: Optional[str] = None
+
+    def _next_delay(self) -> float:
+        return self.interval_seconds * (1 + random.uniform(-self.jitter, self.jitter))
+
+    async def _run(self) -> None:
+        first = True
+        while True:
+            delay = 0 if first and self.run_immediately else self._next_delay()
+            first = False
+            self.next_run_at = datetime.fromtimestamp(time.time() + delay, timezone.utc).isoformat()
+            await asyncio.sleep(delay)
+
+            started = time.perf_counter()
+            self.runs += 1
+            try:
+                await self.refresh()
+                self.last_success = datetime.now(timezone.utc).isoformat()
+                self.last_error = None
+                logging.info(f"Background refresh of {self.name} finished in {time.perf_counter() - started:.1f}s")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep serving the existing cache and try again next interval
+                self.failures += 1
+                self.last_error = str(e)
+                logging.error(f"Background refresh of {self.name} failed: {e}")
+            finally:
+                self.last_duration_seconds = round(time.perf_counter() - started, 3)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'running': self._task is not None and not self._task.done(),
+            'interval_minutes': round(self.interval_seconds / 60, 2),
+            'runs': self.runs,
+            'failures': self.failures,
+            'last_success': self.last_success,
+            'last_error': self.last_error,
+            'last_duration_seconds': self.last_duration_seconds,
+            'next_run_at': self.next_run_at
+        }
+
+
+_refreshers: List[PeriodicRefresher] = []
+
+
+def start_background_refresh(eventbrite_client=None, woocommerce_client=None) -> None:
+    """Start the background refreshers for the available clients (no-op unless BACKGROUND_REFRESH_MINUTES > 0)"""
+    if BACKGROUND_REFRESH_MINUTES <= 0:
+        return
+    interval = BACKGROUND_REFRESH_MINUTES * 60
+    if eventbrite_client is not None:
+        _refreshers.append(PeriodicRefresher('eventbrite_series', lambda: refresh_series(eventbrite_client), interval, BACKGROUND_REFRESH_JITTER))
+    if woocommerce_client is not None:
+        _refreshers.append(PeriodicRefresher('woocommerce_products', lambda: refresh_products(woocommerce_client), interval, BACKGROUND_REFRESH_JITTER))
+    for refresher in _refreshers:
+        refresher.start()
+    logging.info(f"Background cache refresh every {BACKGROUND_REFRESH_MINUTES:g} minutes for: {', '.join(r.name for r in _refreshers) or 'nothing'}")
+
+
+def start_ticket_summary_maintenance(wp_db) -> None:
+    """
+    Backfill the WordPress ticket sales summary right away and keep it current (rebuilding
+    it when due) in the background, so no request ever waits on a backfill
+    (no-op unless WORDPRESS_TICKET_SUMMARY is enabled)
+    """
+    if wp_db is None or not wp_db.ticket_summary_enabled:
+        return
+    refresher = PeriodicRefresher('wordpress_ticket_summary', lambda: run_blocking(wp_db.maintain_ticket_summary),
+                                  TICKET_SUMMARY_MAINTENANCE_SECONDS, BACKGROUND_REFRESH_JITTER, run_immediately=True)
+    _refreshers.append(refresher)
+    refresher.start()
+    logging.info("Ticket sales summary maintained in the background")
+
+
+def stop_background_refresh() -> None:
+    """Stop all background refreshers and any refresh still running (called on application shutdown)"""
+    for refresher in _refreshers:
+        refresher.stop()
+    _refreshers.clear()
+    refresh_flight.cancel_all()
+
+
+def get_background_refresh_stats() -> Dict[str, Any]:
+    """Get scheduler and single-flight statistics"""
+    return {
+        'enabled': BACKGROUND_REFRESH_MINUTES > 0,
+        'refreshers': {refresher.name: refresher.get_stats() for refresher in _refreshers},
+        'single_flight': refresh_flight.get_stats()
+    }
+
+
+def _startup_sync_claim_path(key: str) -> str:
+    return os.path.join(tempfile.gettempdir(), f"brcc_sync_warmup_{key}")
+
+
+def claim_startup_sync() -> bool:
+    """Whether this process should run the startup warm-up (only the first process per SYNC_ON_STARTUP_ONCE key)"""
+    if not SYNC_ON_STARTUP_ONCE:
+        return True
+    try:
+        os.close(os.open(_startup_sync_claim_path(SYNC_ON_STARTUP_ONCE), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return True
+    except FileExistsError:
+        return False
+
+
+def release_startup_sync_claim(key: str) -> None:
+    """Remove a run's warm-up claim (called by run.py once the reloader exits)"""
+    try:
+        os.remove(_startup_sync_claim_path(key))
+    except OSError:
+        pass
+
+
+class StartupWarmUp:
+    """
+    Syncs both caches concurrently in a lifespan task so the port is bound immediately
+    and the existing cache is served while the warm-up runs. Progress is exposed for
+    the /ready endpoint.
+    """
+
+    def __init__(self):
+        self.requested = False
+        self._task: Optional[asyncio.Task] = None
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+    async def _run_step(self, name: str, sync: Callable[[], Awaitable[Dict[str, Any]]], count_key: str) -> None:
+        step = self.steps[name]
+        step.update({'status': 'running', 'started_at': datetime.now(timezone.utc).isoformat()})
+        started = time.perf_counter()
+        try:
+            result = await sync()
+            step.update({'status': 'done', 'count': result.get(count_key)})
+            print(f"✅ Warm-up synced {result.get(count_key)} {name.replace('_', ' ')}")
+        except asyncio.CancelledError:
+            step['status'] = 'cancelled'
+            raise
+        except Exception as e:
+            step.update({'status': 'failed', 'error': str(e)})
+            print(f"❌ Warm-up sync of {name} failed: {e} (serving cached data)")
+        finally:
+            step.update({'finished_at': datetime.now(timezone.utc).isoformat(), 'duration_seconds': round(time.perf_counter() - started, 3)})
+
+    def start(self, eventbrite_client=None, woocommerce_client=None) -> None:
+        """Start syncing both caches concurrently (clients that failed to initialise are reported as failed)"""
+        self.requested = True
+        jobs = []
+        for name, client, sync, count_key in (
+            ('eventbrite_series', eventbrite_client, lambda: refresh_series(eventbrite_client, full=True), 'total_series_count'),
+            ('woocommerce_products', woocommerce_client, lambda: refresh_products(woocommerce_client), 'total_products')
+        ):
+            if client is None:
+                self.steps[name] = {'status': 'failed', 'error': 'Client not configured'}
+                continue
+            self.steps[name] = {'status': 'pending'}
+            jobs.append(self._run_step(name, sync, count_key))
+        print("🔄 Warm-up sync started in the background - serving cached data until it finishes")
+        self._task = asyncio.create_task(self._run_all(jobs))
+
+    async def _run_all(self, jobs: List[Awaitable[None]]) -> None:
+        await asyncio.gather(*jobs)
+        print("🎉 Startup warm-up finished")
+
+    def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    @property
+    def finished(self) -> bool:
+        return all(step['status'] in ('done', 'failed', 'cancelled') for step in self.steps.values())
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'requested': self.requested,
+            'finished': self.finished,
+            'steps': self.steps
+        }
+
+
+startup_warmup = StartupWarmUp()
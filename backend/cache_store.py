@@ -0,0 +1,580 @@
+"""
+Indexed local cache for WooCommerce products and Eventbrite series.
+Backed by SQLite so single-product and single-series lookups are point queries
+and updates only rewrite the rows that changed, instead of re-serialising one
+large JSON document per save. Also holds the optional WordPress ticket sales
+summary (see WordPressDBClient.maintain_ticket_summary).
+"""
+
+import os
+import json
+import hashlib
+import sqlite3
+import logging
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+
+from dotenv import load_dotenv
+
+# Load environment variables from the project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS products (
+    product_id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS slots (
+    product_id INTEGER NOT NULL,
+    slot_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (product_id, slot_id)
+);
+CREATE TABLE IF NOT EXISTS dates (
+    product_id INTEGER NOT NULL,
+    slot_id TEXT NOT NULL,
+    date_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (product_id, slot_id, date_id)
+);
+CREATE TABLE IF NOT EXISTS failed_products (
+    position INTEGER PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS series (
+    series_name TEXT PRIMARY KEY,
+    series_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_series_series_id ON series (series_id);
+CREATE TABLE IF NOT EXISTS occurrences (
+    series_name TEXT NOT NULL,
+    occurrence_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (series_name, occurrence_id)
+);
+CREATE INDEX IF NOT EXISTS idx_occurrences_occurrence_id ON occurrences (occurrence_id);
+CREATE TABLE IF NOT EXISTS tracked_events (
+    event_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ticket_ledger (
+    ticket_id INTEGER PRIMARY KEY,
+    product_id INTEGER NOT NULL,
+    slot TEXT NOT NULL COLLATE NOCASE,
+    date TEXT NOT NULL COLLATE NOCASE,
+    status TEXT NOT NULL COLLATE NOCASE
+);
+CREATE TABLE IF NOT EXISTS ticket_sales (
+    product_id INTEGER NOT NULL,
+    date TEXT NOT NULL COLLATE NOCASE,
+    slot TEXT NOT NULL COLLATE NOCASE,
+    status TEXT NOT NULL COLLATE NOCASE,
+    tickets INTEGER NOT NULL,
+    PRIMARY KEY (product_id, date, slot, status)
+);
+"""
+
+PRODUCTS_DOCUMENT = 'woocommerce_products'
+SERIES_DOCUMENT = 'eventbrite_series'
+SERIES_SYNC_DOCUMENT = 'eventbrite_sync'
+TICKET_SALES_DOCUMENT = 'wordpress_ticket_sales'
+
+# FooEvents ticket statuses that don't count as sold (same as the live WordPress queries)
+UNSOLD_TICKET_STATUSES = ('Canceled', 'Cancelled', 'Unpaid')
+# Statuses FooEvents still changes in wp_postmeta (e.g. on payment) without touching post_modified
+PENDING_TICKET_STATUSES = ('Unpaid',)
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def _split(entry: Dict[str, Any], child_key: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Separate an entry's child list (e.g. a product's slots) from its own fields"""
+    fields = {key: value for key, value in entry.items() if key != child_key}
+    return fields, entry.get(child_key) or []
+
+
+class CacheStore:
+    """
+    SQLite store holding the products cache (products → slots → dates) and the
+    series cache (series → occurrences, plus incremental sync state).
+
+    Each table keeps its natural key and list position as columns and the rest of
+    the entry as JSON, so whole documents rebuild in their original order and
+    shape. A single connection is shared behind a lock; calls are short and are
+    made from the blocking I/O thread pool.
+
+    Every write bumps a per-document version counter in the database. Parsed
+    documents and metadata are memoised in process and reused for as long as the
+    stored version is unchanged, which also picks up writes from other processes.
+    Memoised documents are shared: callers get a fresh top-level dict but must not
+    modify the nested products/series lists.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        
+        # (document name, view) -> (version, parsed value)
+        self._memo: Dict[Tuple[str, str], Tuple[int, Any]] = {}
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+    # Documents
+
+    def _get_document(self, name: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute('SELECT data FROM documents WHERE name = ?', (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _put_document(self, name: str, data: Dict[str, Any]) -> None:
+        self._conn.execute('INSERT OR REPLACE INTO documents (name, data) VALUES (?, ?)', (name, _dumps(data)))
+
+    def _bump_version(self, name: str) -> None:
+        self._conn.execute('INSERT INTO versions (name, version) VALUES (?, 1) '
+                           'ON CONFLICT(name) DO UPDATE SET version = version + 1', (name,))
+
+    def get_version(self, name: str) -> int:
+        """Current version of a cached document (0 if it was never written); changes on every write"""
+        with self._lock:
+            row = self._conn.execute('SELECT version FROM versions WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else 0
+
+    def _memoized(self, name: str, view: str, loader):
+        """Return the memoised value for a document view, reloading it if the document's version changed"""
+        with self._lock:
+            version = self.get_version(name)
+            hit = self._memo.get((name, view))
+            if hit and hit[0] == version:
+                self.memo_hits += 1
+                return hit[1]
+            self.memo_misses += 1
+            value = loader()
+            self._memo[(name, view)] = (version, value)
+            return value
+
+    def get_etag(self, name: str) -> Optional[str]:
+        """
+        Weak ETag for a cached document: its last_updated timestamp plus a hash of
+        its content, computed once per document version. None if nothing is cached.
+        Weak because responses built from the document also carry its age (cache_age_minutes),
+        which changes without a new version: they're equivalent, not byte-identical.
+        """
+        loaders = {PRODUCTS_DOCUMENT: self._read_products_document, SERIES_DOCUMENT: self._read_series_document}
+        
+        def compute_etag():
+            document = self._memoized(name, 'full', loaders[name])
+            if document is None:
+                return None
+            digest = hashlib.sha256()
+            digest.update(str(document.get('last_updated')).encode('utf-8'))
+            digest.update(json.dumps(document, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+            return f'W/"{digest.hexdigest()[:32]}"'
+        
+        return self._memoized(name, 'etag', compute_etag)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Document versions and in-memory cache hit statistics"""
+        return {
+            'path': self.path,
+            'products_version': self.get_version(PRODUCTS_DOCUMENT),
+            'series_version': self.get_version(SERIES_DOCUMENT),
+            'memo_hits': self.memo_hits,
+            'memo_misses': self.memo_misses
+        }
+
+    def has_document(self, name: str) -> bool:
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM documents WHERE name = ?', (name,)).fetchone() is not None
+
+    # WooCommerce products
+
+    def _insert_product(self, position: int, product: Dict[str, Any]) -> None:
+        product_fields, slots = _split(product, 'slots')
+        product_id = int(product_fields['product_id'])
+        self._conn.execute('INSERT OR REPLACE INTO products (product_id, position, data) VALUES (?, ?, ?)',
+                           (product_id, position, _dumps(product_fields)))
+        for slot_position, slot in enumerate(slots):
+            slot_fields, dates = _split(slot, 'dates')
+            slot_id = str(slot_fields.get('slot_id'))
+            self._conn.execute('INSERT OR REPLACE INTO slots (product_id, slot_id, position, data) VALUES (?, ?, ?, ?)',
+                               (product_id, slot_id, slot_position, _dumps(slot_fields)))
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO dates (product_id, slot_id, date_id, position, data) VALUES (?, ?, ?, ?, ?)',
+                [(product_id, slot_id, str(date.get('date_id')), date_position, _dumps(date))
+                 for date_position, date in enumerate(dates)]
+            )
+
+    def _delete_product_rows(self, product_id: int) -> None:
+        for table in ('products', 'slots', 'dates'):
+            self._conn.execute(f'DELETE FROM {table} WHERE product_id = ?', (product_id,))
+
+    def save_products_document(self, data: Dict[str, Any]) -> None:
+        """Replace the whole products cache"""
+        document, products = _split(data, 'products')
+        document.pop('failed_products', None)
+        with self._lock, self._conn:
+            for table in ('products', 'slots', 'dates', 'failed_products'):
+                self._conn.execute(f'DELETE FROM {table}')
+            for position, product in enumerate(products):
+                self._insert_product(position, product)
+            self._conn.executemany('INSERT INTO failed_products (position, data) VALUES (?, ?)',
+                                   [(position, _dumps(failure)) for position, failure in enumerate(data.get('failed_products') or [])])
+            self._put_document(PRODUCTS_DOCUMENT, document)
+            self._bump_version(PRODUCTS_DOCUMENT)
+
+    def load_products_document(self) -> Optional[Dict[str, Any]]:
+        """Get the full products cache document, or None if nothing is cached"""
+        document = self._memoized(PRODUCTS_DOCUMENT, 'full', self._read_products_document)
+        return dict(document) if document is not None else None
+
+    def _read_products_document(self) -> Optional[Dict[str, Any]]:
+        document = self._get_document(PRODUCTS_DOCUMENT)
+        if document is None:
+            return None
+        products = self._load_products()
+        failed = [json.loads(row[0]) for row in self._conn.execute('SELECT data FROM failed_products ORDER BY position')]
+        return {'products': products, 'failed_products': failed, **document}
+
+    def _load_products(self, product_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        where, params = ('WHERE product_id = ?', (product_id,)) if product_id is not None else ('', ())
+        products = {}
+        for pid, data in self._conn.execute(f'SELECT product_id, data FROM products {where} ORDER BY position', params):
+            products[pid] = {**json.loads(data), 'slots': []}
+        slots = {}
+        for pid, slot_id, data in self._conn.execute(f'SELECT product_id, slot_id, data FROM slots {where} ORDER BY product_id, position', params):
+            slot = {**json.loads(data), 'dates': []}
+            slots[(pid, slot_id)] = slot
+            if pid in products:
+                products[pid]['slots'].append(slot)
+        for pid, slot_id, data in self._conn.execute(f'SELECT product_id, slot_id, data FROM dates {where} ORDER BY product_id, slot_id, position', params):
+            if (pid, slot_id) in slots:
+                slots[(pid, slot_id)]['dates'].append(json.loads(data))
+        return list(products.values())
+
+    def get_products_meta(self) -> Optional[Dict[str, Any]]:
+        """Products cache totals and timestamps, without loading any products"""
+        meta = self._memoized(PRODUCTS_DOCUMENT, 'meta', lambda: self._get_document(PRODUCTS_DOCUMENT))
+        return dict(meta) if meta is not None else None
+
+    def get_product(self, product_id: int) -> Optional[Dict[str, Any]]:
+        """Get one cached product with its slots and dates"""
+        with self._lock:
+            products = self._load_products(int(product_id))
+        return products[0] if products else None
+
+    def update_product(self, product: Dict[str, Any]) -> None:
+        """Replace one cached product's rows (position is kept, new products go last)"""
+        product_id = int(product['product_id'])
+        with self._lock, self._conn:
+            row = self._conn.execute('SELECT position FROM products WHERE product_id = ?', (product_id,)).fetchone()
+            if row:
+                position = row[0]
+            else:
+                position = self._conn.execute('SELECT COALESCE(MAX(position) + 1, 0) FROM products').fetchone()[0]
+            self._delete_product_rows(product_id)
+            self._insert_product(position, product)
+            self._bump_version(PRODUCTS_DOCUMENT)
+
+    def get_date(self, product_id: int, slot_id: str, date_id: str) -> Optional[Dict[str, Any]]:
+        """Get one cached slot date"""
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM dates WHERE product_id = ? AND slot_id = ? AND date_id = ?',
+                                     (int(product_id), str(slot_id), str(date_id))).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update_date(self, product_id: int, slot_id: str, date_id: str, fields: Dict[str, Any]) -> bool:
+        """
+        Update fields of one cached slot date in place.
+
+        Returns:
+            True if the date row existed and was updated
+        """
+        key = (int(product_id), str(slot_id), str(date_id))
+        with self._lock, self._conn:
+            row = self._conn.execute('SELECT data FROM dates WHERE product_id = ? AND slot_id = ? AND date_id = ?', key).fetchone()
+            if not row:
+                return False
+            self._conn.execute('UPDATE dates SET data = ? WHERE product_id = ? AND slot_id = ? AND date_id = ?',
+                               (_dumps({**json.loads(row[0]), **fields}), *key))
+            self._bump_version(PRODUCTS_DOCUMENT)
+            return True
+
+    # Eventbrite series
+
+    def save_series_document(self, data: Dict[str, Any]) -> None:
+        """Replace the whole series cache, including the incremental sync state if present"""
+        document, series_list = _split(data, 'series')
+        sync_state = document.pop('sync_state', None)
+        with self._lock, self._conn:
+            for table in ('series', 'occurrences'):
+                self._conn.execute(f'DELETE FROM {table}')
+            for position, series in enumerate(series_list):
+                series_fields, occurrences = _split(series, 'events')
+                series_name = series_fields.get('series_name')
+                self._conn.execute('INSERT OR REPLACE INTO series (series_name, series_id, position, data) VALUES (?, ?, ?, ?)',
+                                   (series_name, str(series_fields.get('series_id')), position, _dumps(series_fields)))
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO occurrences (series_name, occurrence_id, position, data) VALUES (?, ?, ?, ?)',
+                    [(series_name, str(occurrence.get('occurrence_id')), occurrence_position, _dumps(occurrence))
+                     for occurrence_position, occurrence in enumerate(occurrences)]
+                )
+            self._put_document(SERIES_DOCUMENT, document)
+            if sync_state is not None:
+                sync_fields, tracked_events = sync_state.copy(), sync_state.get('events') or {}
+                sync_fields.pop('events', None)
+                self._conn.execute('DELETE FROM tracked_events')
+                self._conn.executemany('INSERT INTO tracked_events (event_id, data) VALUES (?, ?)',
+                                       [(str(event_id), _dumps(record)) for event_id, record in tracked_events.items()])
+                self._put_document(SERIES_SYNC_DOCUMENT, sync_fields)
+            self._bump_version(SERIES_DOCUMENT)
+
+    def load_series_document(self, include_sync_state: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get the full series cache document, or None if nothing is cached.
+        The sync state is read fresh (not memoised) since callers modify it.
+        """
+        document = self._memoized(SERIES_DOCUMENT, 'full', self._read_series_document)
+        if document is None:
+            return None
+        result = dict(document)
+        if include_sync_state:
+            with self._lock:
+                sync_fields = self._get_document(SERIES_SYNC_DOCUMENT)
+                if sync_fields is not None:
+                    events = {event_id: json.loads(data) for event_id, data in self._conn.execute('SELECT event_id, data FROM tracked_events')}
+                    result['sync_state'] = {**sync_fields, 'events': events}
+        return result
+
+    def _read_series_document(self) -> Optional[Dict[str, Any]]:
+        document = self._get_document(SERIES_DOCUMENT)
+        if document is None:
+            return None
+        return {'series': self._load_series(), **document}
+
+    def _load_series(self, series_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        if series_id is not None:
+            rows = self._conn.execute('SELECT series_name, data FROM series WHERE series_id = ? ORDER BY position', (str(series_id),)).fetchall()
+        else:
+            rows = self._conn.execute('SELECT series_name, data FROM series ORDER BY position').fetchall()
+        series_map = {name: {**json.loads(data), 'events': []} for name, data in rows}
+        if series_id is not None:
+            placeholders = ', '.join(['?'] * len(series_map))
+            occurrence_rows = self._conn.execute(
+                f'SELECT series_name, data FROM occurrences WHERE series_name IN ({placeholders}) ORDER BY series_name, position',
+                tuple(series_map)
+            ) if series_map else []
+        else:
+            occurrence_rows = self._conn.execute('SELECT series_name, data FROM occurrences ORDER BY series_name, position')
+        for name, data in occurrence_rows:
+            if name in series_map:
+                series_map[name]['events'].append(json.loads(data))
+        return list(series_map.values())
+
+    def get_series_meta(self) -> Optional[Dict[str, Any]]:
+        """Series cache totals and timestamps (plus sync watermark), without loading any series"""
+        meta = self._memoized(SERIES_DOCUMENT, 'meta', self._read_series_meta)
+        return dict(meta) if meta is not None else None
+
+    def _read_series_meta(self) -> Optional[Dict[str, Any]]:
+        document = self._get_document(SERIES_DOCUMENT)
+        if document is None:
+            return None
+        sync_fields = self._get_document(SERIES_SYNC_DOCUMENT)
+        if sync_fields is not None:
+            document['sync_state'] = sync_fields
+        return document
+
+    def get_series(self, series_id: str) -> Optional[Dict[str, Any]]:
+        """Get one cached series with its occurrences"""
+        with self._lock:
+            series = self._load_series(series_id)
+        return series[0] if series else None
+
+    # Migration from the legacy JSON cache files
+
+    def import_json_cache(self, path: str, kind: str) -> bool:
+        """
+        Load a legacy JSON cache file (woocommerce_cache.json / series_cache.json) if this
+        store has nothing cached for it yet.
+
+        Returns:
+            True if the file was imported
+        """
+        document_name = PRODUCTS_DOCUMENT if kind == 'products' else SERIES_DOCUMENT
+        if self.has_document(document_name) or not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if kind == 'products':
+                self.save_products_document(data)
+            else:
+                self.save_series_document(data)
+            logging.info(f"Imported {path} into cache store {self.path}")
+            return True
+        except (json.JSONDecodeError, ValueError, KeyError, sqlite3.Error) as e:
+            logging.error(f"Failed to import legacy cache {path}: {e}")
+            return False
+
+    # WordPress ticket sales summary
+
+    def _count_ticket(self, ticket: Tuple[int, int, str, str, str], delta: int) -> None:
+        _, product_id, slot, date, status = ticket
+        self._conn.execute('INSERT INTO ticket_sales (product_id, date, slot, status, tickets) VALUES (?, ?, ?, ?, ?) '
+                           'ON CONFLICT(product_id, date, slot, status) DO UPDATE SET tickets = tickets + excluded.tickets',
+                           (product_id, date, slot, status, delta))
+
+    def replace_ticket_sales(self, tickets: List[Tuple[int, int, str, str, str]], state: Dict[str, Any]) -> None:
+        """
+        Replace the ticket ledger and summary (backfill).
+
+        Args:
+            tickets: (ticket_id, product_id, slot, date, status) for every sold ticket
+            state: Scan state to store with it (e.g. last_seen_id)
+        """
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM ticket_ledger')
+            self._conn.execute('DELETE FROM ticket_sales')
+            self._conn.executemany('INSERT OR REPLACE INTO ticket_ledger (ticket_id, product_id, slot, date, status) VALUES (?, ?, ?, ?, ?)', tickets)
+            self._conn.execute('INSERT INTO ticket_sales (product_id, date, slot, status, tickets) '
+                               'SELECT product_id, date, slot, status, COUNT(*) FROM ticket_ledger GROUP BY product_id, date, slot, status')
+            self._put_document(TICKET_SALES_DOCUMENT, state)
+            self._bump_version(TICKET_SALES_DOCUMENT)
+
+    def apply_ticket_changes(self, changes: List[Tuple[int, Optional[Tuple[int, int, str, str, str]]]], state: Dict[str, Any]) -> int:
+        """
+        Apply new and modified tickets to the ledger and summary as deltas.
+
+        Args:
+            changes: (ticket_id, ticket) pairs; ticket is (ticket_id, product_id, slot, date, status),
+                     or None if the ticket no longer counts (trashed, unpublished)
+            state: Scan state to store with the changes
+
+        Returns:
+            Number of tickets whose entry changed (rescanning unchanged tickets is a no-op)
+        """
+        changed = 0
+        with self._lock, self._conn:
+            for ticket_id, ticket in changes:
+                row = self._conn.execute('SELECT ticket_id, product_id, slot, date, status FROM ticket_ledger WHERE ticket_id = ?', (ticket_id,)).fetchone()
+                old = tuple(row) if row else None
+                if old == (tuple(ticket) if ticket else None):
+                    continue
+                if old:
+                    self._count_ticket(old, -1)
+                    self._conn.execute('DELETE FROM ticket_ledger WHERE ticket_id = ?', (ticket_id,))
+                if ticket:
+                    self._conn.execute('INSERT INTO ticket_ledger (ticket_id, product_id, slot, date, status) VALUES (?, ?, ?, ?, ?)', ticket)
+                    self._count_ticket(ticket, 1)
+                changed += 1
+            if changed:
+                self._conn.execute('DELETE FROM ticket_sales WHERE tickets <= 0')
+                self._bump_version(TICKET_SALES_DOCUMENT)
+            self._put_document(TICKET_SALES_DOCUMENT, state)
+        return changed
+
+    def get_ticket_sales_state(self) -> Optional[Dict[str, Any]]:
+        """Stored ticket summary scan state, or None if it was never built"""
+        with self._lock:
+            return self._get_document(TICKET_SALES_DOCUMENT)
+
+    def get_ticket_dates(self) -> List[str]:
+        """Distinct booking dates in the ticket ledger"""
+        with self._lock:
+            rows = self._conn.execute('SELECT DISTINCT date FROM ticket_ledger').fetchall()
+        return [row[0] for row in rows]
+
+    def get_open_ticket_ids(self, dates: List[str]) -> List[int]:
+        """Ledger tickets whose status can still change: pending payment, or booked for one of the given dates"""
+        status_placeholders = ', '.join(['?'] * len(PENDING_TICKET_STATUSES))
+        date_placeholders = ', '.join(['?'] * len(dates))
+        query = f'SELECT ticket_id FROM ticket_ledger WHERE status IN ({status_placeholders})'
+        if dates:
+            query += f' OR date IN ({date_placeholders})'
+        with self._lock:
+            rows = self._conn.execute(query + ' ORDER BY ticket_id', (*PENDING_TICKET_STATUSES, *dates)).fetchall()
+        return [row[0] for row in rows]
+
+    def get_ticket_slots(self, product_id: int) -> List[str]:
+        """Distinct stored slot values of a product's tickets in the summary"""
+        with self._lock:
+            rows = self._conn.execute('SELECT DISTINCT slot FROM ticket_sales WHERE product_id = ?', (int(product_id),)).fetchall()
+        return [row[0] for row in rows]
+
+    def count_tickets_sold(self, product_id: int, slot_values: List[str], booking_date: str) -> int:
+        """
+        Tickets sold for one product/date and the given stored slot values, from the summary.
+        The date matches exactly, case-insensitively, like the live query.
+        """
+        if not slot_values:
+            return 0
+        slot_placeholders = ', '.join(['?'] * len(slot_values))
+        status_placeholders = ', '.join(['?'] * len(UNSOLD_TICKET_STATUSES))
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT COALESCE(SUM(tickets), 0) FROM ticket_sales '
+                f'WHERE product_id = ? AND date = ? AND slot IN ({slot_placeholders}) AND status NOT IN ({status_placeholders})',
+                (int(product_id), booking_date, *slot_values, *UNSOLD_TICKET_STATUSES)
+            ).fetchone()
+        return row[0]
+
+    def get_tickets_sold_for_products(self, product_ids: List[int]) -> Dict[int, Dict[Tuple[str, str], int]]:
+        """Tickets sold per (stored slot, date) for several products from the summary"""
+        sold_counts: Dict[int, Dict[Tuple[str, str], int]] = {int(pid): {} for pid in product_ids}
+        if not sold_counts:
+            return sold_counts
+        id_placeholders = ', '.join(['?'] * len(sold_counts))
+        status_placeholders = ', '.join(['?'] * len(UNSOLD_TICKET_STATUSES))
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT product_id, slot, date, SUM(tickets) FROM ticket_sales '
+                f'WHERE product_id IN ({id_placeholders}) AND status NOT IN ({status_placeholders}) '
+                'GROUP BY product_id, slot, date',
+                (*sold_counts, *UNSOLD_TICKET_STATUSES)
+            ).fetchall()
+        for product_id, slot, date, tickets in rows:
+            if tickets:
+                sold_counts[product_id][(slot, date)] = tickets
+        return sold_counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[CacheStore] = None
+_store_lock = threading.Lock()
+
+
+def get_cache_store() -> CacheStore:
+    """Get the process-wide cache store, creating it (and importing legacy JSON caches) on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            path = os.getenv('CACHE_DB_PATH') or os.path.join(BACKEND_DIR, 'cache.db')
+            _store = CacheStore(path)
+            _store.import_json_cache(os.path.join(BACKEND_DIR, 'woocommerce_cache.json'), 'products')
+            _store.import_json_cache(os.path.join(BACKEND_DIR, 'series_cache.json'), 'series')
+        return _store
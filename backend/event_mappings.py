@@ -1,14 +1,69 @@
 """
 Event Mapping System for Backroom Comedy Club
 Handles three-tier mapping: manual fallback → programmatic → user override
+
+Programmatic matching goes through a SeriesIndex (keyword and day-of-week → series IDs)
+built once per series snapshot, and the full mapping result is memoised per data
+version (products, series and user overrides), so repeated /mappings calls don't
+redo the matching. Name matches are scored by the Jaccard similarity of their key
+words; the score is reported as the mapping's confidence, and unmapped products get
+ranked series suggestions.
+
+User overrides live in a UserMappingStore: one in-memory copy per process, reloaded
+when the file changes on disk, with edits written atomically under a file lock so
+several workers can't overwrite each other's changes.
 """
 
-from typing import List, Dict, Optional, Union
-from dataclasses import dataclass
+from typing import Any, List, Dict, Optional, Tuple, Union
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields, replace
 from datetime import datetime
 import re
 import json
 import os
+import hashlib
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from dotenv import load_dotenv
+
+# Load environment variables from the project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+# User override mappings file (relative paths are resolved against the backend directory)
+USER_MAPPINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.getenv('USER_MAPPINGS_PATH', 'user_mappings.json'))
+
+# Day-of-week matching for regular shows: whole-word spellings of each day
+DAY_PATTERNS = {
+    'wednesday': ['wednesday', 'wednesdays', 'wed', 'weds'],
+    'thursday': ['thursday', 'thursdays', 'thu', 'thur', 'thurs'],
+    'friday': ['friday', 'fridays', 'fri'],
+    'saturday': ['saturday', 'saturdays', 'sat'],
+    'sunday': ['sunday', 'sundays', 'sun']
+}
+# Day spelling -> day ('weds' -> 'wednesday')
+DAY_ALIASES = {pattern: day for day, patterns in DAY_PATTERNS.items() for pattern in patterns}
+
+# Common words ignored when comparing event names
+STOP_WORDS = {
+    'at', 'the', 'and', 'or', 'in', 'on', 'with', 'by', 'for', 'to', 'of', 'a', 'an',
+    'backroom', 'comedy', 'club', 'show', 'live', 'night', 'pro', 'hilarious',
+    'stand-up', 'standup', 'stand', 'up', '@', '|', '-', '&', 'pm', 'am'
+}
+
+# Minimum number of shared key words for a name match
+MIN_KEY_WORD_OVERLAP = 2
+# Minimum Jaccard similarity of key words for a name match (0-1)
+MAPPING_MIN_CONFIDENCE = float(os.getenv('MAPPING_MIN_CONFIDENCE', '0.5'))
+# Ranked series suggestions returned for each unmapped WooCommerce product
+MAX_SUGGESTIONS = 3
 
 @dataclass
 class EventMapping:
@@ -19,6 +74,9 @@ class EventMapping:
     mapping_source: str  # 'manual_fallback' | 'programmatic' | 'user_override'
     is_active: bool
     last_updated: str
+    confidence: Optional[float] = None  # programmatic mappings only: lowest match score of the linked series
+
+_MAPPING_FIELDS = {f.name for f in fields(EventMapping)}
 
 @dataclass
 class UnmappedEvent:
@@ -28,11 +86,17 @@ class UnmappedEvent:
     product_id: Optional[str] = None
     series_id: Optional[str] = None
     reason: str = 'no_match_found'  # 'no_match_found' | 'event_removed' | 'user_unmapped'
+    suggestions: List[Dict[str, Any]] = field(default_factory=list)  # ranked {series_id, series_name, score}
 
 class EventMappingManager:
     def __init__(self):
         self.manual_mappings = self._get_manual_fallback_mappings()
-        self.user_overrides = self._load_user_overrides()
+        self.store = get_user_mapping_store()
+    
+    @property
+    def user_overrides(self) -> Dict[str, EventMapping]:
+        """Current user override mappings (shared; change them through the store)"""
+        return self.store.get_all()
     
     def _get_manual_fallback_mappings(self) -> List[EventMapping]:
         """
@@ -215,115 +279,44 @@ class EventMappingManager:
         ]
         return mappings
     
-    def _load_user_overrides(self) -> Dict[str, EventMapping]:
-        """Load user override mappings from file"""
-        try:
-            if os.path.exists('user_mappings.json'):
-                with open('user_mappings.json', 'r') as f:
-                    data = json.load(f)
-                    return {
-                        mapping['id']: EventMapping(**mapping) 
-                        for mapping in data
-                    }
-        except Exception as e:
-            print(f"Error loading user overrides: {e}")
-        return {}
-    
-    def _save_user_overrides(self):
-        """Save user override mappings to file"""
-        try:
-            data = [
-                {
-                    'id': mapping.id,
-                    'name': mapping.name,
-                    'woocommerce_product_id': mapping.woocommerce_product_id,
-                    'eventbrite_series_ids': mapping.eventbrite_series_ids,
-                    'mapping_source': mapping.mapping_source,
-                    'is_active': mapping.is_active,
-                    'last_updated': mapping.last_updated
-                }
-                for mapping in self.user_overrides.values()
-            ]
-            with open('user_mappings.json', 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Error saving user overrides: {e}")
-    
     def get_programmatic_mappings(self, woocommerce_products: List[Dict], eventbrite_series: List[Dict]) -> List[EventMapping]:
         """
         Generate programmatic mappings using algorithms that would produce 
         the same results as the manual mappings
         """
         programmatic_mappings = []
+        index = get_series_index(eventbrite_series)
+        manual_product_ids = {m.woocommerce_product_id for m in self.manual_mappings}
         
         for product in woocommerce_products:
             # Skip if already manually mapped
-            if any(m.woocommerce_product_id == str(product['product_id']) for m in self.manual_mappings):
+            if str(product['product_id']) in manual_product_ids:
                 continue
             
             product_name = product.get('product_name', '').lower()
-            matched_series = []
-            
-            # Day-of-week matching for regular shows
-            day_patterns = {
-                'wednesday': ['wednesday', 'wed'],
-                'thursday': ['thursday', 'thu'],
-                'friday': ['friday', 'fri'],
-                'saturday': ['saturday', 'sat'],
-                'sunday': ['sunday', 'sun']
-            }
+            product_words = match_words(product_name)
             
-            for day, patterns in day_patterns.items():
-                if any(pattern in product_name for pattern in patterns):
-                    # Find matching Eventbrite series for this day
-                    for series in eventbrite_series:
-                        series_name = series.get('series_name', '').lower()
-                        if any(pattern in series_name for pattern in patterns):
-                            matched_series.append(str(series['series_id']))
+            # Day-of-week matching for regular shows, then key word matching for special events
+            day_series = index.match_days(product_name)
+            if day_series:
+                matched = [(series_id, index.score(product_words, series_id)) for series_id in day_series]
+            else:
+                matched = index.match_key_words(product_words)
             
-            # Exact name matching for special events
-            if not matched_series:
-                for series in eventbrite_series:
-                    series_name = series.get('series_name', '').lower()
-                    
-                    # Extract key words from both names
-                    product_words = self._extract_key_words(product_name)
-                    series_words = self._extract_key_words(series_name)
-                    
-                    # Check for significant overlap
-                    overlap = len(product_words.intersection(series_words))
-                    if overlap >= 2:  # At least 2 key words match
-                        matched_series.append(str(series['series_id']))
-            
-            if matched_series:
+            if matched:
                 programmatic_mappings.append(EventMapping(
                     id=f"prog_{product['product_id']}",
                     name=product.get('product_name', ''),
                     woocommerce_product_id=str(product['product_id']),
-                    eventbrite_series_ids=matched_series,
+                    eventbrite_series_ids=[series_id for series_id, _ in matched],
                     mapping_source="programmatic",
                     is_active=True,
-                    last_updated=datetime.now().isoformat()
+                    last_updated=datetime.now().isoformat(),
+                    confidence=min(score for _, score in matched)
                 ))
         
         return programmatic_mappings
     
-    def _extract_key_words(self, text: str) -> set:
-        """Extract meaningful words from event name for matching"""
-        # Remove common words and punctuation
-        stop_words = {
-            'at', 'the', 'and', 'or', 'in', 'on', 'with', 'by', 'for', 'to', 'of', 'a', 'an',
-            'backroom', 'comedy', 'club', 'show', 'live', 'night', 'pro', 'hilarious',
-            'stand-up', 'standup', 'stand', 'up', '@', '|', '-', '&', 'pm', 'am'
-        }
-        
-        # Clean and split text
-        cleaned = re.sub(r'[^\w\s]', ' ', text.lower())
-        words = set(cleaned.split())
-        
-        # Remove stop words and short words
-        return {word for word in words if len(word) > 2 and word not in stop_words}
-    
     def get_all_mappings(self, woocommerce_products: List[Dict] = None, eventbrite_series: List[Dict] = None) -> List[EventMapping]:
         """Get all mappings in priority order: user overrides → manual fallback → programmatic"""
         all_mappings = []
@@ -354,13 +347,15 @@ class EventMappingManager:
 
         return all_mappings
     
-    def get_unmapped_events(self, woocommerce_products: List[Dict], eventbrite_series: List[Dict]) -> List[UnmappedEvent]:
-        """Get events that couldn't be mapped"""
+    def get_unmapped_events(self, woocommerce_products: List[Dict], eventbrite_series: List[Dict], all_mappings: Optional[List[EventMapping]] = None) -> List[UnmappedEvent]:
+        """Get events that couldn't be mapped (pass all_mappings if already computed to avoid matching twice)"""
         unmapped = []
-        all_mappings = self.get_all_mappings(woocommerce_products, eventbrite_series)
+        if all_mappings is None:
+            all_mappings = self.get_all_mappings(woocommerce_products, eventbrite_series)
         
         # Check for unmapped WooCommerce products
         mapped_product_ids = {m.woocommerce_product_id for m in all_mappings if m.is_active}
+        index = get_series_index(eventbrite_series)
         for product in woocommerce_products:
             if str(product['product_id']) not in mapped_product_ids:
                 unmapped.append(UnmappedEvent(
@@ -368,7 +363,11 @@ class EventMappingManager:
                     platform="woocommerce",
                     name=product.get('product_name', ''),
                     product_id=str(product['product_id']),
-                    reason="no_match_found"
+                    reason="no_match_found",
+                    suggestions=[
+                        {'series_id': series_id, 'series_name': index.names[series_id], 'score': score}
+                        for series_id, score in index.rank(match_words(product.get('product_name', '')), limit=MAX_SUGGESTIONS)
+                    ]
                 ))
         
         # Check for unmapped Eventbrite series
@@ -389,6 +388,19 @@ class EventMappingManager:
         
         return unmapped
     
+    def get_mappings_and_unmapped(self, woocommerce_products: List[Dict], eventbrite_series: List[Dict]) -> Tuple[List[EventMapping], List[UnmappedEvent]]:
+        """
+        Get all mappings and the unmapped events, running the matching once.
+        The result is memoised per data version and shared across requests (don't modify it).
+        """
+        key = (_products_digest(woocommerce_products), _series_digest(eventbrite_series), self.store.get_version())
+        
+        def compute():
+            all_mappings = self.get_all_mappings(woocommerce_products, eventbrite_series)
+            return all_mappings, self.get_unmapped_events(woocommerce_products, eventbrite_series, all_mappings)
+        
+        return _mapping_results.get(key, compute)
+    
     def create_user_mapping(self, woocommerce_product_id: str, eventbrite_series_ids: List[str], name: str) -> EventMapping:
         """Create a new user override mapping"""
         mapping = EventMapping(
@@ -401,20 +413,14 @@ class EventMappingManager:
             last_updated=datetime.now().isoformat()
         )
         
-        self.user_overrides[mapping.id] = mapping
-        self._save_user_overrides()
+        self.store.put(mapping)
         return mapping
     
     def update_mapping(self, mapping_id: str, **kwargs) -> Optional[EventMapping]:
         """Update an existing mapping"""
         # Check user overrides first
-        if mapping_id in self.user_overrides:
-            mapping = self.user_overrides[mapping_id]
-            for key, value in kwargs.items():
-                if hasattr(mapping, key):
-                    setattr(mapping, key, value)
-            mapping.last_updated = datetime.now().isoformat()
-            self._save_user_overrides()
+        mapping = self.store.update(mapping_id, **kwargs)
+        if mapping:
             return mapping
         
         # For manual mappings, create a user override
@@ -429,25 +435,319 @@ class EventMappingManager:
                 is_active=kwargs.get('is_active', manual_mapping.is_active),
                 last_updated=datetime.now().isoformat()
             )
-            self.user_overrides[new_mapping.id] = new_mapping
-            self._save_user_overrides()
+            self.store.put(new_mapping)
             return new_mapping
         
         return None
     
     def delete_mapping(self, mapping_id: str) -> bool:
         """Delete a user override mapping"""
-        if mapping_id in self.user_overrides:
-            del self.user_overrides[mapping_id]
-            self._save_user_overrides()
-            return True
-        return False
+        return self.store.delete(mapping_id)
     
     def get_mapping_by_id(self, mapping_id: str) -> Optional[EventMapping]:
         """Get a specific mapping by ID"""
         # Check user overrides first
-        if mapping_id in self.user_overrides:
-            return self.user_overrides[mapping_id]
+        mapping = self.user_overrides.get(mapping_id)
+        if mapping:
+            return mapping
         
         # Check manual mappings
-        return next((m for m in self.manual_mappings if m.id == mapping_id), None) 
\ No newline at end of file
+        return next((m for m in self.manual_mappings if m.id == mapping_id), None) 
+
+
+def extract_key_words(text: str) -> set:
+    """Extract meaningful words from event name for matching"""
+    # Remove common words and punctuation
+    cleaned = re.sub(r'[^\w\s]', ' ', text.lower())
+    words = set(cleaned.split())
+    
+    # Remove stop words and short words
+    return {word for word in words if len(word) > 2 and word not in STOP_WORDS}
+
+
+def _matching_days(name: str) -> List[str]:
+    """Days named by whole words of an event name ('Thunder' and 'Satire' aren't days)"""
+    tokens = set(re.sub(r'[^\w\s]', ' ', name.lower()).split())
+    return [day for day, patterns in DAY_PATTERNS.items() if tokens.intersection(patterns)]
+
+
+def match_words(name: str) -> set:
+    """Key words used for scoring, with day spellings ('wed', 'wednesdays') folded into the day name"""
+    return {DAY_ALIASES.get(word, word) for word in extract_key_words(name)}
+
+
+class SeriesIndex:
+    """
+    Inverted index over one Eventbrite series snapshot: key word → series IDs and
+    day-of-week → series IDs. Series names are tokenised once when the index is built,
+    so matching a product only looks at series that share a day or a key word with it.
+    """
+
+    def __init__(self, eventbrite_series: List[Dict]):
+        self.series_ids: List[str] = []
+        self.names: Dict[str, str] = {}
+        self.words: Dict[str, set] = {}
+        self.by_day: Dict[str, List[str]] = {day: [] for day in DAY_PATTERNS}
+        self.by_word: Dict[str, List[str]] = {}
+        
+        for series in eventbrite_series:
+            series_id = str(series['series_id'])
+            series_name = series.get('series_name', '')
+            self.series_ids.append(series_id)
+            self.names[series_id] = series_name
+            self.words[series_id] = match_words(series_name)
+            for day in _matching_days(series_name):
+                self.by_day[day].append(series_id)
+            for word in self.words[series_id]:
+                self.by_word.setdefault(word, []).append(series_id)
+        
+        # Series order breaks ties between equal scores
+        self._position = {series_id: i for i, series_id in enumerate(self.series_ids)}
+
+    def score(self, product_words: set, series_id: str) -> float:
+        """Jaccard similarity of a product's key words and a series' key words"""
+        series_words = self.words[series_id]
+        union = len(product_words | series_words)
+        return round(len(product_words & series_words) / union, 3) if union else 0.0
+
+    def match_days(self, product_name: str) -> List[str]:
+        """Series sharing a day-of-week with the product name, in series order"""
+        matched: Dict[str, None] = {}
+        for day in _matching_days(product_name):
+            for series_id in self.by_day[day]:
+                matched[series_id] = None
+        return list(matched)
+
+    def rank(self, product_words: set, min_overlap: int = 1, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Series sharing at least min_overlap key words with the product, best score first"""
+        overlap: Counter = Counter()
+        for word in product_words:
+            overlap.update(self.by_word.get(word, ()))
+        ranked = [
+            (series_id, round(count / (len(product_words) + len(self.words[series_id]) - count), 3))
+            for series_id, count in overlap.items() if count >= min_overlap
+        ]
+        ranked.sort(key=lambda item: (-item[1], self._position[item[0]]))
+        return ranked[:limit] if limit is not None else ranked
+
+    def match_key_words(self, product_words: set, min_overlap: int = MIN_KEY_WORD_OVERLAP,
+                        min_score: float = MAPPING_MIN_CONFIDENCE) -> List[Tuple[str, float]]:
+        """Series that pass both match thresholds, best score first"""
+        return [(series_id, score) for series_id, score in self.rank(product_words, min_overlap) if score >= min_score]
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive inter-process lock held on a side file (fcntl on POSIX, msvcrt on Windows)"""
+    with open(path, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class UserMappingStore:
+    """
+    User override mappings persisted to a JSON file.
+
+    The parsed file is kept in memory and shared by every EventMappingManager in the
+    process; reads only stat the file and reload it when its mtime or size changed.
+    Edits take an exclusive lock on '<path>.lock', re-read the file if another process
+    changed it, apply the change and replace the file atomically (write to a temporary
+    file, then rename), so concurrent workers never lose each other's edits or see a
+    half-written file. The version counter changes whenever the in-memory copy does.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock_path = path + '.lock'
+        self._lock = threading.RLock()
+        self._mappings: Dict[str, EventMapping] = {}
+        self._stat: Optional[Tuple[int, int]] = None
+        self.version = 0
+        self.reloads = 0
+        self.writes = 0
+
+    def _file_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self) -> None:
+        """Reload the file if it changed since it was last read or written"""
+        stat = self._file_stat()
+        if stat == self._stat and self.version:
+            return
+        mappings: Dict[str, EventMapping] = {}
+        if stat is not None:
+            try:
+                with open(self.path, 'r') as f:
+                    mappings = {mapping['id']: EventMapping(**mapping) for mapping in json.load(f)}
+            except Exception as e:
+                # Keep the last good copy; a later successful read replaces it
+                print(f"Error loading user overrides: {e}")
+                return
+        self._mappings = mappings
+        self._stat = stat
+        self.version += 1
+        self.reloads += 1
+
+    def _write(self, mappings: Dict[str, EventMapping]) -> None:
+        """Atomically replace the file with the given mappings (caller holds the file lock)"""
+        data = [
+            {
+                'id': mapping.id,
+                'name': mapping.name,
+                'woocommerce_product_id': mapping.woocommerce_product_id,
+                'eventbrite_series_ids': mapping.eventbrite_series_ids,
+                'mapping_source': mapping.mapping_source,
+                'is_active': mapping.is_active,
+                'last_updated': mapping.last_updated
+            }
+            for mapping in mappings.values()
+        ]
+        fd, tmp_path = tempfile.mkstemp(prefix='.user_mappings.', suffix='.tmp', dir=os.path.dirname(self.path))
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._mappings = mappings
+        self._stat = self._file_stat()
+        self.version += 1
+        self.writes += 1
+
+    @contextmanager
+    def _editing(self):
+        """Lock the file, yield a fresh copy of the mappings to change, then persist it"""
+        with self._lock, _file_lock(self.lock_path):
+            self._refresh()
+            mappings = dict(self._mappings)
+            yield mappings
+            if mappings != self._mappings:
+                self._write(mappings)
+
+    def get_all(self) -> Dict[str, EventMapping]:
+        """All user override mappings by ID (shared copy; don't modify it)"""
+        with self._lock:
+            self._refresh()
+            return self._mappings
+
+    def get_version(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self.version
+
+    def put(self, mapping: EventMapping) -> None:
+        """Add or replace a mapping"""
+        with self._editing() as mappings:
+            mappings[mapping.id] = mapping
+
+    def update(self, mapping_id: str, **kwargs) -> Optional[EventMapping]:
+        """Update fields of an existing mapping; None if it doesn't exist"""
+        with self._editing() as mappings:
+            mapping = mappings.get(mapping_id)
+            if mapping is None:
+                return None
+            changes = {key: value for key, value in kwargs.items() if key in _MAPPING_FIELDS and key != 'last_updated'}
+            mapping = replace(mapping, **changes, last_updated=datetime.now().isoformat())
+            mappings[mapping_id] = mapping
+            return mapping
+
+    def delete(self, mapping_id: str) -> bool:
+        """Delete a mapping; False if it doesn't exist"""
+        with self._editing() as mappings:
+            return mappings.pop(mapping_id, None) is not None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'path': self.path, 'mappings': len(self._mappings), 'version': self.version,
+                    'reloads': self.reloads, 'writes': self.writes}
+
+
+_user_mapping_store: Optional[UserMappingStore] = None
+_user_mapping_store_lock = threading.Lock()
+
+
+def get_user_mapping_store() -> UserMappingStore:
+    """Get the process-wide user mapping store, creating it if necessary"""
+    global _user_mapping_store
+    with _user_mapping_store_lock:
+        if _user_mapping_store is None:
+            _user_mapping_store = UserMappingStore(USER_MAPPINGS_PATH)
+        return _user_mapping_store
+
+
+class _VersionedMemo:
+    """Keeps the most recent values computed for a data version; thread-safe"""
+
+    def __init__(self, size: int = 4):
+        self.size = size
+        self._lock = threading.Lock()
+        self._values: Dict[Any, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any, compute) -> Any:
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                return self._values[key]
+        value = compute()
+        with self._lock:
+            self.misses += 1
+            self._values[key] = value
+            while len(self._values) > self.size:
+                del self._values[next(iter(self._values))]
+        return value
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'entries': len(self._values), 'hits': self.hits, 'misses': self.misses}
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _series_digest(eventbrite_series: List[Dict]) -> str:
+    """Data version of a series snapshot (only the fields matching uses)"""
+    return _digest([(str(s['series_id']), s.get('series_name', '')) for s in eventbrite_series or []])
+
+
+def _products_digest(woocommerce_products: List[Dict]) -> str:
+    """Data version of a product snapshot (only the fields matching uses)"""
+    return _digest([(str(p['product_id']), p.get('product_name', '')) for p in woocommerce_products or []])
+
+
+_series_indexes = _VersionedMemo(size=2)
+_mapping_results = _VersionedMemo(size=4)
+
+
+def get_series_index(eventbrite_series: List[Dict]) -> SeriesIndex:
+    """Get the SeriesIndex for a series snapshot, building it once per snapshot"""
+    return _series_indexes.get(_series_digest(eventbrite_series), lambda: SeriesIndex(eventbrite_series))
+
+
+def get_mapping_cache_stats() -> Dict[str, Any]:
+    """Series index and mapping result memo statistics"""
+    return {
+        'series_index': _series_indexes.get_stats(),
+        'mapping_results': _mapping_results.get_stats(),
+        'user_overrides': get_user_mapping_store().get_stats()
+    }
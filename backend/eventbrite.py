@@ -4,11 +4,16 @@ Adapted from decrement_eventbrite_inventory.js
 """
 
 import os
-import requests
+import asyncio
+import httpx
 import json
-from typing import Dict, Any, Optional
+import sqlite3
+from typing import Dict, Any, Optional, List, AsyncIterator
 from dotenv import load_dotenv
 from datetime import datetime, timezone
+from http_pool import get_http_pool
+from async_utils import run_blocking
+from cache_store import get_cache_store, SERIES_DOCUMENT
 
 # Load environment variables from the project root
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
@@ -29,8 +34,16 @@ class EventbriteClient:
             'Content-Type': 'application/json'
         }
         
-        # Cache file path
-        self.cache_file = os.path.join(os.path.dirname(__file__), 'series_cache.json')
+        # Shared keep-alive connection pool for all Eventbrite API calls
+        self.http = get_http_pool('eventbrite')
+        
+        # Indexed local cache (series, occurrences and sync state tables)
+        self.cache_store = get_cache_store()
+        
+        # Incremental series refresh: how often a full re-download is forced, and how many
+        # changed events are fetched at once
+        self.full_sync_interval_hours = float(os.getenv('EVENTBRITE_FULL_SYNC_HOURS', '24'))
+        self.max_concurrency = max(1, int(os.getenv('EVENTBRITE_MAX_CONCURRENCY', '8')))
 
     async def get_ticket_class_details(self, event_id: str, ticket_class_id: str) -> Dict[str, Any]:
         """
@@ -50,7 +63,7 @@ class EventbriteClient:
             url = f"{self.base_url}/events/{event_id}/ticket_classes/"
             print(f"Fetching ticket classes for Event ID: {event_id}...")
             
-            response = requests.get(url, headers=self.headers)
+            response = await self.http.get(url, headers=self.headers)
             response.raise_for_status()
             
             data = response.json()
@@ -67,7 +80,7 @@ class EventbriteClient:
             print(f"Found Ticket Class: {target_ticket_class['name']} (ID: {target_ticket_class['id']})")
             return target_ticket_class
             
-        except requests.RequestException as e:
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
             raise EventbriteAPIError(f"Failed to get ticket class details: {str(e)}")
 
     async def update_ticket_class_capacity(self, event_id: str, ticket_class_id: str, new_capacity: int) -> Dict[str, Any]:
@@ -96,7 +109,7 @@ class EventbriteClient:
             
             print(f"Attempting to update capacity for Ticket Class ID {ticket_class_id} to {new_capacity}...")
             
-            response = requests.post(url, json=payload, headers=self.headers)
+            response = await self.http.post(url, json=payload, headers=self.headers)
             response.raise_for_status()
             
             data = response.json()
@@ -106,7 +119,7 @@ class EventbriteClient:
             
             return data
             
-        except requests.RequestException as e:
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
             raise EventbriteAPIError(f"Failed to update ticket class capacity: {str(e)}")
 
     async def increment_capacity(self, event_id: str, ticket_class_id: str) -> Dict[str, Any]:
@@ -249,7 +262,7 @@ class EventbriteClient:
             
             print(f"Attempting to update overall event capacity for Event ID {event_id} to {new_capacity}...")
             
-            response = requests.post(url, json=payload, headers=self.headers) # POST to update
+            response = await self.http.post(url, json=payload, headers=self.headers) # POST to update
             response.raise_for_status()
             
             data = response.json()
@@ -259,7 +272,7 @@ class EventbriteClient:
             
             return data
             
-        except requests.RequestException as e:
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
             raise EventbriteAPIError(f"Failed to update overall event capacity: {str(e)}")
 
     async def get_all_ticket_classes(self, event_id: str) -> Dict[str, Any]:
@@ -279,7 +292,7 @@ class EventbriteClient:
             url = f"{self.base_url}/events/{event_id}/ticket_classes/"
             print(f"Fetching all ticket classes for Event ID: {event_id}...")
             
-            response = requests.get(url, headers=self.headers)
+            response = await self.http.get(url, headers=self.headers)
             response.raise_for_status()
             
             data = response.json()
@@ -308,7 +321,7 @@ class EventbriteClient:
                 'total_count': len(formatted_classes)
             }
             
-        except requests.RequestException as e:
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
             raise EventbriteAPIError(f"Failed to get ticket classes: {str(e)}")
 
     async def get_organization_series(self, organization_id: str = '698566935713', use_cache: bool = True) -> Dict[str, Any]:
@@ -327,7 +340,7 @@ class EventbriteClient:
         """
         # Try to load from cache first if use_cache is True
         if use_cache:
-            cached_data = self._load_cached_series()
+            cached_data = await run_blocking(self._load_cached_series)
             if cached_data:
                 print(f"Loaded {cached_data['total_series_count']} series from cache (last updated: {cached_data.get('last_updated', 'unknown')})")
                 return cached_data
@@ -335,86 +348,123 @@ class EventbriteClient:
         print(f"Fetching fresh data from Eventbrite API for Organization ID: {organization_id}...")
         
         try:
-            url = f"{self.base_url}/organizations/{organization_id}/events/"
-            params = {
-                'status': 'live',
-                'expand': 'category,subcategory,event_sales_status,ticket_availability,series_parent'
+            print(f"Fetching organization events for Organization ID: {organization_id}...")
+            
+            # Each page is filtered and grouped as it arrives, so only one page of events is held at a time
+            series_map = {}
+            tracked_events = {}
+            total_events = 0
+            total_on_sale = 0
+            async for page_events, on_sale_events in self.iter_on_sale_event_pages(organization_id):
+                total_events += len(page_events)
+                total_on_sale += len(on_sale_events)
+                for event in page_events:
+                    tracked_events[event.get('id')] = self._compact_event(event)
+                for event in on_sale_events:
+                    self._add_event_to_series_map(series_map, event)
+                print(f"  Processed {total_events} events ({total_on_sale} on sale, {len(series_map)} series so far)...")
+            
+            print(f"Fetched {total_events} total events")
+            print(f"Found {total_on_sale} events currently on sale")
+            
+            # Convert to list and apply custom sorting (weekly shows first, then by earliest date)
+            series_list = list(series_map.values())
+            series_list.sort(key=self._get_series_sort_key)
+            
+            result = {
+                'organization_id': organization_id,
+                'series': series_list,
+                'total_series_count': len(series_list),
+                'total_events_on_sale': total_on_sale,
+                'last_updated': datetime.now(timezone.utc).isoformat(),
+                'cache_source': 'api',
+                'sync_mode': 'full'
             }
             
-            print(f"Fetching organization events for Organization ID: {organization_id}...")
+            # Save to cache, with the state needed for later incremental refreshes
+            now = datetime.now(timezone.utc).isoformat()
+            sync_state = {
+                'organization_id': organization_id,
+                'watermark': self._events_watermark(tracked_events),
+                'last_full_sync': now,
+                'last_sync': now,
+                'events': tracked_events
+            }
+            await run_blocking(self._save_cached_series, {**result, 'sync_state': sync_state})
             
-            all_events = []
-            continuation = None
+            print(f"Found {len(series_list)} unique series")
+            return result
             
-            # Handle pagination
-            while True:
-                if continuation:
-                    params['continuation'] = continuation
-                
-                response = requests.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                if 'error' in data:
-                    raise EventbriteAPIError(f"Eventbrite API error while fetching organization events: {data['error'].get('error_description', 'Unknown error')}")
-                
-                events = data.get('events', [])
-                all_events.extend(events)
-                
-                # Check for more pages
-                pagination = data.get('pagination', {})
-                if not pagination.get('has_more_items', False):
-                    break
-                continuation = pagination.get('continuation')
-            
-            print(f"Fetched {len(all_events)} total events")
-            
-            # Filter for events that are currently on sale
-            print("Checking which events are currently on sale...")
-            on_sale_events = []
-            for i, event in enumerate(all_events):
-                if (i + 1) % 100 == 0:  # Progress update every 100 events
-                    print(f"  Processed {i + 1}/{len(all_events)} events...")
-                
-                if self._is_event_on_sale(event):
-                    on_sale_events.append(event)
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
+            raise EventbriteAPIError(f"Failed to get organization series: {str(e)}")
+
+    async def refresh_organization_series(self, organization_id: str = '698566935713', full: bool = False) -> Dict[str, Any]:
+        """
+        Refreshes the series cache, incrementally when possible.
+        
+        The organization events endpoint has no server-side "changed since" filter, so an
+        incremental refresh lists live events without expansions (a small fraction of the
+        full payload), then fetches full details only for events whose 'changed' timestamp
+        is newer than the watermark stored in the cache store. Events that are no longer
+        live are dropped, and on-sale status is re-evaluated for every tracked event.
+        A full sync runs instead when forced, when there is no sync state yet, or every
+        EVENTBRITE_FULL_SYNC_HOURS (sold-out changes don't always bump 'changed').
+        
+        Args:
+            organization_id: The ID of the organization (defaults to BRCC)
+            full: Force a full re-download
             
-            print(f"Found {len(on_sale_events)} events currently on sale")
+        Returns:
+            Dictionary with unique series list (same shape as get_organization_series)
             
-            # Group by series and extract unique series
-            print("Grouping events by series...")
+        Raises:
+            EventbriteAPIError: If the API request fails
+        """
+        cached_data = None if full else await run_blocking(self._load_cached_series, True)
+        sync_state = (cached_data or {}).get('sync_state')
+        
+        if not sync_state or sync_state.get('organization_id') != organization_id or self._is_full_sync_due(sync_state):
+            return await self.get_organization_series(organization_id, use_cache=False)
+        
+        print(f"Incremental refresh of Eventbrite series since {sync_state.get('watermark')}...")
+        
+        try:
+            tracked_events = sync_state.get('events', {})
+            watermark = sync_state.get('watermark') or ''
+            live_ids = set()
+            changed_ids = []
+            
+            async for page_events in self.iter_organization_event_pages(organization_id, expand=None):
+                for event in page_events:
+                    event_id = event.get('id')
+                    live_ids.add(event_id)
+                    if event_id not in tracked_events or (event.get('changed') or '') > watermark:
+                        changed_ids.append(event_id)
+            
+            removed_ids = [event_id for event_id in tracked_events if event_id not in live_ids]
+            for event_id in removed_ids:
+                del tracked_events[event_id]
+            
+            # Fetch full details (ticket availability, series parent) only for changed events
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            changed_events = await asyncio.gather(*[
+                self._fetch_event_details(event_id, semaphore) for event_id in changed_ids
+            ])
+            for event in changed_events:
+                tracked_events[event.get('id')] = self._compact_event(event)
+            
+            print(f"  {len(changed_ids)} changed, {len(removed_ids)} removed, {len(tracked_events)} live events tracked")
+            
+            # Rebuild the series map from the merged event state
             series_map = {}
-            for event in on_sale_events:
-                event_name = event.get('name', {}).get('text', 'Unnamed Event')
-                event_id = event.get('id', 'Unknown ID')
-                
-                # Extract series ID using same logic as reference script
-                series_id = (
-                    event.get('series_id') or 
-                    (event.get('series_parent', {}).get('id') if event.get('series_parent') else None) or
-                    event.get('id')  # Fallback to first occurrence ID
-                )
-                
-                if event_name not in series_map:
-                    print(f"  New series found: '{event_name}' (Series ID: {series_id})")
-                    series_map[event_name] = {
-                        'series_id': str(series_id),
-                        'series_name': event_name,
-                        'event_count': 0,
-                        'events': []
-                    }
-                
-                series_map[event_name]['event_count'] += 1
-                series_map[event_name]['events'].append({
-                    'occurrence_id': event.get('id'),
-                    'start_date': event.get('start', {}).get('local'),
-                    'url': event.get('url')
-                })
-                
-                print(f"  Added occurrence {event_id} to series '{event_name}'")
+            total_on_sale = 0
+            ordered_events = sorted(tracked_events.items(), key=lambda item: item[1].get('start_date') or '')
+            for event_id, record in ordered_events:
+                event = self._expand_compact_event(event_id, record)
+                if self._is_event_on_sale(event):
+                    total_on_sale += 1
+                    self._add_event_to_series_map(series_map, event)
             
-            # Convert to list and apply custom sorting (weekly shows first, then by earliest date)
             series_list = list(series_map.values())
             series_list.sort(key=self._get_series_sort_key)
             
@@ -422,27 +472,184 @@ class EventbriteClient:
                 'organization_id': organization_id,
                 'series': series_list,
                 'total_series_count': len(series_list),
-                'total_events_on_sale': len(on_sale_events),
+                'total_events_on_sale': total_on_sale,
                 'last_updated': datetime.now(timezone.utc).isoformat(),
-                'cache_source': 'api'
+                'cache_source': 'api',
+                'sync_mode': 'incremental',
+                'changed_events': len(changed_ids),
+                'removed_events': len(removed_ids)
             }
             
-            # Save to cache
-            self._save_cached_series(result)
+            sync_state.update({
+                'watermark': max(watermark, self._events_watermark(tracked_events)),
+                'last_sync': result['last_updated'],
+                'events': tracked_events
+            })
+            await run_blocking(self._save_cached_series, {**result, 'sync_state': sync_state})
             
             print(f"Found {len(series_list)} unique series")
             return result
             
-        except requests.RequestException as e:
-            raise EventbriteAPIError(f"Failed to get organization series: {str(e)}")
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
+            raise EventbriteAPIError(f"Failed to refresh organization series: {str(e)}")
 
-    def _load_cached_series(self) -> Optional[Dict[str, Any]]:
-        """Load series data from cache file if it exists"""
+    async def _fetch_event_details(self, event_id: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Fetch one event with the expansions needed for on-sale checks and series grouping"""
+        url = f"{self.base_url}/events/{event_id}/"
+        params = {'expand': 'event_sales_status,ticket_availability,series_parent'}
+        async with semaphore:
+            response = await self.http.get(url, headers=self.headers, params=params)
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        if 'error' in data:
+            raise EventbriteAPIError(f"Eventbrite API error while fetching event {event_id}: {data['error'].get('error_description', 'Unknown error')}")
+        
+        return data
+
+    def _is_full_sync_due(self, sync_state: Dict[str, Any]) -> bool:
+        """Check whether the scheduled full series sync is due"""
+        last_full_sync = sync_state.get('last_full_sync')
+        if not last_full_sync:
+            return True
         try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
+            age_hours = (datetime.now(timezone.utc) - datetime.fromisoformat(last_full_sync)).total_seconds() / 3600
+        except ValueError:
+            return True
+        return age_hours >= self.full_sync_interval_hours
+
+    @staticmethod
+    def _events_watermark(tracked_events: Dict[str, Dict[str, Any]]) -> str:
+        """Latest 'changed' timestamp across tracked events (ISO-8601 UTC strings sort chronologically)"""
+        return max((record.get('changed') or '' for record in tracked_events.values()), default='')
+
+    def _compact_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce an expanded event to the fields needed to re-check its sale status and series"""
+        ticket_availability = event.get('ticket_availability')
+        return {
+            'name': event.get('name', {}).get('text', 'Unnamed Event'),
+            'series_id': (
+                event.get('series_id') or
+                (event.get('series_parent', {}).get('id') if event.get('series_parent') else None) or
+                event.get('id')
+            ),
+            'start_date': event.get('start', {}).get('local'),
+            'url': event.get('url'),
+            'changed': event.get('changed'),
+            'ticket_availability': {
+                'is_sold_out': ticket_availability.get('is_sold_out'),
+                'start_sales_date': ticket_availability.get('start_sales_date'),
+                'end_sales_date': ticket_availability.get('end_sales_date')
+            } if ticket_availability else None
+        }
+
+    @staticmethod
+    def _expand_compact_event(event_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild the event fields used by _is_event_on_sale and _add_event_to_series_map"""
+        return {
+            'id': event_id,
+            'name': {'text': record.get('name')},
+            'series_id': record.get('series_id'),
+            'start': {'local': record.get('start_date')},
+            'url': record.get('url'),
+            'ticket_availability': record.get('ticket_availability')
+        }
+
+    async def _fetch_events_page(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch one page of organization events"""
+        response = await self.http.get(url, headers=self.headers, params=params)
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        if 'error' in data:
+            raise EventbriteAPIError(f"Eventbrite API error while fetching organization events: {data['error'].get('error_description', 'Unknown error')}")
+        
+        return data
+
+    async def iter_organization_event_pages(self, organization_id: str = '698566935713', expand: Optional[str] = 'category,subcategory,event_sales_status,ticket_availability,series_parent') -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yields an organization's live events one page at a time.
+        
+        Pages are chained by continuation tokens, so they can't be requested in
+        parallel; instead the next page is requested as soon as its token is known
+        and downloads while the caller processes the current page.
+        
+        Args:
+            organization_id: The ID of the organization (defaults to BRCC)
+            expand: Eventbrite expansions to include, or None for the bare event objects
+            
+        Raises:
+            EventbriteAPIError: If an API request fails
+        """
+        url = f"{self.base_url}/organizations/{organization_id}/events/"
+        params = {'status': 'live'}
+        if expand:
+            params['expand'] = expand
+        
+        next_page = asyncio.ensure_future(self._fetch_events_page(url, params))
+        try:
+            while next_page is not None:
+                data = await next_page
+                next_page = None
+                
+                # Start the next page download before handing this one to the caller
+                pagination = data.get('pagination', {})
+                if pagination.get('has_more_items', False) and pagination.get('continuation'):
+                    next_page = asyncio.ensure_future(self._fetch_events_page(url, {**params, 'continuation': pagination['continuation']}))
                 
+                yield data.get('events', [])
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+
+    async def iter_on_sale_event_pages(self, organization_id: str = '698566935713') -> AsyncIterator[tuple]:
+        """
+        Yields (page_events, on_sale_events) for each page of an organization's live events,
+        so callers can surface results before the last page has been fetched.
+        
+        Args:
+            organization_id: The ID of the organization (defaults to BRCC)
+        """
+        async for page_events in self.iter_organization_event_pages(organization_id):
+            yield page_events, [event for event in page_events if self._is_event_on_sale(event)]
+
+    def _add_event_to_series_map(self, series_map: Dict[str, Dict[str, Any]], event: Dict[str, Any]) -> None:
+        """Add one on-sale event occurrence to its series entry (series are keyed by event name)"""
+        event_name = event.get('name', {}).get('text', 'Unnamed Event')
+        event_id = event.get('id', 'Unknown ID')
+        
+        # Extract series ID using same logic as reference script
+        series_id = (
+            event.get('series_id') or 
+            (event.get('series_parent', {}).get('id') if event.get('series_parent') else None) or
+            event.get('id')  # Fallback to first occurrence ID
+        )
+        
+        if event_name not in series_map:
+            print(f"  New series found: '{event_name}' (Series ID: {series_id})")
+            series_map[event_name] = {
+                'series_id': str(series_id),
+                'series_name': event_name,
+                'event_count': 0,
+                'events': []
+            }
+        
+        series_map[event_name]['event_count'] += 1
+        series_map[event_name]['events'].append({
+            'occurrence_id': event.get('id'),
+            'start_date': event.get('start', {}).get('local'),
+            'url': event.get('url')
+        })
+        
+        print(f"  Added occurrence {event_id} to series '{event_name}'")
+
+    def _load_cached_series(self, include_sync_state: bool = False) -> Optional[Dict[str, Any]]:
+        """Load series data from the cache store if it exists (the incremental sync state is internal and left out by default)"""
+        try:
+            cached_data = self.cache_store.load_series_document(include_sync_state=include_sync_state)
+            if cached_data:
                 # Calculate cache age for display purposes
                 last_updated = cached_data.get('last_updated')
                 if last_updated:
@@ -456,45 +663,58 @@ class EventbriteClient:
                     print(f"Loaded Eventbrite cache ({cache_age_minutes} minutes old)")
                     return cached_data
                 
-        except (json.JSONDecodeError, ValueError, KeyError) as e:
+        except (sqlite3.Error, json.JSONDecodeError, ValueError, KeyError) as e:
             print(f"Error loading Eventbrite cache: {e}")
         
         return None
 
     def _save_cached_series(self, data: Dict[str, Any]) -> None:
-        """Save series data to cache file"""
+        """Save series data to the cache store"""
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print(f"Cached series data to {self.cache_file}")
+            self.cache_store.save_series_document(data)
+            print(f"Cached series data to {self.cache_store.path}")
         except Exception as e:
             print(f"Error saving cache: {e}")
 
+    def get_cache_etag(self) -> Optional[str]:
+        """ETag of the cached series document, or None if nothing is cached"""
+        return self.cache_store.get_etag(SERIES_DOCUMENT)
+
+    def get_cached_series(self, series_id: str) -> Optional[Dict[str, Any]]:
+        """Get one series (with its occurrences) from the cache store without loading the others"""
+        try:
+            return self.cache_store.get_series(series_id)
+        except sqlite3.Error as e:
+            print(f"Error loading cached series {series_id}: {e}")
+            return None
+
     def get_cache_info(self) -> Dict[str, Any]:
         """Get information about the current cache"""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
-                
-                last_updated = cached_data.get('last_updated')
+        try:
+            cached_meta = self.cache_store.get_series_meta()
+            if cached_meta:
+                last_updated = cached_meta.get('last_updated')
                 if last_updated:
                     cache_time = datetime.fromisoformat(last_updated)
                     now = datetime.now(timezone.utc)
                     age_minutes = int((now - cache_time).total_seconds() / 60)
                     
+                    sync_state = cached_meta.get('sync_state') or {}
                     return {
                         'has_cache': True,
                         'last_updated': last_updated,
                         'age_minutes': age_minutes,
-                        'series_count': cached_data.get('total_series_count', 0),
-                        'events_count': cached_data.get('total_events_on_sale', 0)
+                        'series_count': cached_meta.get('total_series_count', 0),
+                        'events_count': cached_meta.get('total_events_on_sale', 0),
+                        'sync_mode': cached_meta.get('sync_mode'),
+                        'sync_watermark': sync_state.get('watermark'),
+                        'last_full_sync': sync_state.get('last_full_sync')
                     }
-            except Exception as e:
-                return {
-                    'has_cache': False,
-                    'error': str(e)
-                }
+        except Exception as e:
+            return {
+                'has_cache': False,
+                'error': str(e)
+            }
         
         return {
             'has_cache': False
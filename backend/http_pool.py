@@ -0,0 +1,174 @@
+"""
+Shared HTTP connection pools for the Eventbrite and WooCommerce API clients.
+Each API gets one long-lived httpx.AsyncClient so requests reuse keep-alive
+connections instead of doing a new TCP+TLS handshake per call.
+"""
+
+import os
+import asyncio
+import logging
+from typing import Dict, Any, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+# Load environment variables from the project root
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
+
+
+class SharedHTTPPool:
+    """
+    A named, process-wide async HTTP client with connection pool statistics.
+
+    The underlying httpx.AsyncClient is created lazily and recreated if it is used
+    from a different event loop (e.g., a CLI sync run before uvicorn starts), since
+    pooled connections can't be shared across loops.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.max_connections = int(os.getenv('HTTP_POOL_MAX_CONNECTIONS', '20'))
+        self.max_keepalive_connections = int(os.getenv('HTTP_POOL_MAX_KEEPALIVE', '10'))
+        self.keepalive_expiry = float(os.getenv('HTTP_POOL_KEEPALIVE_EXPIRY', '60'))
+        self.timeout = float(os.getenv('HTTP_TIMEOUT', '30'))
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Pool statistics
+        self.requests_sent = 0
+        self.connections_opened = 0
+        self.request_errors = 0
+        self.in_flight = 0
+        self.clients_created = 0
+        self.clients_closed = 0
+        self.clients_abandoned = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the pooled client for the running event loop, creating it if necessary"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            if self._client is not None and not self._client.is_closed:
+                self._close_stale_client(self._client, self._loop)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                # requests followed redirects by default; keep that behaviour
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry
+                ),
+                # httpx decodes gzip/deflate transparently; ask for it explicitly
+                headers={'Accept-Encoding': 'gzip, deflate'}
+            )
+            self._loop = loop
+            self.clients_created += 1
+            logging.info(f"Created shared HTTP pool '{self.name}' (max_connections={self.max_connections}, keepalive={self.max_keepalive_connections})")
+        return self._client
+
+    def _close_stale_client(self, client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Close a client left behind on another event loop, on that loop if it's still running"""
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            self.clients_closed += 1
+        else:
+            # Its loop is gone, so it can't be awaited; the sockets are closed when it's collected
+            self.clients_abandoned += 1
+            logging.warning(f"Replaced HTTP pool '{self.name}' client from a closed event loop without closing it")
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """httpcore trace hook used to count new TCP connections"""
+        if event_name == 'connection.connect_tcp.started':
+            self.connections_opened += 1
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request through the shared pool.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            **kwargs: Passed through to httpx.AsyncClient.request (headers, params, json, timeout, ...)
+
+        Returns:
+            The httpx response (raise_for_status is left to the caller)
+
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        client = self._get_client()
+        extensions = dict(kwargs.pop('extensions', None) or {})
+        extensions['trace'] = self._trace
+
+        self.requests_sent += 1
+        self.in_flight += 1
+        try:
+            return await client.request(method, url, extensions=extensions, **kwargs)
+        except httpx.HTTPError:
+            self.request_errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('PUT', url, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics, including how often connections were reused"""
+        reused = max(self.requests_sent - self.connections_opened, 0)
+        return {
+            'name': self.name,
+            'requests_sent': self.requests_sent,
+            'connections_opened': self.connections_opened,
+            'connections_reused': reused,
+            'reuse_rate': round(reused / self.requests_sent, 3) if self.requests_sent else None,
+            'request_errors': self.request_errors,
+            'in_flight': self.in_flight,
+            'clients_created': self.clients_created,
+            'clients_closed': self.clients_closed,
+            'clients_abandoned': self.clients_abandoned,
+            'max_connections': self.max_connections,
+            'max_keepalive_connections': self.max_keepalive_connections,
+            'keepalive_expiry_seconds': self.keepalive_expiry
+        }
+
+    async def aclose(self) -> None:
+        """Close the pooled client if it belongs to the running event loop"""
+        if self._client is not None and not self._client.is_closed and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+
+_pools: Dict[str, SharedHTTPPool] = {}
+
+
+def get_http_pool(name: str) -> SharedHTTPPool:
+    """Get the process-wide HTTP pool for an API (e.g., 'eventbrite', 'woocommerce')"""
+    if name not in _pools:
+        _pools[name] = SharedHTTPPool(name)
+    return _pools[name]
+
+
+def open_http_pools(*names: str) -> None:
+    """Create the named HTTP pools and their clients up front (called on application startup)"""
+    for name in names:
+        get_http_pool(name)._get_client()
+
+
+def get_http_pool_stats() -> Dict[str, Any]:
+    """Get statistics for every HTTP pool created so far"""
+    return {name: pool.get_stats() for name, pool in _pools.items()}
+
+
+async def close_http_pools() -> None:
+    """Close all HTTP pools (called on application shutdown)"""
+    for pool in _pools.values():
+        await pool.aclose()
@@ -7,35 +7,15 @@ import uvicorn
 import os
 import sys
 import argparse
-import asyncio
+import uuid
 from pathlib import Path
 
-async def sync_on_startup():
-    """Sync both Eventbrite and WooCommerce data on startup"""
-    try:
-        from eventbrite import EventbriteClient
-        from woocommerce import WooCommerceClient
-        
-        print("🔄 Syncing Eventbrite data on startup...")
-        eventbrite_client = EventbriteClient()
-        eventbrite_result = await eventbrite_client.get_organization_series(use_cache=False)
-        print(f"✅ Synced {eventbrite_result['total_series_count']} Eventbrite series")
-        
-        print("🔄 Syncing WooCommerce data on startup...")
-        woocommerce_client = WooCommerceClient()
-        woocommerce_result = await woocommerce_client.get_all_fooevents_products(use_cache=False)
-        print(f"✅ Synced {woocommerce_result['total_products']} WooCommerce products")
-        
-        print("🎉 Startup sync completed successfully!")
-        
-    except Exception as e:
-        print(f"❌ Error during startup sync: {e}")
-        print("⚠️  Server will start but cached data may be stale")
+from background_refresh import release_startup_sync_claim
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Development server for BRCC Event Management System')
     parser.add_argument('--sync', action='store_true', 
-                       help='Sync fresh data from APIs on startup (otherwise uses cache)')
+                       help='Sync fresh data from APIs in the background after startup (otherwise uses cache)')
     
     args = parser.parse_args()
     
@@ -49,19 +29,26 @@ if __name__ == "__main__":
     print("🔄 Auto-reload enabled for development")
     
     if args.sync:
-        print("🔄 Sync mode enabled - will fetch fresh data on startup")
-        # Run sync before starting server
-        asyncio.run(sync_on_startup())
+        print("🔄 Sync mode enabled - fresh data is fetched in the background once the server is up")
+        print("   Cached data is served meanwhile; GET /ready reports warm-up progress")
+        # Picked up by the app's lifespan hook (inherited by uvicorn worker/reload processes)
+        os.environ['SYNC_ON_STARTUP'] = 'true'
+        # Reload workers share this key so only the first one syncs, not every reload
+        os.environ['SYNC_ON_STARTUP_ONCE'] = uuid.uuid4().hex
     else:
         print("📦 Cache mode - will use existing cached data")
     
     print("\n" + "="*50)
     
-    uvicorn.run(
-        "app:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        reload_dirs=[str(backend_dir)],
-        log_level="info"
-    ) 
\ No newline at end of file
+    try:
+        uvicorn.run(
+            "app:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            reload_dirs=[str(backend_dir)],
+            log_level="info"
+        )
+    finally:
+        if os.getenv('SYNC_ON_STARTUP_ONCE'):
+            release_startup_sync_claim(os.environ['SYNC_ON_STARTUP_ONCE'])
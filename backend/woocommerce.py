@@ -4,14 +4,19 @@ Fetches product data and extracts FooEvents booking information.
 """
 
 import os
-import requests
+import asyncio
+import httpx
 import json
-from typing import Dict, Any, Optional, List, Union
+import sqlite3
+from typing import Dict, Any, Optional, List, Tuple, Union
 from dotenv import load_dotenv
 from datetime import datetime, timezone
 import base64
 import logging
 from wordpress_db import WordPressDBClient, WordPressDBError
+from http_pool import get_http_pool
+from async_utils import run_blocking
+from cache_store import get_cache_store, PRODUCTS_DOCUMENT
 
 # Load environment variables from the project root
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
@@ -42,8 +47,15 @@ class WooCommerceClient:
             'Content-Type': 'application/json'
         }
         
-        # Cache file path
-        self.cache_file = os.path.join(os.path.dirname(__file__), 'woocommerce_cache.json')
+        # Shared keep-alive connection pool for all WooCommerce API calls
+        self.http = get_http_pool('woocommerce')
+        
+        # Concurrency limit and timeout for async product fetches during a full refresh
+        self.max_concurrency = max(1, int(os.getenv('WOOCOMMERCE_MAX_CONCURRENCY', '8')))
+        self.http_timeout = float(os.getenv('WOOCOMMERCE_HTTP_TIMEOUT', '30'))
+        
+        # Indexed local cache (products, slots and dates tables)
+        self.cache_store = get_cache_store()
         
         # Product IDs from the reference list (all 18 products)
         self.product_ids = [
@@ -72,6 +84,19 @@ class WooCommerceClient:
             logging.error(f"Unexpected error initializing WordPress database: {e}")
             self.wp_db_available = False
 
+    def keep_wordpress_db_alive(self) -> bool:
+        """
+        Ping the WordPress database so a long-lived client keeps its connection warm,
+        and update wp_db_available so the client recovers after a DB outage.
+        
+        Returns:
+            True if the database is reachable
+        """
+        if not self.wp_db:
+            return False
+        self.wp_db_available = self.wp_db.keep_alive()
+        return self.wp_db_available
+
     async def get_product_data(self, product_id: int) -> Dict[str, Any]:
         """
         Fetches product data for a specific product ID.
@@ -88,7 +113,7 @@ class WooCommerceClient:
         try:
             url = f"{self.base_url}/products/{product_id}"
             
-            response = requests.get(url, headers=self.headers)
+            response = await self.http.get(url, headers=self.headers, timeout=self.http_timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -98,7 +123,7 @@ class WooCommerceClient:
             
             return data
             
-        except requests.RequestException as e:
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
             raise WooCommerceAPIError(f"Failed to get product data for ID {product_id}: {str(e)}")
 
     def extract_fooevents_data(self, product: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -255,13 +280,16 @@ class WooCommerceClient:
         logging.warning(f"[PID:{product_id}] ({product_name}): Path 5 - No definitive FooEvents data found after all checks. Cannot determine event structure. Returning None.")
         return None
 
-    def format_booking_slots(self, product: Dict[str, Any], booking_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def format_booking_slots(self, product: Dict[str, Any], booking_data: Dict[str, Any], tickets_sold: Optional[Dict[Tuple[str, str], int]] = None) -> List[Dict[str, Any]]:
         """
         Formats FooEvents booking data into a structured format.
         
         Args:
             product: The product data
             booking_data: The parsed FooEvents booking data
+            tickets_sold: Optional {(slot key, date key): sold} counts for this product, as returned by
+                          WordPressDBClient.get_tickets_sold_for_product. Loaded with a single
+                          query when not provided.
             
         Returns:
             List of formatted booking slots with dates and inventory
@@ -270,6 +298,9 @@ class WooCommerceClient:
         product_id = product.get('id')
         product_name = product.get('name', 'Unknown Product')
         
+        if tickets_sold is None and product_id is not None:
+            tickets_sold = self._get_tickets_sold_counts([product_id]).get(product_id)
+        
         for slot_id, slot_data in booking_data.items():
             slot_label = slot_data.get('label', 'Unnamed Slot')
             
@@ -346,7 +377,7 @@ class WooCommerceClient:
                         
                         # Call refactored _get_accurate_capacity_data
                         returned_stock_from_booking, db_tickets_sold = self._get_accurate_capacity_data(
-                            product_id, slot_label, date_str, stock_from_booking_options
+                            product_id, slot_label, date_str, stock_from_booking_options, tickets_sold
                         )
 
                         actual_tickets_sold = db_tickets_sold
@@ -396,7 +427,7 @@ class WooCommerceClient:
                             stock_from_booking_options = 0
                         
                         returned_stock_from_booking, db_tickets_sold = self._get_accurate_capacity_data(
-                            product_id, slot_label, date_str, stock_from_booking_options
+                            product_id, slot_label, date_str, stock_from_booking_options, tickets_sold
                         )
 
                         actual_tickets_sold = db_tickets_sold
@@ -432,7 +463,22 @@ class WooCommerceClient:
         
         return formatted_slots
 
-    def _get_accurate_capacity_data(self, product_id: int, slot_label: str, date_str: str, stock_from_booking_options: int) -> tuple[Union[int, str], Union[int, str]]:
+    def _get_tickets_sold_counts(self, product_ids: List[int]) -> Dict[int, Dict[Tuple[str, str], int]]:
+        """
+        Loads tickets sold for every slot/date of the given products with one grouped DB query.
+        
+        Args:
+            product_ids: WooCommerce product IDs
+            
+        Returns:
+            Dictionary mapping product ID to {(slot key, date key): sold}. Empty if the DB is not available,
+            in which case _get_accurate_capacity_data reports "DB Error" for each date.
+        """
+        if not self.wp_db_available or not product_ids:
+            return {}
+        return self.wp_db.get_tickets_sold_for_products(product_ids)
+
+    def _get_accurate_capacity_data(self, product_id: int, slot_label: str, date_str: str, stock_from_booking_options: int, tickets_sold: Optional[Dict[Tuple[str, str], int]] = None) -> tuple[Union[int, str], Union[int, str]]:
         """
         Gets tickets_sold from DB. The 'stock_from_booking_options' is what FooEvents considers available.
         
@@ -442,6 +488,8 @@ class WooCommerceClient:
             date_str: Date string (e.g., "January 15, 2024")
             stock_from_booking_options: Stock value directly from fooevents_bookings_options_serialized for the slot/date.
                                          This is the value FooEvents considers "available".
+            tickets_sold: Optional preloaded {(slot key, date key): sold} counts for the product. When given,
+                          no query is issued; otherwise the DB is queried for this slot/date alone.
             
         Returns:
             Tuple of (stock_from_booking_options, tickets_sold_from_db).
@@ -453,7 +501,10 @@ class WooCommerceClient:
             # Pass through stock_from_booking_options even if DB is down, as it's still a piece of info.
             return stock_from_booking_options, "DB Error"
         
-        tickets_sold_from_db = self.wp_db.get_tickets_sold_for_date(product_id, slot_label, date_str)
+        if tickets_sold is not None:
+            tickets_sold_from_db = WordPressDBClient.lookup_tickets_sold(tickets_sold, slot_label, date_str)
+        else:
+            tickets_sold_from_db = self.wp_db.get_tickets_sold_for_date(product_id, slot_label, date_str)
         
         if tickets_sold_from_db is None or not isinstance(tickets_sold_from_db, int):
             logging.warning(f"Could not determine tickets sold via DB for product {product_id}, slot '{slot_label}', date '{date_str}'. Received: {tickets_sold_from_db}")
@@ -478,12 +529,14 @@ class WooCommerceClient:
             # Return a very old date if parsing fails
             return datetime(1970, 1, 1)
 
-    async def discover_fooevents_products(self) -> List[int]:
+    async def discover_fooevents_products(self) -> List[Dict[str, Any]]:
         """
         Discover all FooEvents products from WooCommerce that are currently in stock.
+        The product list pages already contain full product documents (including meta_data),
+        so they are returned as-is and don't need to be fetched again one by one.
         
         Returns:
-            List of product IDs that have FooEvents data and are in stock
+            List of full product documents that have FooEvents data and are in stock
         """
         print("🔍 Discovering FooEvents products...")
         discovered_products = []
@@ -501,7 +554,7 @@ class WooCommerceClient:
                     'status': 'publish'
                 }
                 
-                response = requests.get(url, headers=self.headers, params=params)
+                response = await self.http.get(url, headers=self.headers, params=params, timeout=self.http_timeout)
                 response.raise_for_status()
                 products = response.json()
                 
@@ -527,14 +580,14 @@ class WooCommerceClient:
                         # Check WooCommerce stock status (the right way)
                         stock_status = product.get('stock_status', 'outofstock')
                         if stock_status == 'instock':
-                            discovered_products.append(product_id)
+                            discovered_products.append(product)
                             print(f"  ✅ Found in-stock FooEvents product: {product_name} (ID: {product_id})")
                         else:
                             print(f"  ❌ Skipped out-of-stock FooEvents product: {product_name} (ID: {product_id}) - Status: {stock_status}")
                 
                 page += 1
                 
-            except requests.RequestException as e:
+            except (httpx.HTTPError, json.JSONDecodeError) as e:
                 print(f"Error scanning page {page}: {e}")
                 break
         
@@ -553,84 +606,54 @@ class WooCommerceClient:
         """
         # Try to load from cache first if use_cache is True
         if use_cache:
-            cached_data = self._load_cached_products()
+            cached_data = await run_blocking(self._load_cached_products)
             if cached_data:
                 print(f"Loaded {len(cached_data['products'])} products from cache (last updated: {cached_data.get('last_updated', 'unknown')})")
                 return cached_data
         
-        # Determine which products to process
+        # Determine which products to process. Discovery returns full product
+        # documents, so only the hardcoded list needs per-product fetches.
         if use_discovery:
-            product_ids = await self.discover_fooevents_products()
+            discovered_products = await self.discover_fooevents_products()
+            product_ids = [product.get('id') for product in discovered_products]
         else:
+            discovered_products = None
             product_ids = self.product_ids
         
-        print(f"Fetching fresh data from WooCommerce API for {len(product_ids)} products...")
+        # Load tickets sold for every product with one grouped query instead of one query per slot/date
+        try:
+            tickets_sold_by_product = await run_blocking(self._get_tickets_sold_counts, product_ids)
+        except WordPressDBError as e:
+            logging.error(f"Bulk tickets sold query failed, falling back to per-product queries: {e}")
+            tickets_sold_by_product = {}
         
-        all_products = []
-        failed_products = []
-        total_slots = 0
-        total_dates = 0
+        if discovered_products is not None:
+            print(f"Processing {len(discovered_products)} discovered products...")
+            if tickets_sold_by_product:
+                results = [
+                    self._format_product_entry(product_data, tickets_sold_by_product.get(product_data.get('id')))
+                    for product_data in discovered_products
+                ]
+            else:
+                # Without preloaded counts each product queries the database, so format in the thread pool
+                results = await asyncio.gather(*[
+                    run_blocking(self._format_product_entry, product_data)
+                    for product_data in discovered_products
+                ])
+        else:
+            print(f"Fetching fresh data from WooCommerce API for {len(product_ids)} products (up to {self.max_concurrency} at a time)...")
+            
+            # Fetch and format all products concurrently, bounded by max_concurrency
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            results = await asyncio.gather(*[
+                self._fetch_and_format_product(product_id, semaphore, tickets_sold_by_product.get(product_id))
+                for product_id in product_ids
+            ])
         
-        for product_id in product_ids:
-            try:
-                # Fetch product data
-                product_data = await self.get_product_data(product_id)
-                product_name = product_data.get('name', 'Unknown Product')
-                
-                # Extract FooEvents booking data
-                booking_data = self.extract_fooevents_data(product_data)
-                
-                if booking_data:
-                    # Format the booking slots
-                    formatted_slots = self.format_booking_slots(product_data, booking_data)
-                    
-                    if formatted_slots and len(formatted_slots) > 0:
-                        # Calculate totals
-                        for slot in formatted_slots:
-                            total_slots += 1
-                            total_dates += len(slot['dates'])
-                        
-                        all_products.append({
-                            'product_id': product_id,
-                            'product_name': product_name,
-                            'product_price': product_data.get('price', '0'),
-                            'total_sales': product_data.get('total_sales', 0),
-                            'slots': formatted_slots,
-                            'slot_count': len(formatted_slots)
-                        })
-                        
-                        print(f"  ✅ {product_name} ({product_id}): {len(formatted_slots)} slots")
-                    else:
-                        failed_products.append({
-                            'product_id': product_id,
-                            'product_name': product_name,
-                            'error': 'No valid slots after formatting'
-                        })
-                        print(f"  ❌ {product_name} ({product_id}): No valid slots after formatting")
-                else:
-                    failed_products.append({
-                        'product_id': product_id,
-                        'product_name': product_name,
-                        'error': 'No FooEvents data found'
-                    })
-                    print(f"  ❌ {product_name} ({product_id}): No FooEvents data found")
-                    
-            except WooCommerceAPIError as e:
-                failed_products.append({
-                    'product_id': product_id,
-                    'product_name': 'Unknown',
-                    'error': str(e)
-                })
-                print(f"  ❌ Product {product_id}: API Error - {e}")
-                continue
-            except Exception as e:
-                failed_products.append({
-                    'product_id': product_id,
-                    'product_name': 'Unknown',
-                    'error': f"Unexpected error: {str(e)}"
-                })
-                print(f"  ❌ Product {product_id}: Unexpected Error - {e}")
-                continue
+        all_products = [product for product, _ in results if product]
+        failed_products = [failure for _, failure in results if failure]
+        total_slots = sum(product['slot_count'] for product in all_products)
+        total_dates = sum(len(slot['dates']) for product in all_products for slot in product['slots'])
         
         # Sort products using custom logic (weekly shows first, then by earliest date)
         all_products.sort(key=self._get_product_sort_key)
@@ -647,7 +670,7 @@ class WooCommerceClient:
         }
         
         # Save to cache
-        self._save_cached_products(result)
+        await run_blocking(self._save_cached_products, result)
         
         print(f"✅ Successfully processed {len(all_products)} products with {total_slots} slots and {total_dates} dates")
         if failed_products:
@@ -657,13 +680,101 @@ class WooCommerceClient:
         
         return result
 
+    async def _fetch_and_format_product(self, product_id: int, semaphore: asyncio.Semaphore, tickets_sold: Optional[Dict[Tuple[str, str], int]] = None) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Fetches one product and formats its FooEvents booking slots for the products cache.
+        
+        Args:
+            product_id: The WooCommerce product ID
+            semaphore: Limits how many products are fetched at once
+            tickets_sold: Optional preloaded {(slot key, date key): sold} counts for the product
+            
+        Returns:
+            Tuple of (product entry, None) on success or (None, failure entry) on error
+        """
+        try:
+            async with semaphore:
+                product_data = await self.get_product_data(product_id)
+        except WooCommerceAPIError as e:
+            print(f"  ❌ Product {product_id}: API Error - {e}")
+            return None, {
+                'product_id': product_id,
+                'product_name': 'Unknown',
+                'error': str(e)
+            }
+        except Exception as e:
+            print(f"  ❌ Product {product_id}: Unexpected Error - {e}")
+            return None, {
+                'product_id': product_id,
+                'product_name': 'Unknown',
+                'error': f"Unexpected error: {str(e)}"
+            }
+        
+        if tickets_sold is None:
+            # Per-product database fallback; keep it off the event loop
+            return await run_blocking(self._format_product_entry, product_data)
+        return self._format_product_entry(product_data, tickets_sold)
+
+    def _format_product_entry(self, product_data: Dict[str, Any], tickets_sold: Optional[Dict[Tuple[str, str], int]] = None) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Formats a full product document into a products cache entry.
+        
+        Args:
+            product_data: The WooCommerce product data (from discovery or get_product_data)
+            tickets_sold: Optional preloaded {(slot key, date key): sold} counts for the product
+            
+        Returns:
+            Tuple of (product entry, None) on success or (None, failure entry) on error
+        """
+        product_id = product_data.get('id')
+        product_name = product_data.get('name', 'Unknown Product')
+        
+        try:
+            # Extract FooEvents booking data
+            booking_data = self.extract_fooevents_data(product_data)
+            
+            if not booking_data:
+                print(f"  ❌ {product_name} ({product_id}): No FooEvents data found")
+                return None, {
+                    'product_id': product_id,
+                    'product_name': product_name,
+                    'error': 'No FooEvents data found'
+                }
+            
+            # Format the booking slots
+            formatted_slots = self.format_booking_slots(product_data, booking_data, tickets_sold)
+            
+            if not formatted_slots:
+                print(f"  ❌ {product_name} ({product_id}): No valid slots after formatting")
+                return None, {
+                    'product_id': product_id,
+                    'product_name': product_name,
+                    'error': 'No valid slots after formatting'
+                }
+            
+            print(f"  ✅ {product_name} ({product_id}): {len(formatted_slots)} slots")
+            return {
+                'product_id': product_id,
+                'product_name': product_name,
+                'product_price': product_data.get('price', '0'),
+                'total_sales': product_data.get('total_sales', 0),
+                'slots': formatted_slots,
+                'slot_count': len(formatted_slots)
+            }, None
+            
+        except Exception as e:
+            print(f"  ❌ Product {product_id}: Unexpected Error - {e}")
+            return None, {
+                'product_id': product_id,
+                'product_name': product_name,
+                'error': f"Unexpected error: {str(e)}"
+            }
+
     def _load_cached_products(self) -> Optional[Dict[str, Any]]:
-        """Load products data from cache file if it exists and is recent"""
+        """Load products data from the cache store if it exists and is recent"""
         try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
-                
+            cached_data = self.cache_store.load_products_document()
+            if cached_data:
                 # Check if cache is less than 999 hours old
                 last_updated = cached_data.get('last_updated')
                 if last_updated:
@@ -678,28 +789,66 @@ class WooCommerceClient:
                     else:
                         print(f"WooCommerce cache is {age_hours:.1f} hours old, fetching fresh data...")
                 
-        except (json.JSONDecodeError, ValueError, KeyError) as e:
+        except (sqlite3.Error, json.JSONDecodeError, ValueError, KeyError) as e:
             print(f"Error loading WooCommerce cache: {e}")
         
         return None
 
     def _save_cached_products(self, data: Dict[str, Any]) -> None:
-        """Save products data to cache file"""
+        """Save products data to the cache store"""
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print(f"Cached WooCommerce products data to {self.cache_file}")
+            self.cache_store.save_products_document(data)
+            print(f"Cached WooCommerce products data to {self.cache_store.path}")
         except Exception as e:
             print(f"Error saving WooCommerce cache: {e}")
 
+    def get_cache_etag(self) -> Optional[str]:
+        """ETag of the cached products document, or None if there's no usable cache"""
+        cached_meta = self.cache_store.get_products_meta()
+        if not cached_meta or not cached_meta.get('last_updated'):
+            return None
+        # Same freshness rule as _load_cached_products: a stale cache is refetched, so it has no ETag
+        cache_time = datetime.fromisoformat(cached_meta['last_updated'])
+        if (datetime.now(timezone.utc) - cache_time).total_seconds() / 3600 >= 999:
+            return None
+        return self.cache_store.get_etag(PRODUCTS_DOCUMENT)
+
+    def _patch_cached_date(self, product_id: int, slot_id: str, date_id: str, new_stock: int, tickets_sold: Union[int, str]) -> None:
+        """
+        Update one slot date in the products cache after a successful inventory write,
+        so the dashboard shows the change without a full products refresh.
+        """
+        fields = {'stock': new_stock, 'available': new_stock}
+        try:
+            if not isinstance(tickets_sold, int):
+                # Sold count couldn't be read; keep the cached one so capacity stays consistent
+                cached_date = self.cache_store.get_date(product_id, slot_id, date_id) or {}
+                tickets_sold = cached_date.get('tickets_sold')
+            if isinstance(tickets_sold, int):
+                fields['tickets_sold'] = tickets_sold
+                fields['total_capacity'] = new_stock + tickets_sold
+            
+            if self.cache_store.update_date(product_id, slot_id, date_id, fields):
+                logging.debug(f"[PID:{product_id}] Patched cached date {slot_id}/{date_id}: {fields}")
+            else:
+                logging.debug(f"[PID:{product_id}] Date {slot_id}/{date_id} not in products cache; nothing to patch")
+        except sqlite3.Error as e:
+            logging.error(f"[PID:{product_id}] Failed to patch cached date {slot_id}/{date_id}: {e}")
+
+    def get_cached_product(self, product_id: int) -> Optional[Dict[str, Any]]:
+        """Get one product (with slots and dates) from the cache store without loading the others"""
+        try:
+            return self.cache_store.get_product(product_id)
+        except sqlite3.Error as e:
+            print(f"Error loading cached product {product_id}: {e}")
+            return None
+
     def get_cache_info(self) -> Dict[str, Any]:
         """Get information about the current WooCommerce cache"""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
-                
-                last_updated = cached_data.get('last_updated')
+        try:
+            cached_meta = self.cache_store.get_products_meta()
+            if cached_meta:
+                last_updated = cached_meta.get('last_updated')
                 if last_updated:
                     cache_time = datetime.fromisoformat(last_updated)
                     now = datetime.now(timezone.utc)
@@ -709,15 +858,15 @@ class WooCommerceClient:
                         'has_cache': True,
                         'last_updated': last_updated,
                         'age_minutes': age_minutes,
-                        'products_count': cached_data.get('total_products', 0),
-                        'slots_count': cached_data.get('total_slots', 0),
-                        'dates_count': cached_data.get('total_dates', 0)
+                        'products_count': cached_meta.get('total_products', 0),
+                        'slots_count': cached_meta.get('total_slots', 0),
+                        'dates_count': cached_meta.get('total_dates', 0)
                     }
-            except Exception as e:
-                return {
-                    'has_cache': False,
-                    'error': str(e)
-                }
+        except Exception as e:
+            return {
+                'has_cache': False,
+                'error': str(e)
+            }
         
         return {
             'has_cache': False
@@ -752,6 +901,9 @@ class WooCommerceClient:
             if not booking_data:
                 raise WooCommerceAPIError(f"No FooEvents data found for product {product_id}")
             
+            # One grouped query covers every slot/date of the product
+            sold_counts = (await run_blocking(self._get_tickets_sold_counts, [product_id])).get(product_id)
+            
             if slot_id and slot_id in booking_data:
                 slot_data = booking_data[slot_id]
                 add_date = slot_data.get('add_date', {})
@@ -766,7 +918,7 @@ class WooCommerceClient:
                         available = 0
                     
                     total_capacity, tickets_sold = self._get_accurate_capacity_data(
-                        product_id, slot_data.get('label'), date_info.get('date'), available
+                        product_id, slot_data.get('label'), date_info.get('date'), available, sold_counts
                     )
                     
                     return {
@@ -790,7 +942,7 @@ class WooCommerceClient:
                         available = 0
                     
                     total_capacity, tickets_sold = self._get_accurate_capacity_data(
-                        product_id, slot_data.get('label'), date_str, available
+                        product_id, slot_data.get('label'), date_str, available, sold_counts
                     )
                     return {
                         'product_id': product_id,
@@ -811,7 +963,7 @@ class WooCommerceClient:
                             _stock = d_info.get('stock', 0)
                             try: _avail = int(_stock) if _stock != '' else 0
                             except: _avail = 0
-                            _tc, _ts = self._get_accurate_capacity_data(product_id, slot_data.get('label'), d_info.get('date'), _avail)
+                            _tc, _ts = self._get_accurate_capacity_data(product_id, slot_data.get('label'), d_info.get('date'), _avail, sold_counts)
                             dates.append({'date_id': did, 'date': d_info.get('date'), 'stock': _avail, 'available': _avail, 'total_capacity': _tc, 'tickets_sold': _ts})
                     else: # Flat
                         date_entries_inv = {}
@@ -826,7 +978,7 @@ class WooCommerceClient:
                                 _stock = d_info.get('stock',0)
                                 try: _avail = int(_stock) if _stock != '' else 0
                                 except: _avail = 0
-                                _tc, _ts = self._get_accurate_capacity_data(product_id, slot_data.get('label'), d_info.get('date'), _avail)
+                                _tc, _ts = self._get_accurate_capacity_data(product_id, slot_data.get('label'), d_info.get('date'), _avail, sold_counts)
                                 dates.append({'date_id': did, 'date': d_info.get('date'), 'stock': _avail, 'available': _avail, 'total_capacity': _tc, 'tickets_sold': _ts})
                     
                     return {
@@ -837,7 +989,7 @@ class WooCommerceClient:
                         'dates': dates
                     }
             else: # Return all slots and dates if slot_id not specified
-                formatted_slots = self.format_booking_slots(product_data, booking_data)
+                formatted_slots = self.format_booking_slots(product_data, booking_data, sold_counts)
                 return {
                     'product_id': product_id,
                     'product_name': product_data.get('name'),
@@ -1071,7 +1223,7 @@ class WooCommerceClient:
             tickets_sold_val = "Error"
             if slot_label_for_response != "Unknown Slot" and date_str_for_response and "Unknown Date" not in date_str_for_response and self.wp_db_available:
                 logging.debug(f"[PID:{product_id}] Querying DB for sold tickets (increment). Product: {product_id}, Slot Label: '{slot_label_for_response}', Date: '{date_str_for_response}'")
-                _ts = self.wp_db.get_tickets_sold_for_date(product_id, slot_label_for_response, date_str_for_response)
+                _ts = await run_blocking(self.wp_db.get_tickets_sold_for_date, product_id, slot_label_for_response, date_str_for_response)
                 if isinstance(_ts, int):
                     tickets_sold_val = _ts
                 else:
@@ -1100,6 +1252,7 @@ class WooCommerceClient:
                 'new_stock_available': new_stock_int
             }
             logging.debug(f"[PID:{product_id}] Increment API Response: {response_data}")
+            await run_blocking(self._patch_cached_date, product_id, slot_id, date_id, response_data['new_stock_available'], tickets_sold_val)
             return response_data
                 
         except WooCommerceAPIError as e: 
@@ -1258,7 +1411,7 @@ class WooCommerceClient:
             tickets_sold_val = "Error"
             if slot_label_for_response != "Unknown Slot" and date_str_for_response and "Unknown Date" not in date_str_for_response and self.wp_db_available:
                 logging.debug(f"[PID:{product_id}] Querying DB for sold tickets (decrement). Product: {product_id}, Slot Label: '{slot_label_for_response}', Date: '{date_str_for_response}'")
-                _ts = self.wp_db.get_tickets_sold_for_date(product_id, slot_label_for_response, date_str_for_response)
+                _ts = await run_blocking(self.wp_db.get_tickets_sold_for_date, product_id, slot_label_for_response, date_str_for_response)
                 if isinstance(_ts, int):
                     tickets_sold_val = _ts
                 else:
@@ -1287,6 +1440,7 @@ class WooCommerceClient:
                 'new_stock_available': new_stock_int
             }
             logging.debug(f"[PID:{product_id}] Decrement API Response: {response_data}")
+            await run_blocking(self._patch_cached_date, product_id, slot_id, date_id, response_data['new_stock_available'], tickets_sold_val)
             return response_data
 
         except WooCommerceAPIError as e: # Catch specific API errors first
@@ -1306,10 +1460,10 @@ class WooCommerceClient:
             url = f"{self.base_url}/products/{product_id}"
             params = {'consumer_key': self.consumer_key, 'consumer_secret': self.consumer_secret}
             put_headers = {'Content-Type': 'application/json'}
-            response = requests.put(url, headers=put_headers, params=params, json=update_data)
+            response = await self.http.put(url, headers=put_headers, params=params, json=update_data, timeout=self.http_timeout)
             response.raise_for_status()
             logging.info(f"Successfully updated booking data for product {product_id}")
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
             logging.error(f"Failed to update booking data for product {product_id}: {e}")
             raise WooCommerceAPIError(f"Failed to update booking data: {str(e)}")
 
@@ -1322,10 +1476,10 @@ class WooCommerceClient:
             url = f"{self.base_url}/products/{product_id}"
             params = {'consumer_key': self.consumer_key, 'consumer_secret': self.consumer_secret}
             put_headers = {'Content-Type': 'application/json'}
-            response = requests.put(url, headers=put_headers, params=params, json=update_data)
+            response = await self.http.put(url, headers=put_headers, params=params, json=update_data, timeout=self.http_timeout)
             response.raise_for_status()
             logging.info(f"Successfully updated stock quantity for product {product_id} to {new_stock}")
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
             logging.error(f"Failed to update stock quantity for product {product_id}: {e}")
             raise WooCommerceAPIError(f"Failed to update stock quantity: {str(e)}")
 
@@ -1504,7 +1658,7 @@ class WooCommerceClient:
             tickets_sold_val = "Error"
             if slot_label_for_response != "Unknown Slot" and date_str_for_response != "Unknown Date (set_initial)" and date_str_for_response and self.wp_db_available:
                 logging.debug(f"[PID:{product_id}] Querying DB for sold tickets (set). Product: {product_id}, Slot Label: '{slot_label_for_response}', Date: '{date_str_for_response}'")
-                _ts = self.wp_db.get_tickets_sold_for_date(product_id, slot_label_for_response, date_str_for_response)
+                _ts = await run_blocking(self.wp_db.get_tickets_sold_for_date, product_id, slot_label_for_response, date_str_for_response)
                 if isinstance(_ts, int):
                     tickets_sold_val = _ts
                 else:
@@ -1534,6 +1688,7 @@ class WooCommerceClient:
                 'new_stock_available': current_available_stock_after_set
             }
             logging.debug(f"[PID:{product_id}] Set API Response: {response_data}")
+            await run_blocking(self._patch_cached_date, product_id, slot_id, date_id, response_data['new_stock_available'], tickets_sold_val)
             return response_data
 
         except WooCommerceAPIError as e: # Catch specific API errors first
@@ -1,21 +1,300 @@
 """
 WordPress database client for querying FooEvents ticket data.
 Connects to WordPress MySQL database to get actual ticket sales from event_magic_tickets CPT.
+
+With WORDPRESS_TICKET_SUMMARY enabled, sold counts are answered from a ticket sales
+summary in the local cache store instead of pivoting wp_postmeta on every call. The
+summary is built by a backfill in the background (counts are read live until it
+exists) and kept current by scanning only tickets with an ID above the last one seen.
+
+With WORDPRESS_DB_REPLICA_HOST set, count and debug reads go to a read replica
+while its replication lag is within WORDPRESS_DB_REPLICA_MAX_LAG_SECONDS, and to
+the primary otherwise.
 """
 
 import os
+import re
+import time
+import threading
 import pymysql
-from typing import Dict, Any, Optional, List
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Any, Optional, List, Tuple, Union
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 import logging
 
+from cache_store import get_cache_store
+
 # Load environment variables
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
+# FooEvents stores booking slots as "<label> (<time>)" or "<label> (<time> - <time>)", the time
+# as "HH:MM", "HH:MM am/pm" or an hour with am/pm ("8 PM"); this matches that suffix
+_SLOT_TIME = r'(?:\d{1,2}:\d{2}(?:\s*[AaPp]\.?[Mm]\.?)?|\d{1,2}\s*[AaPp]\.?[Mm]\.?)'
+SLOT_TIME_SUFFIX = re.compile(rf'\s*\(\s*{_SLOT_TIME}(?:\s*-\s*{_SLOT_TIME})?\s*\)\s*$')
+# Seconds a product's slot values are reused (topped up with new tickets' values) before a full re-read
+SLOT_VALUES_TTL_SECONDS = 300
+
+# Tickets read per query while scanning for the ticket sales summary
+TICKET_SCAN_BATCH_SIZE = 5000
+# Tickets this recent with missing booking meta are rescanned (FooEvents writes meta after the post)
+TICKET_META_GRACE_SECONDS = 300
+# Formats FooEvents writes WooCommerceEventsBookingDate in
+BOOKING_DATE_FORMATS = ('%B %d, %Y', '%b %d, %Y', '%Y-%m-%d', '%d/%m/%Y')
+
+# Prefix lengths for proposed wp_postmeta indexes: meta_key is VARCHAR(255) and WordPress
+# itself indexes 191 characters of it (utf8mb4); meta_value is LONGTEXT and needs a prefix
+META_KEY_INDEX_PREFIX = 191
+META_VALUE_INDEX_PREFIX = 32
+# EXPLAIN access types that read a whole table or a whole index
+FULL_SCAN_ACCESS_TYPES = ('ALL', 'index')
+
+def slot_key(slot: str) -> str:
+    """
+    Normalised slot key used to match FooEvents slot labels against stored ticket slots:
+    the slot without its " (HH:MM)" time suffix, case-folded ("8pm Show (20:00)" -> "8pm show").
+    """
+    return SLOT_TIME_SUFFIX.sub('', slot or '').strip().casefold()
+
+def date_key(booking_date: str) -> str:
+    """Normalised booking date key (dates compare case-insensitively, like MySQL's default collation)"""
+    return (booking_date or '').strip().casefold()
+
 class WordPressDBError(Exception):
     """Custom exception for WordPress database errors"""
     pass
 
+class MySQLConnectionPool:
+    """
+    A bounded, thread-safe pool of pymysql connections.
+    
+    Connections are checked out for one unit of work and returned afterwards, so
+    concurrent requests each get their own socket instead of sharing one. Idle
+    connections above min_size are closed after idle_timeout seconds, every
+    checkout pings the connection first, and (re)connecting retries with
+    exponential backoff so a dropped connection doesn't fail the request.
+    """
+    
+    def __init__(self, connect_kwargs: Dict[str, Any], min_size: int = 1, max_size: int = 5,
+                 idle_timeout: float = 300, checkout_timeout: float = 10,
+                 connect_retries: int = 3, retry_backoff: float = 0.5):
+        self.connect_kwargs = connect_kwargs
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.connect_retries = max(0, connect_retries)
+        self.retry_backoff = retry_backoff
+        
+        self._idle = deque()  # (connection, returned_at) pairs, most recently used last
+        self._size = 0  # Open connections, idle or checked out
+        self._closed = False
+        self._condition = threading.Condition()
+        
+        # Pool statistics
+        self.checkouts = 0
+        self.checkout_waits = 0
+        self.connections_created = 0
+        self.connections_discarded = 0
+        self.health_check_failures = 0
+        self.connect_retries_used = 0
+    
+    def _connect(self):
+        """Open a new connection, retrying with exponential backoff"""
+        for attempt in range(self.connect_retries + 1):
+            try:
+                connection = pymysql.connect(**self.connect_kwargs)
+                self.connections_created += 1
+                logging.info(f"Connected to WordPress database: {self.connect_kwargs.get('database')}")
+                return connection
+            except pymysql.err.MySQLError as e:
+                if attempt >= self.connect_retries:
+                    raise WordPressDBError(f"Failed to connect to WordPress database: {str(e)}")
+                delay = self.retry_backoff * (2 ** attempt)
+                self.connect_retries_used += 1
+                logging.warning(f"WordPress database connection failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+    
+    @staticmethod
+    def _close_quietly(connection) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+    
+    def _prune_idle(self) -> List[Any]:
+        """Remove idle connections past idle_timeout (keeping min_size); caller holds the lock"""
+        expired = []
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            connection, _ = self._idle.popleft()
+            self._size -= 1
+            expired.append(connection)
+        return expired
+    
+    def _is_healthy(self, connection) -> bool:
+        """Health check run on checkout"""
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            self.health_check_failures += 1
+            return False
+    
+    def _discard(self, connection) -> None:
+        self._close_quietly(connection)
+        with self._condition:
+            self._size -= 1
+            self.connections_discarded += 1
+            self._condition.notify()
+    
+    def acquire(self):
+        """
+        Check out a healthy connection, waiting up to checkout_timeout if the pool is at max_size.
+        
+        Raises:
+            WordPressDBError: If the pool is closed, exhausted, or the database is unreachable
+        """
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            connection = None
+            with self._condition:
+                if self._closed:
+                    raise WordPressDBError("WordPress database connection pool is closed")
+                expired = self._prune_idle()
+                waited = False
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise WordPressDBError(f"Timed out waiting for a WordPress database connection (pool size {self.max_size})")
+                    if not waited:
+                        self.checkout_waits += 1
+                        waited = True
+                    self._condition.wait(remaining)
+                if self._idle:
+                    connection, _ = self._idle.pop()
+                else:
+                    self._size += 1  # Reserve a slot for the connection opened below
+                self.checkouts += 1
+            
+            for stale in expired:
+                self._close_quietly(stale)
+            
+            if connection is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+            
+            if self._is_healthy(connection):
+                return connection
+            
+            # Dropped by the server while idle: throw it away and try again
+            logging.warning("Discarding dead WordPress database connection from pool")
+            self._discard(connection)
+    
+    def release(self, connection, discard: bool = False) -> None:
+        """Return a checked-out connection to the pool (or close it if it's broken)"""
+        if discard or self._closed or not connection.open:
+            self._discard(connection)
+            return
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+    
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of a with-block"""
+        connection = self.acquire()
+        discard = False
+        try:
+            yield connection
+        except (pymysql.err.OperationalError, pymysql.err.InterfaceError):
+            # Lost connection mid-query; don't hand it to the next caller
+            discard = True
+            raise
+        finally:
+            self.release(connection, discard=discard)
+    
+    def maintain(self) -> bool:
+        """
+        Ping idle connections, drop dead or expired ones, and top the pool back up to min_size.
+        
+        Returns:
+            True if the database is reachable
+        """
+        with self._condition:
+            expired = self._prune_idle()
+            idle = list(self._idle)
+            self._idle.clear()
+        for stale in expired:
+            self._close_quietly(stale)
+        
+        for connection, returned_at in idle:
+            if self._is_healthy(connection):
+                with self._condition:
+                    self._idle.append((connection, returned_at))
+                    self._condition.notify()
+            else:
+                self._discard(connection)
+        
+        try:
+            while True:
+                with self._condition:
+                    if self._closed or self._size >= self.min_size:
+                        break
+                    self._size += 1
+                try:
+                    connection = self._connect()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+                self.release(connection)
+            if self.min_size == 0:
+                with self.connection() as connection:
+                    connection.ping(reconnect=False)
+            return True
+        except Exception as e:
+            logging.warning(f"WordPress database pool maintenance failed: {e}")
+            return False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool size and checkout statistics"""
+        with self._condition:
+            idle = len(self._idle)
+            size = self._size
+        return {
+            'size': size,
+            'idle': idle,
+            'in_use': size - idle,
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            'idle_timeout_seconds': self.idle_timeout,
+            'checkouts': self.checkouts,
+            'checkout_waits': self.checkout_waits,
+            'connections_created': self.connections_created,
+            'connections_discarded': self.connections_discarded,
+            'health_check_failures': self.health_check_failures,
+            'connect_retries': self.connect_retries_used
+        }
+    
+    def close(self) -> None:
+        """Close idle connections; checked-out ones are closed when they're returned"""
+        with self._condition:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for connection in idle:
+            self._close_quietly(connection)
+
 class WordPressDBClient:
     def __init__(self):
         self.host = os.getenv('WORDPRESS_DB_HOST', 'localhost')
@@ -25,37 +304,167 @@ class WordPressDBClient:
         self.database = os.getenv('WORDPRESS_DB_NAME')
         self.table_prefix = os.getenv('WORDPRESS_TABLE_PREFIX', 'wp_')
         
-        # Connection will be created on demand
-        self.connection = None
-        
         if not all([self.user, self.password, self.database]):
             raise WordPressDBError('WordPress database credentials not found in environment variables.')
+        
+        # Connections are opened on demand and shared through a bounded pool
+        self.pool = self._create_pool(self.host, self.port, self.user, self.password)
+        
+        # Optional read replica for count and debug queries, used while its lag is below the threshold
+        self.replica_host = os.getenv('WORDPRESS_DB_REPLICA_HOST') or None
+        self.replica_max_lag_seconds = float(os.getenv('WORDPRESS_DB_REPLICA_MAX_LAG_SECONDS', '30'))
+        self.replica_lag_check_seconds = float(os.getenv('WORDPRESS_DB_REPLICA_LAG_CHECK_SECONDS', '10'))
+        self.replica_pool: Optional[MySQLConnectionPool] = None
+        if self.replica_host:
+            self.replica_pool = self._create_pool(
+                self.replica_host,
+                int(os.getenv('WORDPRESS_DB_REPLICA_PORT', str(self.port))),
+                os.getenv('WORDPRESS_DB_REPLICA_USER') or self.user,
+                os.getenv('WORDPRESS_DB_REPLICA_PASSWORD') or self.password
+            )
+        self._replica_lock = threading.Lock()
+        self._replica_checked_at = 0.0
+        self._replica_lag: Optional[float] = None
+        self._replica_error: Optional[str] = None
+        self._replica_usable = False
+        self.replica_reads = 0
+        self.replica_fallbacks = 0
+        
+        # Optional ticket sales summary
+        self.ticket_summary_enabled = os.getenv('WORDPRESS_TICKET_SUMMARY', 'false').lower() in ('1', 'true', 'yes')
+        self.ticket_summary_refresh_seconds = float(os.getenv('WORDPRESS_TICKET_SUMMARY_REFRESH_SECONDS', '5'))
+        self.ticket_summary_rebuild_hours = float(os.getenv('WORDPRESS_TICKET_SUMMARY_REBUILD_HOURS', '24'))
+        self.ticket_summary_status_recheck_seconds = float(os.getenv('WORDPRESS_TICKET_SUMMARY_STATUS_RECHECK_SECONDS', '60'))
+        self._summary_lock = threading.Lock()
+        self._summary_checked_at = 0.0
+        # product_id -> (resolved_at, last ticket ID read, distinct stored slot values)
+        self._slot_values: Dict[int, Tuple[float, int, List[str]]] = {}
+        # (product_id or None, slot key) pairs already warned about matching by prefix only
+        self._slot_prefix_warnings = set()
     
-    def _get_connection(self):
-        """Get database connection, creating it if necessary"""
-        if self.connection is None or not self.connection.open:
+    def _create_pool(self, host: str, port: int, user: str, password: str) -> MySQLConnectionPool:
+        """Connection pool for one database server, sized by the WORDPRESS_DB_POOL_* settings"""
+        return MySQLConnectionPool(
+            connect_kwargs={
+                'host': host,
+                'port': port,
+                'user': user,
+                'password': password,
+                'database': self.database,
+                'charset': 'utf8mb4',
+                'cursorclass': pymysql.cursors.DictCursor,
+                'autocommit': True,
+                'connect_timeout': int(os.getenv('WORDPRESS_DB_CONNECT_TIMEOUT', '10'))
+            },
+            min_size=int(os.getenv('WORDPRESS_DB_POOL_MIN', '1')),
+            max_size=int(os.getenv('WORDPRESS_DB_POOL_MAX', '5')),
+            idle_timeout=float(os.getenv('WORDPRESS_DB_POOL_IDLE_TIMEOUT', '300')),
+            checkout_timeout=float(os.getenv('WORDPRESS_DB_POOL_TIMEOUT', '10')),
+            connect_retries=int(os.getenv('WORDPRESS_DB_CONNECT_RETRIES', '3')),
+            retry_backoff=float(os.getenv('WORDPRESS_DB_RETRY_BACKOFF', '0.5'))
+        )
+    
+    @contextmanager
+    def _cursor(self, replica: bool = False):
+        """
+        Check out a pooled connection and yield a cursor on it. With replica set, the
+        read goes to the read replica while it's reachable and within the lag threshold,
+        and to the primary otherwise.
+        """
+        pool = self._read_pool() if replica else self.pool
+        with ExitStack() as stack:
             try:
-                self.connection = pymysql.connect(
-                    host=self.host,
-                    port=self.port,
-                    user=self.user,
-                    password=self.password,
-                    database=self.database,
-                    charset='utf8mb4',
-                    cursorclass=pymysql.cursors.DictCursor,
-                    autocommit=True
-                )
-                logging.info(f"Connected to WordPress database: {self.database}")
-            except Exception as e:
-                raise WordPressDBError(f"Failed to connect to WordPress database: {str(e)}")
-        
-        return self.connection
+                conn = stack.enter_context(pool.connection())
+            except WordPressDBError as e:
+                if pool is self.pool:
+                    raise
+                self._replica_unavailable(str(e))
+                conn = stack.enter_context(self.pool.connection())
+            with conn.cursor() as cursor:
+                yield cursor
+    
+    def _read_pool(self) -> MySQLConnectionPool:
+        """Pool for a replica-eligible read: the replica while it's healthy, else the primary"""
+        if self.replica_pool is None:
+            return self.pool
+        self._check_replica_lag()
+        if self._replica_usable:
+            self.replica_reads += 1
+            return self.replica_pool
+        self.replica_fallbacks += 1
+        return self.pool
+    
+    def _replica_unavailable(self, error: str) -> None:
+        """Route reads to the primary until the next lag check"""
+        self.replica_fallbacks += 1
+        self._replica_checked_at = time.monotonic()
+        self._set_replica_status(None, error)
+    
+    def _set_replica_status(self, lag: Optional[float], error: Optional[str]) -> None:
+        usable = error is None and lag is not None and lag <= self.replica_max_lag_seconds
+        if usable != self._replica_usable:
+            if usable:
+                logging.info(f"Routing WordPress reads to replica {self.replica_host} (lag {lag:.0f}s)")
+            else:
+                logging.warning(f"Routing WordPress reads to the primary: replica {self.replica_host} {error or f'is {lag:.0f}s behind'}")
+        self._replica_lag = lag
+        self._replica_error = error
+        self._replica_usable = usable
+    
+    def _check_replica_lag(self) -> None:
+        """
+        Re-read the replica's lag at most every WORDPRESS_DB_REPLICA_LAG_CHECK_SECONDS.
+        Uses SHOW REPLICA STATUS, or SHOW SLAVE STATUS on servers that predate it
+        (MySQL < 8.0.22, MariaDB < 10.5.1). A replica that reports no status (e.g. the
+        user lacks REPLICATION CLIENT) or whose replication is stopped isn't used.
+        """
+        if time.monotonic() - self._replica_checked_at < self.replica_lag_check_seconds:
+            return
+        if not self._replica_lock.acquire(blocking=False):
+            # Another thread is checking; use the last result
+            return
+        try:
+            status = None
+            with self.replica_pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    try:
+                        cursor.execute("SHOW REPLICA STATUS")
+                    except pymysql.err.ProgrammingError:
+                        cursor.execute("SHOW SLAVE STATUS")
+                    status = cursor.fetchone()
+            
+            if not status:
+                self._set_replica_status(None, 'reports no replication status')
+            else:
+                lag = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+                if lag is None:
+                    self._set_replica_status(None, 'is not replicating')
+                else:
+                    self._set_replica_status(float(lag), None)
+        except Exception as e:
+            self._set_replica_status(None, f"lag check failed: {e}")
+        finally:
+            self._replica_checked_at = time.monotonic()
+            self._replica_lock.release()
+    
+    def get_replica_status(self) -> Optional[Dict[str, Any]]:
+        """Read replica routing state, or None if no replica is configured"""
+        if self.replica_pool is None:
+            return None
+        return {
+            'host': self.replica_host,
+            'in_use': self._replica_usable,
+            'lag_seconds': self._replica_lag,
+            'max_lag_seconds': self.replica_max_lag_seconds,
+            'error': self._replica_error,
+            'reads': self.replica_reads,
+            'fallbacks': self.replica_fallbacks
+        }
     
     def test_connection(self) -> bool:
         """Test if database connection is working"""
         try:
-            conn = self._get_connection()
-            with conn.cursor() as cursor:
+            with self._cursor() as cursor:
                 cursor.execute("SELECT 1")
                 cursor.fetchone()
             return True
@@ -63,6 +472,32 @@ class WordPressDBClient:
             logging.error(f"WordPress database connection test failed: {e}")
             return False
     
+    def keep_alive(self) -> bool:
+        """Ping pooled connections so idle ones aren't dropped, replacing any that were"""
+        if self.replica_pool is not None:
+            self.replica_pool.maintain()
+        return self.pool.maintain()
+    
+    def _tickets_sold_query(self, slot_count: int) -> str:
+        """Tickets sold for a product, slot and date (params: product_id, slot_count stored slot values, booking_date)"""
+        return f"""
+        SELECT COUNT(*) as ticket_count
+        FROM {self.table_prefix}posts p
+        INNER JOIN {self.table_prefix}postmeta m1 ON p.ID = m1.post_id 
+        INNER JOIN {self.table_prefix}postmeta m2 ON p.ID = m2.post_id 
+        INNER JOIN {self.table_prefix}postmeta m3 ON p.ID = m3.post_id 
+        LEFT JOIN {self.table_prefix}postmeta m4 ON p.ID = m4.post_id AND m4.meta_key = 'WooCommerceEventsStatus'
+        WHERE p.post_type = 'event_magic_tickets'
+        AND p.post_status = 'publish'
+        AND m1.meta_key = 'WooCommerceEventsProductID' 
+        AND m1.meta_value = %s
+        AND m2.meta_key = 'WooCommerceEventsBookingSlot' 
+        AND m2.meta_value IN ({', '.join(['%s'] * slot_count)})
+        AND m3.meta_key = 'WooCommerceEventsBookingDate' 
+        AND m3.meta_value = %s
+        AND (m4.meta_value IS NULL OR m4.meta_value NOT IN ('Canceled', 'Cancelled', 'Unpaid'))
+        """
+    
     def get_tickets_sold_for_date(self, product_id: int, slot_name: str, booking_date: str) -> Optional[int]:
         """
         Get the actual number of tickets sold for a specific product, slot, and date.
@@ -75,35 +510,26 @@ class WordPressDBClient:
         Returns:
             Number of tickets sold, or None if database error
         """
+        if self.ticket_summary_enabled:
+            try:
+                if self.refresh_ticket_summary() is not None:
+                    slot_values = self._match_slot_values(self.cache_store.get_ticket_slots(product_id), slot_name, product_id)
+                    return self.cache_store.count_tickets_sold(product_id, slot_values, booking_date) if slot_values else 0
+            except Exception as e:
+                logging.warning(f"Ticket sales summary unavailable, querying WordPress directly: {e}")
+        
         try:
-            conn = self._get_connection()
+            # Database stores slot names like "8pm Show (08:00)" but we get "8pm Show", so the
+            # stored values for this slot are resolved once per product and matched exactly
+            slot_values = self._resolve_slot_values(product_id, slot_name)
+            if not slot_values:
+                logging.info(f"No tickets sold yet for product {product_id}, slot '{slot_name}'")
+                return 0
             
-            # Query to count event_magic_tickets posts for this specific booking
-            # Note: Database stores slot names like "8pm Show (08:00)" but we get "8pm Show"
-            # So we need to use LIKE to match the beginning of the slot name
-            query = f"""
-            SELECT COUNT(*) as ticket_count
-            FROM {self.table_prefix}posts p
-            INNER JOIN {self.table_prefix}postmeta m1 ON p.ID = m1.post_id 
-            INNER JOIN {self.table_prefix}postmeta m2 ON p.ID = m2.post_id 
-            INNER JOIN {self.table_prefix}postmeta m3 ON p.ID = m3.post_id 
-            LEFT JOIN {self.table_prefix}postmeta m4 ON p.ID = m4.post_id AND m4.meta_key = 'WooCommerceEventsStatus'
-            WHERE p.post_type = 'event_magic_tickets'
-            AND p.post_status = 'publish'
-            AND m1.meta_key = 'WooCommerceEventsProductID' 
-            AND m1.meta_value = %s
-            AND m2.meta_key = 'WooCommerceEventsBookingSlot' 
-            AND m2.meta_value LIKE %s
-            AND m3.meta_key = 'WooCommerceEventsBookingDate' 
-            AND m3.meta_value = %s
-            AND (m4.meta_value IS NULL OR m4.meta_value NOT IN ('Canceled', 'Cancelled', 'Unpaid'))
-            """
+            query = self._tickets_sold_query(len(slot_values))
             
-            # Use LIKE pattern to match slot name at the beginning
-            slot_pattern = f"{slot_name}%"
-            
-            with conn.cursor() as cursor:
-                cursor.execute(query, (product_id, slot_pattern, booking_date))
+            with self._cursor(replica=True) as cursor:
+                cursor.execute(query, (product_id, *slot_values, booking_date))
                 result = cursor.fetchone()
                 
                 if result:
@@ -117,6 +543,444 @@ class WordPressDBClient:
         except Exception as e:
             logging.error(f"Error querying tickets sold: {e}")
             raise WordPressDBError(f"Failed to query tickets sold: {str(e)}")
+
+    def _tickets_sold_for_products_query(self, product_count: int) -> str:
+        """Tickets sold per product, stored slot and date (params: product_count product IDs)"""
+        return f"""
+        SELECT
+            m1.meta_value as product_id,
+            m2.meta_value as booking_slot,
+            m3.meta_value as booking_date,
+            COUNT(*) as ticket_count
+        FROM {self.table_prefix}posts p
+        INNER JOIN {self.table_prefix}postmeta m1 ON p.ID = m1.post_id
+        INNER JOIN {self.table_prefix}postmeta m2 ON p.ID = m2.post_id
+        INNER JOIN {self.table_prefix}postmeta m3 ON p.ID = m3.post_id
+        LEFT JOIN {self.table_prefix}postmeta m4 ON p.ID = m4.post_id AND m4.meta_key = 'WooCommerceEventsStatus'
+        WHERE p.post_type = 'event_magic_tickets'
+        AND p.post_status = 'publish'
+        AND m1.meta_key = 'WooCommerceEventsProductID'
+        AND m1.meta_value IN ({', '.join(['%s'] * product_count)})
+        AND m2.meta_key = 'WooCommerceEventsBookingSlot'
+        AND m3.meta_key = 'WooCommerceEventsBookingDate'
+        AND (m4.meta_value IS NULL OR m4.meta_value NOT IN ('Canceled', 'Cancelled', 'Unpaid'))
+        GROUP BY m1.meta_value, m2.meta_value, m3.meta_value
+        """
+    
+    def get_tickets_sold_for_products(self, product_ids: List[Union[int, str]]) -> Dict[int, Dict[Tuple[str, str], int]]:
+        """
+        Get the number of tickets sold for every slot and date of several products in one query.
+
+        Args:
+            product_ids: WooCommerce product IDs
+
+        Returns:
+            Dictionary mapping each product ID to {(slot key, date key): tickets_sold},
+            keyed by slot_key/date_key (e.g. ("8pm show", "june 07, 2025") for tickets stored
+            as "8pm Show (08:00)"); use lookup_tickets_sold to look up a FooEvents slot label.
+            Every requested product is present, with an empty dict if nothing was sold.
+        """
+        product_ids = [int(pid) for pid in product_ids]
+        if not product_ids:
+            return {}
+
+        if self.ticket_summary_enabled:
+            try:
+                if self.refresh_ticket_summary() is not None:
+                    return {
+                        product_id: self._key_sold_counts(counts)
+                        for product_id, counts in self.cache_store.get_tickets_sold_for_products(product_ids).items()
+                    }
+            except Exception as e:
+                logging.warning(f"Ticket sales summary unavailable, querying WordPress directly: {e}")
+
+        try:
+            query = self._tickets_sold_for_products_query(len(product_ids))
+
+            sold_counts: Dict[int, Dict[Tuple[str, str], int]] = {pid: {} for pid in product_ids}
+
+            with self._cursor(replica=True) as cursor:
+                cursor.execute(query, [str(pid) for pid in product_ids])
+                for row in cursor.fetchall():
+                    try:
+                        product_id = int(row['product_id'])
+                    except (ValueError, TypeError):
+                        continue
+                    product_counts = sold_counts.setdefault(product_id, {})
+                    key = (row['booking_slot'] or '', row['booking_date'] or '')
+                    product_counts[key] = product_counts.get(key, 0) + row['ticket_count']
+
+            sold_counts = {product_id: self._key_sold_counts(counts) for product_id, counts in sold_counts.items()}
+
+            logging.info(f"Loaded tickets sold for {len(product_ids)} products in one query ({sum(len(c) for c in sold_counts.values())} slot/date groups)")
+            return sold_counts
+
+        except Exception as e:
+            logging.error(f"Error querying tickets sold for products {product_ids}: {e}")
+            raise WordPressDBError(f"Failed to query tickets sold for products: {str(e)}")
+
+    def get_tickets_sold_for_product(self, product_id: int) -> Dict[Tuple[str, str], int]:
+        """
+        Get the number of tickets sold for every slot and date of a product in one query.
+
+        Args:
+            product_id: WooCommerce product ID
+
+        Returns:
+            Dictionary mapping (slot key, date key) to tickets sold
+        """
+        return self.get_tickets_sold_for_products([product_id]).get(int(product_id), {})
+
+    @staticmethod
+    def lookup_tickets_sold(sold_counts: Dict[Tuple[str, str], int], slot_name: str, booking_date: str) -> int:
+        """
+        Look up the tickets sold for one slot/date in a get_tickets_sold_for_product result.
+        The slot matches on its normalised key (so "8pm" no longer also counts "8pm Late"),
+        the date exactly, both case-insensitively like MySQL's default collation. Without
+        an exact key, slots stored as the label plus a bracketed suffix SLOT_TIME_SUFFIX
+        doesn't know (e.g. "8pm Show (doors 7:30)") are counted, as in _match_slot_values.
+
+        Args:
+            sold_counts: Dictionary mapping (slot key, date key) to tickets sold
+            slot_name: FooEvents booking slot name (e.g., "8pm Show")
+            booking_date: Booking date string (e.g., "June 07, 2025")
+
+        Returns:
+            Number of tickets sold
+        """
+        key, booking_date_key = slot_key(slot_name), date_key(booking_date)
+        if (key, booking_date_key) in sold_counts or not key:
+            return sold_counts.get((key, booking_date_key), 0)
+        return sum(
+            count for (stored_key, stored_date), count in sold_counts.items()
+            if stored_date == booking_date_key and stored_key.startswith(key)
+            and stored_key[len(key):].lstrip()[:1] in ('(', '[', '{')
+        )
+
+    @staticmethod
+    def _key_sold_counts(counts: Dict[Tuple[str, str], int]) -> Dict[Tuple[str, str], int]:
+        """Re-key {(stored slot, date): sold} by (slot key, date key), adding up values that share a key"""
+        keyed: Dict[Tuple[str, str], int] = {}
+        for (slot, date), count in counts.items():
+            key = (slot_key(slot), date_key(date))
+            keyed[key] = keyed.get(key, 0) + count
+        return keyed
+
+    def _match_slot_values(self, slot_values: List[str], slot_name: str, product_id: Optional[int] = None) -> List[str]:
+        """
+        Stored slot values that belong to a FooEvents slot label. If none has the label's
+        slot key but some are the label followed by a bracketed suffix SLOT_TIME_SUFFIX
+        doesn't know (e.g. "8pm Show (doors 7:30)"), those are used instead and a warning
+        is logged once. A label followed by more words ("8pm Late Show") is another slot.
+        """
+        key = slot_key(slot_name)
+        matched = [value for value in slot_values if slot_key(value) == key]
+        if matched or not key:
+            return matched
+        
+        label = (slot_name or '').strip().casefold()
+        matched = [
+            value for value in slot_values
+            if value.strip().casefold().startswith(label) and value.strip()[len(label):].lstrip()[:1] in ('(', '[', '{')
+        ]
+        if matched and (product_id, key) not in self._slot_prefix_warnings:
+            self._slot_prefix_warnings.add((product_id, key))
+            logging.warning(f"Slot '{slot_name}' of product {product_id} matched stored slots {matched} by prefix only; "
+                            "their suffix isn't a recognised time, so check SLOT_TIME_SUFFIX")
+        return matched
+
+    def _slot_values_query(self) -> str:
+        """Distinct stored slot values of a product's tickets after a ticket ID, with the last ticket of each (params: product_id, after_id)"""
+        return f"""
+        SELECT m2.meta_value as booking_slot, MAX(m1.post_id) as last_ticket_id
+        FROM {self.table_prefix}postmeta m1
+        INNER JOIN {self.table_prefix}postmeta m2 ON m1.post_id = m2.post_id
+        WHERE m1.meta_key = 'WooCommerceEventsProductID'
+        AND m1.meta_value = %s
+        AND m1.post_id > %s
+        AND m2.meta_key = 'WooCommerceEventsBookingSlot'
+        GROUP BY m2.meta_value
+        """
+    
+    def _resolve_slot_values(self, product_id: int, slot_name: str) -> List[str]:
+        """
+        Stored slot values (e.g. "8pm Show (08:00)") of a product's tickets that belong to
+        a slot label. The product's distinct values are read once and re-read in full every
+        SLOT_VALUES_TTL_SECONDS; in between, each call only adds the values of tickets
+        newer than the last one read, so a new slot or stored variant counts right away.
+        """
+        product_id = int(product_id)
+        cached = self._slot_values.get(product_id)
+        if cached and time.time() - cached[0] < SLOT_VALUES_TTL_SECONDS:
+            resolved_at, after_id, values = cached
+        else:
+            resolved_at, after_id, values = time.time(), 0, []
+        
+        with self._cursor(replica=True) as cursor:
+            cursor.execute(self._slot_values_query(), (product_id, after_id))
+            rows = cursor.fetchall()
+        
+        if rows:
+            values = values + [row['booking_slot'] for row in rows if row['booking_slot'] and row['booking_slot'] not in values]
+            after_id = max([after_id] + [int(row['last_ticket_id']) for row in rows])
+        self._slot_values[product_id] = (resolved_at, after_id, values)
+        return self._match_slot_values(values, slot_name, product_id)
+
+    @property
+    def cache_store(self):
+        return get_cache_store()
+
+    def _ticket_select(self) -> str:
+        """SELECT ... FROM for one row per ticket with its booking meta"""
+        return f"""
+        SELECT
+            p.ID as ticket_id,
+            p.post_status,
+            p.post_modified_gmt,
+            m1.meta_value as product_id,
+            m2.meta_value as booking_slot,
+            m3.meta_value as booking_date,
+            m4.meta_value as status,
+            p.post_date_gmt > UTC_TIMESTAMP() - INTERVAL {TICKET_META_GRACE_SECONDS} SECOND as is_recent
+        FROM {self.table_prefix}posts p
+        LEFT JOIN {self.table_prefix}postmeta m1 ON p.ID = m1.post_id AND m1.meta_key = 'WooCommerceEventsProductID'
+        LEFT JOIN {self.table_prefix}postmeta m2 ON p.ID = m2.post_id AND m2.meta_key = 'WooCommerceEventsBookingSlot'
+        LEFT JOIN {self.table_prefix}postmeta m3 ON p.ID = m3.post_id AND m3.meta_key = 'WooCommerceEventsBookingDate'
+        LEFT JOIN {self.table_prefix}postmeta m4 ON p.ID = m4.post_id AND m4.meta_key = 'WooCommerceEventsStatus'
+        """
+
+    @staticmethod
+    def _ledger_entry(row: Dict[str, Any]) -> Optional[Tuple[int, int, str, str, str]]:
+        """Ledger entry for a scanned ticket, or None if it doesn't count (unpublished or no booking meta)"""
+        if row['post_status'] != 'publish' or not (row['product_id'] and row['booking_slot'] and row['booking_date']):
+            return None
+        try:
+            return (row['ticket_id'], int(row['product_id']), row['booking_slot'], row['booking_date'], row['status'] or '')
+        except (ValueError, TypeError):
+            return None
+
+    def _new_tickets_query(self) -> str:
+        """Batch of published tickets after an ID (params: after_id, limit)"""
+        return self._ticket_select() + """
+        WHERE p.post_type = 'event_magic_tickets'
+        AND p.post_status = 'publish'
+        AND p.ID > %s
+        ORDER BY p.ID
+        LIMIT %s
+        """
+
+    def _modified_tickets_query(self) -> str:
+        """Tickets modified since a timestamp, up to an ID (params: modified_since, up_to_id)"""
+        return self._ticket_select() + """
+        WHERE p.post_type = 'event_magic_tickets'
+        AND p.post_modified_gmt >= %s
+        AND p.ID <= %s
+        """
+
+    def _scan_new_tickets(self, after_id: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Read published tickets with an ID above after_id, in ID order.
+
+        Returns:
+            (rows, last_seen_id): the ticket rows, and the ID the next scan should start
+            after. Recent tickets whose meta isn't written yet hold the watermark back so
+            they're read again by a later scan.
+        """
+        query = self._new_tickets_query()
+        scanned: List[Dict[str, Any]] = []
+        last_seen_id = after_id
+        held_back = False
+        with self._cursor() as cursor:
+            while True:
+                cursor.execute(query, (last_seen_id, TICKET_SCAN_BATCH_SIZE))
+                rows = cursor.fetchall()
+                for row in rows:
+                    if row['is_recent'] and self._ledger_entry(row) is None:
+                        held_back = True
+                    if not held_back:
+                        last_seen_id = row['ticket_id']
+                scanned.extend(rows)
+                if len(rows) < TICKET_SCAN_BATCH_SIZE or held_back:
+                    break
+        # Tickets read past a held-back one are read again next time; the ledger skips them then
+        return scanned, last_seen_id
+
+    def _scan_modified_tickets(self, modified_since: str, up_to_id: int) -> List[Dict[str, Any]]:
+        """Read tickets (any post status) up to up_to_id that were modified at or after modified_since"""
+        with self._cursor() as cursor:
+            cursor.execute(self._modified_tickets_query(), (modified_since, up_to_id))
+            return cursor.fetchall()
+
+    def _tickets_by_id_query(self, count: int) -> str:
+        """Tickets (any post status) with one of count IDs (params: the IDs)"""
+        return self._ticket_select() + f"""
+        WHERE p.post_type = 'event_magic_tickets'
+        AND p.ID IN ({', '.join(['%s'] * count)})
+        """
+
+    def _scan_tickets_by_id(self, ticket_ids: List[int]) -> List[Dict[str, Any]]:
+        """Read the given tickets again, in batches; tickets no longer in wp_posts aren't returned"""
+        scanned: List[Dict[str, Any]] = []
+        if not ticket_ids:
+            return scanned
+        with self._cursor() as cursor:
+            for start in range(0, len(ticket_ids), TICKET_SCAN_BATCH_SIZE):
+                batch = ticket_ids[start:start + TICKET_SCAN_BATCH_SIZE]
+                cursor.execute(self._tickets_by_id_query(len(batch)), batch)
+                scanned.extend(cursor.fetchall())
+        return scanned
+
+    @staticmethod
+    def _upcoming_dates(dates: List[str]) -> List[str]:
+        """Booking dates from today on; dates in an unknown format are kept, so they're treated as upcoming"""
+        today = datetime.now().date()
+        upcoming = []
+        for booking_date in dates:
+            for date_format in BOOKING_DATE_FORMATS:
+                try:
+                    parsed = datetime.strptime((booking_date or '').strip(), date_format).date()
+                    break
+                except ValueError:
+                    continue
+            else:
+                parsed = None
+            if parsed is None or parsed >= today:
+                upcoming.append(booking_date)
+        return upcoming
+
+    def _scan_open_tickets(self) -> List[Dict[str, Any]]:
+        """
+        Read the summary's tickets whose status can still change (Unpaid, or booked for an
+        upcoming date) again: FooEvents updates WooCommerceEventsStatus in wp_postmeta on
+        payment, cancellation and check-in without touching post_modified_gmt.
+        """
+        open_ids = self.cache_store.get_open_ticket_ids(self._upcoming_dates(self.cache_store.get_ticket_dates()))
+        rows = self._scan_tickets_by_id(open_ids)
+        # Open tickets gone from wp_posts are deleted ones; dropping them from the summary is right
+        found = {row['ticket_id'] for row in rows}
+        return rows + [
+            {'ticket_id': ticket_id, 'post_status': None, 'post_modified_gmt': None,
+             'product_id': None, 'booking_slot': None, 'booking_date': None, 'status': None}
+            for ticket_id in open_ids if ticket_id not in found
+        ]
+
+    def _modified_watermark(self) -> str:
+        """
+        Database time ('YYYY-MM-DD HH:MM:SS', UTC) to scan modified tickets from next time,
+        read before a scan starts: a ticket edited while a multi-batch scan runs is modified
+        after it, however early its batch was read
+        """
+        with self._cursor() as cursor:
+            cursor.execute("SELECT UTC_TIMESTAMP() as scan_started_at")
+            return str(cursor.fetchone()['scan_started_at'])
+
+    def _backfill_ticket_summary(self, now: float) -> Dict[str, Any]:
+        """Rebuild the ticket sales summary from all published tickets; caller holds _summary_lock"""
+        started = time.perf_counter()
+        modified_since = self._modified_watermark()
+        rows, last_seen_id = self._scan_new_tickets(0)
+        tickets = [ticket for ticket in map(self._ledger_entry, rows) if ticket]
+        state = {
+            'last_seen_id': last_seen_id,
+            'modified_since': modified_since,
+            'backfilled_at': datetime.now(timezone.utc).isoformat(),
+            'backfilled_at_ts': now,
+            'refreshed_at': datetime.now(timezone.utc).isoformat()
+        }
+        self.cache_store.replace_ticket_sales(tickets, state)
+        logging.info(f"Backfilled ticket sales summary with {len(tickets)} tickets in {time.perf_counter() - started:.2f}s")
+        return state
+
+    def _update_ticket_summary(self, state: Dict[str, Any], now: float) -> Dict[str, Any]:
+        """
+        Incremental scan of tickets with an ID above the last one seen plus tickets modified
+        since the last scan, applied to the summary as deltas; every
+        WORDPRESS_TICKET_SUMMARY_STATUS_RECHECK_SECONDS it also re-reads the tickets whose
+        status can still change (see _scan_open_tickets). Caller holds _summary_lock.
+        """
+        modified_since = self._modified_watermark()
+        rows, last_seen_id = self._scan_new_tickets(state['last_seen_id'])
+        if state.get('modified_since'):
+            rows += self._scan_modified_tickets(state['modified_since'], state['last_seen_id'])
+        status_rechecked_at = state.get('status_rechecked_at_ts', state.get('backfilled_at_ts', 0))
+        if now - status_rechecked_at >= self.ticket_summary_status_recheck_seconds:
+            rows += self._scan_open_tickets()
+            status_rechecked_at = now
+        state = {
+            **state,
+            'last_seen_id': last_seen_id,
+            'modified_since': modified_since,
+            'status_rechecked_at_ts': status_rechecked_at,
+            'refreshed_at': datetime.now(timezone.utc).isoformat(),
+            'last_scan_rows': len(rows)
+        }
+        changed = self.cache_store.apply_ticket_changes([(row['ticket_id'], self._ledger_entry(row)) for row in rows], state)
+        if changed:
+            logging.info(f"Applied {changed} new or modified tickets to the ticket sales summary ({len(rows)} rows read)")
+        return state
+
+    def refresh_ticket_summary(self) -> Optional[Dict[str, Any]]:
+        """
+        Bring the ticket sales summary up to date before a read, at most once every
+        WORDPRESS_TICKET_SUMMARY_REFRESH_SECONDS, with an incremental scan. Never blocks
+        and never backfills: the backfill and rebuilds run in the background
+        (maintain_ticket_summary).
+
+        Returns:
+            The summary's scan state, or None if the summary hasn't been built yet
+            (callers then query WordPress directly)
+        """
+        state = self.cache_store.get_ticket_sales_state()
+        if state is None or not self._summary_lock.acquire(blocking=False):
+            # Not built yet, or another thread is scanning and the summary is at most a scan behind
+            return state
+        
+        try:
+            state = self.cache_store.get_ticket_sales_state()
+            now = time.time()
+            if state is None or now - self._summary_checked_at < self.ticket_summary_refresh_seconds:
+                return state
+            state = self._update_ticket_summary(state, now)
+            self._summary_checked_at = now
+            return state
+        finally:
+            self._summary_lock.release()
+
+    def maintain_ticket_summary(self, rebuild: bool = False) -> Dict[str, Any]:
+        """
+        Background upkeep of the ticket sales summary: a full backfill when it doesn't exist
+        yet, when WORDPRESS_TICKET_SUMMARY_REBUILD_HOURS have passed (picks up deleted
+        tickets and status changes on past-dated tickets) or when rebuild is set, and an
+        incremental scan otherwise. Reads keep using the current summary (or the live
+        queries, before the first backfill) while it runs.
+
+        Returns:
+            The summary's scan state
+        """
+        with self._summary_lock:
+            state = self.cache_store.get_ticket_sales_state()
+            now = time.time()
+            rebuild_due = state is None or rebuild or (
+                self.ticket_summary_rebuild_hours > 0
+                and now - state.get('backfilled_at_ts', 0) >= self.ticket_summary_rebuild_hours * 3600
+            )
+            state = self._backfill_ticket_summary(now) if rebuild_due else self._update_ticket_summary(state, now)
+            self._summary_checked_at = now
+            return state
+
+    def _total_tickets_sold_query(self) -> str:
+        """Tickets sold for a product regardless of slot/date (params: product_id)"""
+        return f"""
+        SELECT COUNT(*) as ticket_count
+        FROM {self.table_prefix}posts p
+        INNER JOIN {self.table_prefix}postmeta m1 ON p.ID = m1.post_id 
+        LEFT JOIN {self.table_prefix}postmeta m4 ON p.ID = m4.post_id AND m4.meta_key = 'WooCommerceEventsStatus'
+        WHERE p.post_type = 'event_magic_tickets'
+        AND p.post_status = 'publish'
+        AND m1.meta_key = 'WooCommerceEventsProductID' 
+        AND m1.meta_value = %s
+        AND (m4.meta_value IS NULL OR m4.meta_value NOT IN ('Canceled', 'Cancelled', 'Unpaid'))
+        """
     
     def get_total_tickets_sold_for_product(self, product_id: int) -> Optional[int]:
         """
@@ -130,22 +994,10 @@ class WordPressDBClient:
             Total number of tickets sold, or None if database error
         """
         try:
-            conn = self._get_connection()
-            
             # Query to count all event_magic_tickets posts for this product
-            query = f"""
-            SELECT COUNT(*) as ticket_count
-            FROM {self.table_prefix}posts p
-            INNER JOIN {self.table_prefix}postmeta m1 ON p.ID = m1.post_id 
-            LEFT JOIN {self.table_prefix}postmeta m4 ON p.ID = m4.post_id AND m4.meta_key = 'WooCommerceEventsStatus'
-            WHERE p.post_type = 'event_magic_tickets'
-            AND p.post_status = 'publish'
-            AND m1.meta_key = 'WooCommerceEventsProductID' 
-            AND m1.meta_value = %s
-            AND (m4.meta_value IS NULL OR m4.meta_value NOT IN ('Canceled', 'Cancelled', 'Unpaid'))
-            """
+            query = self._total_tickets_sold_query()
             
-            with conn.cursor() as cursor:
+            with self._cursor() as cursor:
                 cursor.execute(query, (product_id,))
                 result = cursor.fetchone()
                 
@@ -161,6 +1013,15 @@ class WordPressDBClient:
             logging.error(f"Error querying total tickets sold: {e}")
             raise WordPressDBError(f"Failed to query total tickets sold: {str(e)}")
     
+    def _booking_options_query(self) -> str:
+        """FooEvents booking configuration of a product (params: product_id)"""
+        return f"""
+        SELECT meta_value
+        FROM {self.table_prefix}postmeta
+        WHERE post_id = %s 
+        AND meta_key = 'fooevents_bookings_options_serialized'
+        """
+    
     def get_product_total_capacity(self, product_id: int, slot_name: str, booking_date: str = None) -> Optional[int]:
         """
         Get the original total capacity for a product/slot from FooEvents booking configuration.
@@ -175,115 +1036,110 @@ class WordPressDBClient:
             Total capacity, or None if not found/error
         """
         try:
-            conn = self._get_connection()
-            
             # Query to get the FooEvents booking configuration from product meta
-            query = f"""
-            SELECT meta_value
-            FROM {self.table_prefix}postmeta
-            WHERE post_id = %s 
-            AND meta_key = 'fooevents_bookings_options_serialized'
-            """
+            query = self._booking_options_query()
             
-            with conn.cursor() as cursor:
+            # Read the options and return the connection before counting tickets sold below,
+            # which checks out a connection of its own
+            with self._cursor() as cursor:
                 cursor.execute(query, (product_id,))
                 result = cursor.fetchone()
-                
-                if result and result['meta_value']:
-                    # Parse the serialized booking data to find the original capacity
-                    import json
-                    try:
-                        booking_data = json.loads(result['meta_value'])
-                        
-                        # Find the slot and get the stock value for the specific date
-                        for slot_id, slot_info in booking_data.items():
-                            if slot_info.get('label') == slot_name:
-                                current_stock = 0
-                                target_date = booking_date
-                                
-                                # Handle nested add_date structure (Format 1)
-                                add_date = slot_info.get('add_date', {})
-                                if isinstance(add_date, dict) and add_date:
-                                    if booking_date:
-                                        # Look for the specific date
-                                        for date_id, date_info in add_date.items():
-                                            if isinstance(date_info, dict) and date_info.get('date') == booking_date:
-                                                stock = date_info.get('stock', 0)
-                                                try:
-                                                    current_stock = int(stock) if stock != '' else 0
-                                                    target_date = date_info.get('date')
-                                                    break
-                                                except (ValueError, TypeError):
-                                                    continue
-                                    else:
-                                        # No specific date requested, use the first date found
-                                        for date_id, date_info in add_date.items():
-                                            if isinstance(date_info, dict):
-                                                stock = date_info.get('stock', 0)
+            
+            if result and result['meta_value']:
+                # Parse the serialized booking data to find the original capacity
+                import json
+                try:
+                    booking_data = json.loads(result['meta_value'])
+                    
+                    # Find the slot and get the stock value for the specific date
+                    for slot_id, slot_info in booking_data.items():
+                        if slot_info.get('label') == slot_name:
+                            current_stock = 0
+                            target_date = booking_date
+                            
+                            # Handle nested add_date structure (Format 1)
+                            add_date = slot_info.get('add_date', {})
+                            if isinstance(add_date, dict) and add_date:
+                                if booking_date:
+                                    # Look for the specific date
+                                    for date_id, date_info in add_date.items():
+                                        if isinstance(date_info, dict) and date_info.get('date') == booking_date:
+                                            stock = date_info.get('stock', 0)
+                                            try:
+                                                current_stock = int(stock) if stock != '' else 0
+                                                target_date = date_info.get('date')
+                                                break
+                                            except (ValueError, TypeError):
+                                                continue
+                                else:
+                                    # No specific date requested, use the first date found
+                                    for date_id, date_info in add_date.items():
+                                        if isinstance(date_info, dict):
+                                            stock = date_info.get('stock', 0)
+                                            try:
+                                                current_stock = int(stock) if stock != '' else 0
+                                                target_date = date_info.get('date')
+                                                break
+                                            except (ValueError, TypeError):
+                                                continue
+                            else:
+                                # Handle flat structure with {id}_stock fields (Format 2)
+                                if booking_date:
+                                    # Look for the specific date
+                                    for key, value in slot_info.items():
+                                        if key.endswith('_add_date') and value == booking_date:
+                                            date_id = key.replace('_add_date', '')
+                                            stock_key = f'{date_id}_stock'
+                                            if stock_key in slot_info:
                                                 try:
-                                                    current_stock = int(stock) if stock != '' else 0
-                                                    target_date = date_info.get('date')
+                                                    current_stock = int(slot_info[stock_key]) if slot_info[stock_key] != '' else 0
+                                                    target_date = value
                                                     break
                                                 except (ValueError, TypeError):
                                                     continue
                                 else:
-                                    # Handle flat structure with {id}_stock fields (Format 2)
-                                    if booking_date:
-                                        # Look for the specific date
-                                        for key, value in slot_info.items():
-                                            if key.endswith('_add_date') and value == booking_date:
-                                                date_id = key.replace('_add_date', '')
-                                                stock_key = f'{date_id}_stock'
-                                                if stock_key in slot_info:
-                                                    try:
-                                                        current_stock = int(slot_info[stock_key]) if slot_info[stock_key] != '' else 0
-                                                        target_date = value
-                                                        break
-                                                    except (ValueError, TypeError):
-                                                        continue
+                                    # No specific date requested, use the first stock found
+                                    for key, value in slot_info.items():
+                                        if key.endswith('_stock'):
+                                            try:
+                                                current_stock = int(value) if value != '' else 0
+                                                # Find corresponding date
+                                                date_id = key.replace('_stock', '')
+                                                date_key = f'{date_id}_add_date'
+                                                target_date = slot_info.get(date_key, booking_date)
+                                                break
+                                            except (ValueError, TypeError):
+                                                continue
+                            
+                            # Calculate total capacity = available stock + tickets sold for the target date
+                            if target_date:
+                                try:
+                                    tickets_sold = self.get_tickets_sold_for_date(product_id, slot_name, target_date)
+                                    if tickets_sold is not None:
+                                        total_capacity = current_stock + tickets_sold
+                                        logging.info(f"Calculated total capacity {total_capacity} for product {product_id}, slot '{slot_name}', date '{target_date}' (available: {current_stock}, sold: {tickets_sold})")
+                                        return total_capacity
                                     else:
-                                        # No specific date requested, use the first stock found
-                                        for key, value in slot_info.items():
-                                            if key.endswith('_stock'):
-                                                try:
-                                                    current_stock = int(value) if value != '' else 0
-                                                    # Find corresponding date
-                                                    date_id = key.replace('_stock', '')
-                                                    date_key = f'{date_id}_add_date'
-                                                    target_date = slot_info.get(date_key, booking_date)
-                                                    break
-                                                except (ValueError, TypeError):
-                                                    continue
-                                
-                                # Calculate total capacity = available stock + tickets sold for the target date
-                                if target_date:
-                                    try:
-                                        tickets_sold = self.get_tickets_sold_for_date(product_id, slot_name, target_date)
-                                        if tickets_sold is not None:
-                                            total_capacity = current_stock + tickets_sold
-                                            logging.info(f"Calculated total capacity {total_capacity} for product {product_id}, slot '{slot_name}', date '{target_date}' (available: {current_stock}, sold: {tickets_sold})")
-                                            return total_capacity
-                                        else:
-                                            logging.error(f"Could not get tickets sold for product {product_id}, slot '{slot_name}', date '{target_date}'")
-                                            return None
-                                    except Exception as e:
-                                        logging.error(f"Error calculating total capacity: {e}")
+                                        logging.error(f"Could not get tickets sold for product {product_id}, slot '{slot_name}', date '{target_date}'")
                                         return None
-                                else:
-                                    logging.error(f"Could not find booking date for product {product_id}, slot '{slot_name}'")
+                                except Exception as e:
+                                    logging.error(f"Error calculating total capacity: {e}")
                                     return None
-                        
-                        # If we can't find the specific slot, return None
-                        logging.warning(f"Could not find slot '{slot_name}' for product {product_id}")
-                        return None
-                        
-                    except (json.JSONDecodeError, KeyError) as e:
-                        logging.error(f"Error parsing booking data for product {product_id}: {e}")
-                        return None
-                else:
-                    logging.warning(f"No FooEvents booking data found for product {product_id}")
+                            else:
+                                logging.error(f"Could not find booking date for product {product_id}, slot '{slot_name}'")
+                                return None
+                    
+                    # If we can't find the specific slot, return None
+                    logging.warning(f"Could not find slot '{slot_name}' for product {product_id}")
                     return None
                     
+                except (json.JSONDecodeError, KeyError) as e:
+                    logging.error(f"Error parsing booking data for product {product_id}: {e}")
+                    return None
+            else:
+                logging.warning(f"No FooEvents booking data found for product {product_id}")
+                return None
+                
         except Exception as e:
             logging.error(f"Error querying product capacity: {e}")
             raise WordPressDBError(f"Failed to query product capacity: {str(e)}")
@@ -296,9 +1152,7 @@ class WordPressDBClient:
             Dictionary with connection status and info
         """
         try:
-            conn = self._get_connection()
-            
-            with conn.cursor() as cursor:
+            with self._cursor(replica=True) as cursor:
                 # Get basic database info
                 cursor.execute("SELECT VERSION() as version")
                 version_result = cursor.fetchone()
@@ -317,7 +1171,9 @@ class WordPressDBClient:
                     'database': self.database,
                     'mysql_version': version_result['version'] if version_result else 'Unknown',
                     'total_tickets': tickets_result['total_tickets'] if tickets_result else 0,
-                    'table_prefix': self.table_prefix
+                    'table_prefix': self.table_prefix,
+                    'ticket_summary': self.cache_store.get_ticket_sales_state() if self.ticket_summary_enabled else None,
+                    'replica': self.get_replica_status()
                 }
                 
         except Exception as e:
@@ -328,6 +1184,29 @@ class WordPressDBClient:
                 'database': self.database
             }
     
+    def _all_tickets_query(self) -> str:
+        """All tickets of a product with their booking meta (params: product_id)"""
+        return f"""
+        SELECT 
+            p.ID as ticket_id,
+            p.post_title,
+            p.post_date,
+            p.post_status,
+            m1.meta_value as product_id,
+            m2.meta_value as booking_slot,
+            m3.meta_value as booking_date,
+            m4.meta_value as status
+        FROM {self.table_prefix}posts p
+        INNER JOIN {self.table_prefix}postmeta m1 ON p.ID = m1.post_id 
+        LEFT JOIN {self.table_prefix}postmeta m2 ON p.ID = m2.post_id AND m2.meta_key = 'WooCommerceEventsBookingSlot'
+        LEFT JOIN {self.table_prefix}postmeta m3 ON p.ID = m3.post_id AND m3.meta_key = 'WooCommerceEventsBookingDate'
+        LEFT JOIN {self.table_prefix}postmeta m4 ON p.ID = m4.post_id AND m4.meta_key = 'WooCommerceEventsStatus'
+        WHERE p.post_type = 'event_magic_tickets'
+        AND m1.meta_key = 'WooCommerceEventsProductID' 
+        AND m1.meta_value = %s
+        ORDER BY p.post_date DESC
+        """
+    
     def get_all_tickets_for_product(self, product_id: int) -> List[Dict[str, Any]]:
         """
         Get all tickets for a specific product for debugging purposes.
@@ -339,54 +1218,49 @@ class WordPressDBClient:
             List of ticket records with their metadata
         """
         try:
-            conn = self._get_connection()
-            
             # Query to get all event_magic_tickets posts for this product
-            query = f"""
-            SELECT 
-                p.ID as ticket_id,
-                p.post_title,
-                p.post_date,
-                p.post_status,
-                m1.meta_value as product_id,
-                m2.meta_value as booking_slot,
-                m3.meta_value as booking_date,
-                m4.meta_value as status
-            FROM {self.table_prefix}posts p
-            INNER JOIN {self.table_prefix}postmeta m1 ON p.ID = m1.post_id 
-            LEFT JOIN {self.table_prefix}postmeta m2 ON p.ID = m2.post_id AND m2.meta_key = 'WooCommerceEventsBookingSlot'
-            LEFT JOIN {self.table_prefix}postmeta m3 ON p.ID = m3.post_id AND m3.meta_key = 'WooCommerceEventsBookingDate'
-            LEFT JOIN {self.table_prefix}postmeta m4 ON p.ID = m4.post_id AND m4.meta_key = 'WooCommerceEventsStatus'
-            WHERE p.post_type = 'event_magic_tickets'
-            AND m1.meta_key = 'WooCommerceEventsProductID' 
-            AND m1.meta_value = %s
-            ORDER BY p.post_date DESC
-            """
+            query = self._all_tickets_query()
             
-            with conn.cursor() as cursor:
+            with self._cursor(replica=True) as cursor:
                 cursor.execute(query, (product_id,))
                 results = cursor.fetchall()
-                
-                tickets = []
-                for row in results:
-                    tickets.append({
-                        'ticket_id': row['ticket_id'],
-                        'post_title': row['post_title'],
-                        'post_date': row['post_date'],
-                        'post_status': row['post_status'],
-                        'product_id': row['product_id'],
-                        'slot': row['booking_slot'],
-                        'date': row['booking_date'],
-                        'status': row['status']
-                    })
-                
-                logging.info(f"Found {len(tickets)} tickets for product {product_id}")
-                return tickets
+            
+            tickets = []
+            for row in results:
+                tickets.append({
+                    'ticket_id': row['ticket_id'],
+                    'post_title': row['post_title'],
+                    'post_date': row['post_date'],
+                    'post_status': row['post_status'],
+                    'product_id': row['product_id'],
+                    'slot': row['booking_slot'],
+                    'date': row['booking_date'],
+                    'status': row['status']
+                })
+            
+            logging.info(f"Found {len(tickets)} tickets for product {product_id}")
+            return tickets
                 
         except Exception as e:
             logging.error(f"Error querying all tickets for product {product_id}: {e}")
             raise WordPressDBError(f"Failed to query tickets for product: {str(e)}")
     
+    def _slot_metadata_query(self) -> str:
+        """Count of a product's tickets with a booking slot (params: product_id)"""
+        return f"""
+        SELECT COUNT(*) as tickets_with_slot
+        FROM {self.table_prefix}posts p
+        INNER JOIN {self.table_prefix}postmeta m1 ON p.ID = m1.post_id 
+        INNER JOIN {self.table_prefix}postmeta m2 ON p.ID = m2.post_id 
+        WHERE p.post_type = 'event_magic_tickets'
+        AND p.post_status = 'publish'
+        AND m1.meta_key = 'WooCommerceEventsProductID' 
+        AND m1.meta_value = %s
+        AND m2.meta_key = 'WooCommerceEventsBookingSlot'
+        AND m2.meta_value IS NOT NULL
+        AND m2.meta_value != ''
+        """
+    
     def has_tickets_with_slot_metadata(self, product_id: int) -> bool:
         """
         Check if a product has any tickets with slot/date metadata (FooEvents Bookings)
@@ -399,24 +1273,10 @@ class WordPressDBClient:
             True if tickets have slot/date metadata, False if they're normal FooEvents tickets
         """
         try:
-            conn = self._get_connection()
-            
             # Query to count tickets with slot metadata
-            query = f"""
-            SELECT COUNT(*) as tickets_with_slot
-            FROM {self.table_prefix}posts p
-            INNER JOIN {self.table_prefix}postmeta m1 ON p.ID = m1.post_id 
-            INNER JOIN {self.table_prefix}postmeta m2 ON p.ID = m2.post_id 
-            WHERE p.post_type = 'event_magic_tickets'
-            AND p.post_status = 'publish'
-            AND m1.meta_key = 'WooCommerceEventsProductID' 
-            AND m1.meta_value = %s
-            AND m2.meta_key = 'WooCommerceEventsBookingSlot'
-            AND m2.meta_value IS NOT NULL
-            AND m2.meta_value != ''
-            """
+            query = self._slot_metadata_query()
             
-            with conn.cursor() as cursor:
+            with self._cursor() as cursor:
                 cursor.execute(query, (product_id,))
                 result = cursor.fetchone()
                 
@@ -431,8 +1291,247 @@ class WordPressDBClient:
             logging.error(f"Error checking ticket metadata for product {product_id}: {e}")
             return False
     
+    def _explain_sample(self, product_id: Optional[int], slot_name: Optional[str], booking_date: Optional[str]) -> Optional[Tuple[int, str, str]]:
+        """Product/slot/date to explain with: the given ones, filled in from the most recent booked ticket"""
+        if product_id is not None and slot_name and booking_date:
+            return int(product_id), slot_name, booking_date
+        
+        query = f"""
+        SELECT
+            m1.meta_value as product_id,
+            m2.meta_value as booking_slot,
+            m3.meta_value as booking_date
+        FROM {self.table_prefix}posts p
+        INNER JOIN {self.table_prefix}postmeta m1 ON p.ID = m1.post_id
+        INNER JOIN {self.table_prefix}postmeta m2 ON p.ID = m2.post_id
+        INNER JOIN {self.table_prefix}postmeta m3 ON p.ID = m3.post_id
+        WHERE p.post_type = 'event_magic_tickets'
+        AND p.post_status = 'publish'
+        AND m1.meta_key = 'WooCommerceEventsProductID'
+        AND m2.meta_key = 'WooCommerceEventsBookingSlot'
+        AND m3.meta_key = 'WooCommerceEventsBookingDate'
+        """
+        params: List[Any] = []
+        if product_id is not None:
+            query += "AND m1.meta_value = %s\n"
+            params.append(int(product_id))
+        query += "ORDER BY p.ID DESC LIMIT 1"
+        
+        with self._cursor() as cursor:
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+        if not row:
+            return None
+        try:
+            sample_product_id = int(row['product_id'])
+        except (ValueError, TypeError):
+            return None
+        return (
+            sample_product_id,
+            slot_name or SLOT_TIME_SUFFIX.sub('', row['booking_slot'] or '').strip(),
+            booking_date or row['booking_date']
+        )
+    
+    def _table_indexes(self, cursor, table: str) -> Dict[str, List[str]]:
+        """Existing indexes of a table: {index name: [columns in order]}"""
+        cursor.execute(f"SHOW INDEX FROM {table}")
+        indexes: Dict[str, List[Tuple[int, str]]] = {}
+        for row in cursor.fetchall():
+            indexes.setdefault(row['Key_name'], []).append((int(row['Seq_in_index']), row['Column_name']))
+        return {name: [column for _, column in sorted(columns)] for name, columns in indexes.items()}
+    
+    @staticmethod
+    def _query_aliases(sql: str) -> Dict[str, str]:
+        """Map each table alias in a query (or the bare table name) to its table"""
+        aliases = {}
+        for table, alias in re.findall(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?!ON\b|WHERE\b|INNER\b|LEFT\b|JOIN\b|ORDER\b|GROUP\b|LIMIT\b)(\w+))?', sql, re.IGNORECASE):
+            aliases[alias or table] = table
+        return aliases
+    
+    def _proposed_index(self, sql: str, alias: str, table: str, plan_row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Index that would serve one table access of a query plan, or None.
+        wp_postmeta read as the driving table (looked up by meta_key/meta_value) gets
+        (meta_key, meta_value, post_id) so the matching post IDs come from the index;
+        wp_postmeta joined to a post (or read by post_id) gets (post_id, meta_key, meta_value).
+        A ticket scan on post_modified_gmt gets (post_type, post_modified_gmt).
+        """
+        column = (alias + '.') if alias != table else ''
+        # ref names the column a joined table is looked up by (e.g. "wp.p.ID"), or "const"
+        ref = str(plan_row.get('ref') or '')
+        if table == f"{self.table_prefix}postmeta":
+            joined = '.' in ref
+            by_post_id = re.search(rf"\b{re.escape(column)}post_id\s*=\s*%s", sql) is not None
+            if joined or by_post_id:
+                return {
+                    'name': 'brcc_post_meta',
+                    'table': table,
+                    'columns': [('post_id', None), ('meta_key', META_KEY_INDEX_PREFIX), ('meta_value', META_VALUE_INDEX_PREFIX)]
+                }
+            return {
+                'name': 'brcc_meta_lookup',
+                'table': table,
+                'columns': [('meta_key', META_KEY_INDEX_PREFIX), ('meta_value', META_VALUE_INDEX_PREFIX), ('post_id', None)]
+            }
+        if table == f"{self.table_prefix}posts" and re.search(rf"\b{re.escape(column)}post_modified_gmt\s*>=", sql):
+            return {
+                'name': 'brcc_type_modified',
+                'table': table,
+                'columns': [('post_type', None), ('post_modified_gmt', None)]
+            }
+        return None
+    
+    @staticmethod
+    def _index_exists(columns: List[Tuple[str, Optional[int]]], existing: Dict[str, List[str]]) -> Optional[str]:
+        """Name of an existing index that starts with the given columns, if any"""
+        wanted = [name for name, _ in columns]
+        for index_name, index_columns in existing.items():
+            if index_columns[:len(wanted)] == wanted:
+                return index_name
+        return None
+    
+    def _explain_query(self, cursor, query: Dict[str, Any], indexes: Dict[str, Dict[str, List[str]]]) -> Dict[str, Any]:
+        """EXPLAIN one query and summarise its plan"""
+        cursor.execute('EXPLAIN ' + query['sql'], query['params'])
+        plan = cursor.fetchall()
+        aliases = self._query_aliases(query['sql'])
+        
+        # Nested-loop estimate: each table is read once per row produced by the tables before it
+        rows_examined = 0.0
+        fanout = 1.0
+        full_scans = []
+        proposals = []
+        for row in plan:
+            rows = float(row.get('rows') or 0)
+            filtered = float(row.get('filtered') or 100) / 100
+            rows_examined += fanout * rows
+            fanout *= rows * filtered
+            
+            alias = row.get('table') or ''
+            table = aliases.get(alias, alias)
+            if row.get('type') in FULL_SCAN_ACCESS_TYPES:
+                full_scans.append({'table': table, 'alias': alias, 'type': row.get('type'), 'rows': row.get('rows')})
+            
+            proposal = self._proposed_index(query['sql'], alias, table, row)
+            if proposal and not self._index_exists(proposal['columns'], indexes.get(table, {})):
+                proposals.append(proposal)
+        
+        return {
+            'issued_by': query['issued_by'],
+            'sql': ' '.join(query['sql'].split()),
+            'params': [str(param) for param in (query['params'] or [])],
+            'plan': plan,
+            'full_scans': full_scans,
+            'rows_examined_estimate': int(rows_examined),
+            'proposed_indexes': proposals
+        }
+    
+    def explain_queries(self, product_id: Optional[int] = None, slot_name: Optional[str] = None,
+                        booking_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run EXPLAIN on each query the client issues (tickets sold, total capacity, all tickets,
+        slot metadata check) for one product/slot/date, report full scans and estimated rows
+        examined, and propose indexes on wp_postmeta/wp_posts that the database lacks.
+        The queries come from the same builders the client uses and only their EXPLAIN is
+        run; with the ticket sales summary enabled its scan queries are explained as well.
+        
+        Args:
+            product_id: WooCommerce product ID (defaults to the product of the most recent ticket)
+            slot_name: FooEvents booking slot name (defaults to one of the product's booked slots)
+            booking_date: Booking date string (defaults to one of the product's booked dates)
+            
+        Returns:
+            Dictionary with the sample used, each distinct query with its plan, and the
+            proposed indexes as ALTER TABLE statements
+        """
+        try:
+            sample = self._explain_sample(product_id, slot_name, booking_date)
+            if sample is None:
+                return {'error': 'No booked tickets found to explain the queries with', 'product_id': product_id}
+            product_id, slot_name, booking_date = sample
+            
+            sold_params = (product_id, slot_name, booking_date)
+            checks = [
+                ('tickets_sold_for_date', self._slot_values_query(), (product_id, 0)),
+                ('tickets_sold_for_date', self._tickets_sold_query(1), sold_params),
+                ('tickets_sold_for_products', self._tickets_sold_for_products_query(1), [str(product_id)]),
+                ('total_tickets_sold', self._total_tickets_sold_query(), (product_id,)),
+                ('total_capacity', self._booking_options_query(), (product_id,)),
+                # get_product_total_capacity adds the slot's sold count from get_tickets_sold_for_date
+                ('total_capacity', self._slot_values_query(), (product_id, 0)),
+                ('total_capacity', self._tickets_sold_query(1), sold_params),
+                ('all_tickets', self._all_tickets_query(), (product_id,)),
+                ('slot_metadata_check', self._slot_metadata_query(), (product_id,))
+            ]
+            if self.ticket_summary_enabled:
+                state = self.cache_store.get_ticket_sales_state() or {}
+                last_seen_id = state.get('last_seen_id', 0)
+                checks += [
+                    ('ticket_summary_scan', self._new_tickets_query(), (last_seen_id, TICKET_SCAN_BATCH_SIZE)),
+                    ('ticket_summary_scan', self._modified_tickets_query(), (state.get('modified_since') or '1970-01-01 00:00:00', last_seen_id)),
+                    ('ticket_summary_scan', self._tickets_by_id_query(1), (last_seen_id,))
+                ]
+            
+            # Distinct queries by their SQL text, with the checks that issue them
+            queries: Dict[str, Dict[str, Any]] = {}
+            for check, sql, params in checks:
+                query = queries.setdefault(' '.join(sql.split()), {'sql': sql, 'params': params, 'issued_by': []})
+                if check not in query['issued_by']:
+                    query['issued_by'].append(check)
+            
+            with self._cursor() as cursor:
+                indexes = {
+                    table: self._table_indexes(cursor, table)
+                    for table in (f"{self.table_prefix}posts", f"{self.table_prefix}postmeta")
+                }
+                explained = [self._explain_query(cursor, query, indexes) for query in queries.values()]
+            
+            proposed: Dict[str, Dict[str, Any]] = {}
+            for query in explained:
+                for proposal in query['proposed_indexes']:
+                    entry = proposed.setdefault(proposal['name'], {
+                        'name': proposal['name'],
+                        'table': proposal['table'],
+                        'columns': [f"{name}({length})" if length else name for name, length in proposal['columns']],
+                        'sql': f"ALTER TABLE {proposal['table']} ADD INDEX {proposal['name']} (" + ', '.join(
+                            f"{name}({length})" if length else name for name, length in proposal['columns']
+                        ) + ")",
+                        'used_by': []
+                    })
+                    entry['used_by'] = sorted(set(entry['used_by']) | set(query['issued_by']))
+                query['proposed_indexes'] = list(dict.fromkeys(proposal['name'] for proposal in query['proposed_indexes']))
+            
+            logging.info(f"Explained {len(explained)} WordPress queries for product {product_id}: "
+                         f"{sum(len(q['full_scans']) for q in explained)} full scans, {len(proposed)} indexes proposed")
+            return {
+                'sample': {'product_id': product_id, 'slot': slot_name, 'date': booking_date},
+                'ticket_summary_enabled': self.ticket_summary_enabled,
+                'queries': explained,
+                'full_scans': sum(len(query['full_scans']) for query in explained),
+                'rows_examined_estimate': sum(query['rows_examined_estimate'] for query in explained),
+                'existing_indexes': indexes,
+                'proposed_indexes': list(proposed.values()),
+                'note': (
+                    f"meta_value is LONGTEXT, so the indexes hold its first {META_VALUE_INDEX_PREFIX} characters; "
+                    "they cover the lookups and joins, but MySQL still reads the row to compare the full value. "
+                    "Adding an index locks writes to wp_postmeta on older MySQL versions - run it off-peak."
+                )
+            }
+            
+        except Exception as e:
+            logging.error(f"Error explaining WordPress queries: {e}")
+            raise WordPressDBError(f"Failed to explain queries: {str(e)}")
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics (with the replica's pool and routing state if one is configured)"""
+        stats = self.pool.get_stats()
+        if self.replica_pool is not None:
+            stats['replica'] = {**self.get_replica_status(), 'pool': self.replica_pool.get_stats()}
+        return stats
+    
     def close(self):
-        """Close database connection"""
-        if self.connection and self.connection.open:
-            self.connection.close()
-            logging.info("WordPress database connection closed") 
\ No newline at end of file
+        """Close pooled database connections"""
+        self.pool.close()
+        if self.replica_pool is not None:
+            self.replica_pool.close()
+        logging.info("WordPress database connections closed") 
\ No newline at end of file
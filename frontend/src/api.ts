@@ -177,6 +177,13 @@ export interface EventMapping {
   mapping_source: 'manual_fallback' | 'programmatic' | 'user_override';
   is_active: boolean;
   last_updated: string;
+  confidence?: number | null;
+}
+
+export interface SeriesSuggestion {
+  series_id: string;
+  series_name: string;
+  score: number;
 }
 
 export interface UnmappedEvent {
@@ -186,6 +193,7 @@ export interface UnmappedEvent {
   product_id?: string;
   series_id?: string;
   reason: 'no_match_found' | 'event_removed' | 'user_unmapped';
+  suggestions?: SeriesSuggestion[];
 }
 
 export interface MappingSummary {
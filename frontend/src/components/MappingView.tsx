@@ -239,6 +239,12 @@ const MappingView: React.FC<MappingViewProps> = ({ onSendToCompare }) => {
                   <span className="label">Eventbrite Series:</span>
                   <span className="value">{mapping.eventbrite_series_ids.length} series</span>
                 </div>
+                {mapping.confidence != null && (
+                  <div className="mapping-detail">
+                    <span className="label">Match Confidence:</span>
+                    <span className="value">{Math.round(mapping.confidence * 100)}%</span>
+                  </div>
+                )}
                 <div className="mapping-detail">
                   <span className="label">Last Updated:</span>
                   <span className="value">{new Date(mapping.last_updated).toLocaleDateString()}</span>
@@ -314,6 +320,11 @@ const MappingView: React.FC<MappingViewProps> = ({ onSendToCompare }) => {
                         <div className="event-name">{event.name}</div>
                         <div className="event-id">Product ID: {event.product_id}</div>
                         <div className="event-reason">Reason: {event.reason.replace('_', ' ')}</div>
+                        {event.suggestions && event.suggestions.length > 0 && (
+                          <div className="event-suggestions">
+                            Closest: {event.suggestions.map(s => `${s.series_name} (${Math.round(s.score * 100)}%)`).join(', ')}
+                          </div>
+                        )}
                       </div>
                     ))}
                   </div>